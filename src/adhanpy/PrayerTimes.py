@@ -1,18 +1,12 @@
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Optional, Sequence
 from zoneinfo import ZoneInfo
+from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.astronomy.SolarEvents import SolarEvents
 from adhanpy.calculation.CalculationMethod import CalculationMethod
 from adhanpy.calculation.CalculationParameters import CalculationParameters
-from adhanpy.calculation.Twilight import (
-    season_adjusted_evening_twilight,
-    season_adjusted_morning_twilight,
-)
-from adhanpy.data.Prayer import Prayer
-from adhanpy.astronomy.SolarTime import SolarTime
-from adhanpy.data.Coordinates import Coordinates
-from adhanpy.util.TimeComponents import TimeComponents
-from adhanpy.util.DateComponents import DateComponents
-from adhanpy.util.CalendarUtil import rounded_minute
+from adhanpy.calculation.PrayerPolicy import apply_policy
+from adhanpy.data.Prayer import PRAYERS, Prayer
 
 
 class PrayerTimes:
@@ -23,6 +17,7 @@ class PrayerTimes:
         calculation_method: Optional[CalculationMethod] = None,
         calculation_parameters: Optional[CalculationParameters] = None,
         time_zone: Optional[ZoneInfo] = None,
+        solar_coordinates: Optional[Sequence[SolarCoordinates]] = None,
     ):
         """
         Arguments:
@@ -30,243 +25,109 @@ class PrayerTimes:
             date: DateComponents
             calculation_parameters: CalculationParameters
             time_zone: example ZoneInfo("Europe/London")
+            solar_coordinates: optional SolarCoordinates of the day before, the day,
+                the day after and two days after the date, to share them between
+                PrayerTimes of the same date; computed when not given
         Returns:
             PrayerTimes object with UTC datetimes for fajr, sunrise, dhuhr, asr, maghrib and isha
         """
-
-        if (calculation_parameters and calculation_method) or not (
-            calculation_parameters or calculation_method
-        ):
-            raise ValueError(
-                "Only one of calculation_method or calculation_parameters must be passed."
-            )
-
-        self.calculation_parameters = calculation_parameters
-
-        if self.calculation_parameters is None:
-            self.calculation_parameters = CalculationParameters(
-                method=calculation_method
-            )
-
-        latitude, longitude = coordinates
-        self.coordinates = Coordinates(latitude, longitude)
-        self._date_components = DateComponents.from_utc(date)
-        self.time_zone = time_zone
-
-        self._prayer_date = datetime(
-            self._date_components.year,
-            self._date_components.month,
-            self._date_components.day,
-            tzinfo=timezone.utc,
-        )
-
-        self._day_of_year = self._prayer_date.timetuple().tm_yday
-
-        tomorrow_date = self._prayer_date + timedelta(days=1)
-        tomorrow_date_components = DateComponents.from_utc(tomorrow_date)
-
-        self._solar_time = SolarTime(self._date_components, self.coordinates)
-
-        time_components = TimeComponents.from_float(self._solar_time.transit)
-        transit = (
-            None
-            if time_components is None
-            else time_components.date_components(self._date_components)
+        calculation_parameters = _calculation_parameters(
+            calculation_method, calculation_parameters
         )
-
-        time_components = TimeComponents.from_float(self._solar_time.sunrise)
-        self._sunrise_components = (
-            None
-            if time_components is None
-            else time_components.date_components(self._date_components)
+        self._present(
+            SolarEvents(coordinates, date, solar_coordinates),
+            calculation_parameters,
+            time_zone,
         )
 
-        time_components = TimeComponents.from_float(self._solar_time.sunset)
-        self._sunset_components = (
-            None
-            if time_components is None
-            else time_components.date_components(self._date_components)
-        )
-
-        tomorrow_solar_time = SolarTime(tomorrow_date_components, self.coordinates)
-        tomorrow_sunrise_components = TimeComponents.from_float(
-            tomorrow_solar_time.sunrise
-        )
-
-        if (
-            transit is None
-            or self._sunrise_components is None
-            or self._sunset_components is None
-            or tomorrow_sunrise_components is None
-        ):
-            raise RuntimeError
-
-        # get night length
-        tomorrow_sunrise = tomorrow_sunrise_components.date_components(
-            tomorrow_date_components
-        )
-        self.night_length = (
-            tomorrow_sunrise.timestamp() * 1000
-            - self._sunset_components.timestamp() * 1000
+    @classmethod
+    def from_events(
+        cls,
+        solar_events: SolarEvents,
+        calculation_method: Optional[CalculationMethod] = None,
+        calculation_parameters: Optional[CalculationParameters] = None,
+        time_zone: Optional[ZoneInfo] = None,
+    ) -> "PrayerTimes":
+        """
+        PrayerTimes of SolarEvents already computed, keeping the SolarEvents of
+        a timetable allows to apply other parameters (adjustments, madhab, high
+        latitude rule) to each day without computing the astronomy again
+        """
+        calculation_parameters = _calculation_parameters(
+            calculation_method, calculation_parameters
         )
-        self.night_portions = self.calculation_parameters.night_portions()
+        prayer_times = cls.__new__(cls)
+        prayer_times._present(solar_events, calculation_parameters, time_zone)
+        return prayer_times
 
-        # Assign final times to properties with all offsets
-        self._set_fajr()
-        self._set_sunrise()
-        self._set_dhuhr(transit)
-        self._set_asr()
-        self._set_maghrib()
-        self._set_isha(self._sunset_components)
+    def _present(
+        self,
+        solar_events: SolarEvents,
+        calculation_parameters: CalculationParameters,
+        time_zone: Optional[ZoneInfo],
+    ) -> None:
+        # third stage: the times of the second stage in the time zone, the solar
+        # events are not kept to keep PrayerTimes small
+        self._date = solar_events.date
+        self.calculation_parameters = calculation_parameters
+        self.time_zone = time_zone
+        self.coordinates = solar_events.observer
+        self.night_length = solar_events.night_length
+        self.night_portions = calculation_parameters.night_portions()
+
+        times = apply_policy(solar_events, calculation_parameters)
+        self.fajr = times.fajr
+        self.sunrise = times.sunrise
+        self.dhuhr = times.dhuhr
+        self.asr = times.asr
+        self.maghrib = times.maghrib
+        self.isha = times.isha
 
         self._adjust_prayers_time_zone()
 
-    def _set_fajr(self):
-        temp_fajr = None
-        if time_components := TimeComponents.from_float(
-            self._solar_time.hour_angle(-self.calculation_parameters.fajr_angle, False)
-        ):
-            temp_fajr = time_components.date_components(self._date_components)
-
-        if (
-            self.calculation_parameters.method
-            == CalculationMethod.MOON_SIGHTING_COMMITTEE
-        ):
-            if self.coordinates.latitude >= 55:
-                temp_fajr = self._sunrise_components + timedelta(
-                    seconds=-1 * int(self.night_length / 7000)
-                )
-
-            safe_fajr = season_adjusted_morning_twilight(
-                self.coordinates.latitude,
-                self._day_of_year,
-                self._prayer_date.year,
-                self._sunrise_components,
-            )
-        else:
-            portion = self.night_portions.fajr
-            night_fraction = int(portion * self.night_length / 1000)
-            safe_fajr = self._sunrise_components + timedelta(
-                seconds=-1 * night_fraction
-            )
-
-        if temp_fajr is None or temp_fajr < safe_fajr:
-            temp_fajr = safe_fajr
-
-        self.fajr = self._rounded_minute(
-            self.calculation_parameters.adjustments,
-            self.calculation_parameters.method_adjustments,
-            "fajr",
-            temp_fajr,
-        )
-
-    def _set_sunrise(self):
-        self.sunrise = self._rounded_minute(
-            self.calculation_parameters.adjustments,
-            self.calculation_parameters.method_adjustments,
-            "sunrise",
-            self._sunrise_components,
-        )
-
-    def _set_dhuhr(self, time):
-        self.dhuhr = self._rounded_minute(
-            self.calculation_parameters.adjustments,
-            self.calculation_parameters.method_adjustments,
-            "dhuhr",
-            time,
-        )
+    @property
+    def date(self):
+        """Date (year, month, day) the prayer times were calculated for"""
+        return self._date.date()
 
-    def _set_asr(self):
-        if time_components := TimeComponents.from_float(
-            self._solar_time.afternoon(
-                self.calculation_parameters.madhab.get_shadow_length()
-            )
-        ):
-            if temp_asr := time_components.date_components(self._date_components):
-                self.asr = self._rounded_minute(
-                    self.calculation_parameters.adjustments,
-                    self.calculation_parameters.method_adjustments,
-                    "asr",
-                    temp_asr,
-                )
-        try:
-            self.asr.hour
-        except:
-            raise RuntimeError
+    def time_for_prayer(self, prayer: Prayer) -> Optional[datetime]:
+        if prayer == Prayer.NONE:
+            return None
+        return getattr(self, prayer.name.lower())
 
-    def _set_maghrib(self):
-        self.maghrib = self._rounded_minute(
-            self.calculation_parameters.adjustments,
-            self.calculation_parameters.method_adjustments,
-            "maghrib",
-            self._sunset_components,
-        )
+    def current_prayer(self, when: Optional[datetime] = None) -> Prayer:
+        """
+        Prayer whose time has most recently started at when (defaults to now),
+        Prayer.NONE before fajr
+        """
+        if when is None:
+            when = datetime.now(timezone.utc)
 
-    def _set_isha(self, sunset):
-        # Isha calculation with check against safe value
-        temp_isha = None
-        try:
-            if self.calculation_parameters.isha_interval < 1:
-                raise ValueError("Isha interval is either not defined or less than 1.")
+        for prayer in reversed(PRAYERS):
+            if getattr(self, prayer.name.lower()) <= when:
+                return prayer
+        return Prayer.NONE
 
-            temp_isha = sunset + timedelta(
-                seconds=self.calculation_parameters.isha_interval * 60
-            )
-        except:
-            timeComponents = TimeComponents.from_float(
-                self._solar_time.hour_angle(
-                    -self.calculation_parameters.isha_angle, True
-                )
+    def next_prayer(self, when: Optional[datetime] = None) -> Prayer:
+        """
+        Next prayer after when (defaults to now), Prayer.NONE after isha
+        """
+        if when is None:
+            when = datetime.now(timezone.utc)
+
+        for prayer in PRAYERS:
+            if getattr(self, prayer.name.lower()) > when:
+                return prayer
+        return Prayer.NONE
+
+    def formatted(self, time_format: str = "%H:%M") -> dict[str, str]:
+        """Times of the prayers formatted with strftime, by prayer name"""
+        return {
+            prayer.name.lower(): getattr(self, prayer.name.lower()).strftime(
+                time_format
             )
-
-            if timeComponents is not None:
-                temp_isha = timeComponents.date_components(self._date_components)
-
-            if (
-                self.calculation_parameters.method
-                == CalculationMethod.MOON_SIGHTING_COMMITTEE
-                and self.coordinates.latitude >= 55
-            ):
-                night_fraction = int(self.night_length / 7000)
-                temp_isha = self._sunset_components + timedelta(seconds=night_fraction)
-
-            if (
-                self.calculation_parameters.method
-                == CalculationMethod.MOON_SIGHTING_COMMITTEE
-            ):
-                safe_isha = season_adjusted_evening_twilight(
-                    self.coordinates.latitude,
-                    self._day_of_year,
-                    self._date_components.year,
-                    self._sunset_components,
-                )
-            else:
-                portion = self.night_portions.isha
-                night_fraction = int(portion * self.night_length / 1000)
-
-                safe_isha = self._sunset_components + timedelta(
-                    seconds=int(night_fraction)
-                )
-
-            if temp_isha is None or temp_isha > safe_isha:
-                temp_isha = safe_isha
-
-        self.isha = self._rounded_minute(
-            self.calculation_parameters.adjustments,
-            self.calculation_parameters.method_adjustments,
-            "isha",
-            temp_isha,
-        )
-
-    def _rounded_minute(
-        self, adjustments, method_adjustments, prayer_name, temp_prayer
-    ):
-        prayer_adjustments = getattr(adjustments, prayer_name)
-        method_prayer_adjustments = getattr(method_adjustments, prayer_name)
-        return rounded_minute(
-            (temp_prayer + timedelta(minutes=prayer_adjustments))
-            + timedelta(minutes=method_prayer_adjustments)
-        )
+            for prayer in PRAYERS
+        }
 
     def _adjust_prayers_time_zone(self):
         if self.time_zone is not None:
@@ -276,3 +137,19 @@ class PrayerTimes:
             self.asr = self.asr.astimezone(self.time_zone)
             self.maghrib = self.maghrib.astimezone(self.time_zone)
             self.isha = self.isha.astimezone(self.time_zone)
+
+
+def _calculation_parameters(
+    calculation_method: Optional[CalculationMethod],
+    calculation_parameters: Optional[CalculationParameters],
+) -> CalculationParameters:
+    if (calculation_parameters and calculation_method) or not (
+        calculation_parameters or calculation_method
+    ):
+        raise ValueError(
+            "Only one of calculation_method or calculation_parameters must be passed."
+        )
+
+    if calculation_parameters is None:
+        return CalculationParameters(method=calculation_method)
+    return calculation_parameters
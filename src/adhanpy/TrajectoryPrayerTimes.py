@@ -0,0 +1,241 @@
+import bisect
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Sequence
+from zoneinfo import ZoneInfo
+from adhanpy.astronomy.Astronomical import (
+    SUNRISE_ALTITUDE,
+    altitude_of_celestial_body,
+)
+from adhanpy.astronomy.SolarEphemeris import SolarEphemeris
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Coordinates import Coordinates
+from adhanpy.data.Prayer import Prayer
+from adhanpy.util.CalendarUtil import rounded_minute
+from adhanpy.util.FloatUtil import closest_angle
+
+# julian day of the unix epoch
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+_SECONDS_PER_DAY = 86400.0
+_PRECISION_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class TrajectoryEvent:
+    prayer: Prayer
+    time: datetime
+    latitude: float
+    longitude: float
+
+
+class _Track:
+    """
+    Observer position and solar quantities along a trajectory, linearly
+    interpolating the position between samples
+    """
+
+    def __init__(
+        self, samples: Sequence[tuple[datetime, float, float]], ephemeris
+    ) -> None:
+        self.seconds = [sample[0].timestamp() for sample in samples]
+        self.latitudes = [sample[1] for sample in samples]
+        self.longitudes = [sample[2] for sample in samples]
+        self.ephemeris = ephemeris
+
+    def position(self, index: int, seconds: float) -> Coordinates:
+        start, end = self.seconds[index], self.seconds[index + 1]
+        fraction = (seconds - start) / (end - start) if end > start else 0.0
+        latitude = self.latitudes[index] + fraction * (
+            self.latitudes[index + 1] - self.latitudes[index]
+        )
+        # shortest way around when crossing the antimeridian
+        longitude = self.longitudes[index] + fraction * closest_angle(
+            self.longitudes[index + 1] - self.longitudes[index]
+        )
+        return Coordinates(latitude, closest_angle(longitude))
+
+    def locate(self, seconds: float) -> Optional[Coordinates]:
+        """Position at seconds, None outside the trajectory"""
+        if not self.seconds[0] <= seconds <= self.seconds[-1]:
+            return None
+        index = bisect.bisect_right(self.seconds, seconds) - 1
+        return self.position(min(index, len(self.seconds) - 2), seconds)
+
+    def sun(
+        self, seconds: float, coordinates: Coordinates
+    ) -> tuple[float, float, float]:
+        """Return the altitude, hour angle and declination of the sun in degrees"""
+        jd = _UNIX_EPOCH_JULIAN_DAY + seconds / _SECONDS_PER_DAY
+        δ = self.ephemeris.declination(jd)
+        H = closest_angle(
+            self.ephemeris.apparent_sidereal_time(jd)
+            + coordinates.longitude
+            - self.ephemeris.right_ascension(jd)
+        )
+        return altitude_of_celestial_body(coordinates.latitude, δ, H), H, δ
+
+    def transit_declination(self, seconds: float, H: float) -> float:
+        """
+        Declination of the sun of the day of the local transit before seconds, H
+        being the hour angle at seconds, at the UTC midnight as SolarTime uses it
+        """
+        # the sun moves 15° of hour angle an hour
+        transit = seconds - H * _SECONDS_PER_DAY / 360
+        return self.ephemeris.declination(
+            _UNIX_EPOCH_JULIAN_DAY + transit // _SECONDS_PER_DAY
+        )
+
+
+def trajectory_prayer_times(
+    trajectory: Sequence[tuple[datetime, float, float]],
+    calculation_method: Optional[CalculationMethod] = None,
+    calculation_parameters: Optional[CalculationParameters] = None,
+    time_zone: Optional[ZoneInfo] = None,
+    ephemeris: Optional[SolarEphemeris] = None,
+) -> list[TrajectoryEvent]:
+    """
+    Prayer times for a moving observer, each prayer occurs when its solar condition
+    is met at the position of the observer at that instant.
+    Arguments:
+        trajectory: time ordered (timezone aware datetime, latitude, longitude) samples,
+            the position is linearly interpolated between samples which should be
+            close enough for the sun to cross each altitude at most once in between
+            (e.g. every few minutes)
+        calculation_method: CalculationMethod
+        calculation_parameters: CalculationParameters
+        time_zone: example ZoneInfo("Europe/London")
+        ephemeris: SolarEphemeris covering the trajectory, fitted when not given
+    Returns:
+        time ordered list of TrajectoryEvent for fajr, sunrise, dhuhr, asr, maghrib
+        and isha. High latitude safe bounds and the Moonsighting Committee seasonal
+        adjustments do not apply: a prayer whose solar condition is not met along the
+        trajectory is missing from the list.
+    """
+    if (calculation_parameters and calculation_method) or not (
+        calculation_parameters or calculation_method
+    ):
+        raise ValueError(
+            "Only one of calculation_method or calculation_parameters must be passed."
+        )
+
+    if calculation_parameters is None:
+        calculation_parameters = CalculationParameters(method=calculation_method)
+
+    if len(trajectory) < 2:
+        raise ValueError("A trajectory needs at least two samples.")
+
+    if any(sample[0].tzinfo is None for sample in trajectory):
+        raise ValueError("Trajectory timestamps must be timezone aware.")
+
+    track = _Track(trajectory, ephemeris)
+    if track.ephemeris is None:
+        track.ephemeris = SolarEphemeris(
+            _UNIX_EPOCH_JULIAN_DAY + min(track.seconds) / _SECONDS_PER_DAY - 1,
+            _UNIX_EPOCH_JULIAN_DAY + max(track.seconds) / _SECONDS_PER_DAY + 1,
+        )
+
+    # sun at every sample in one pass, refined between samples only on crossings
+    suns = [
+        track.sun(seconds, Coordinates(latitude, longitude))
+        for seconds, latitude, longitude in zip(
+            track.seconds, track.latitudes, track.longitudes
+        )
+    ]
+
+    shadow_length = calculation_parameters.madhab.get_shadow_length().shadow_length
+
+    def asr(seconds: float, sun: tuple[float, float, float], latitude: float) -> float:
+        # the shadow at noon sets the altitude, as SolarTime.afternoon does with
+        # the declination of the day
+        altitude, H, _ = sun
+        tangent = abs(latitude - track.transit_declination(seconds, H))
+        inverse = shadow_length + math.tan(math.radians(tangent))
+        return altitude - math.degrees(math.atan(1.0 / inverse))
+
+    # (prayer, function of the seconds, sun and latitude, rising)
+    conditions: list[tuple[Prayer, Callable[..., float], bool]] = [
+        (
+            Prayer.FAJR,
+            lambda seconds, sun, lat: sun[0] + calculation_parameters.fajr_angle,
+            True,
+        ),
+        (Prayer.SUNRISE, lambda seconds, sun, lat: sun[0] - SUNRISE_ALTITUDE, True),
+        (Prayer.DHUHR, lambda seconds, sun, lat: sun[1], True),
+        (Prayer.ASR, asr, False),
+        (
+            Prayer.MAGHRIB,
+            lambda seconds, sun, lat: sun[0] - SUNRISE_ALTITUDE,
+            False,
+        ),
+    ]
+    isha_interval = calculation_parameters.isha_interval
+    if not (isha_interval and isha_interval >= 1):
+        conditions.append(
+            (
+                Prayer.ISHA,
+                lambda seconds, sun, lat: sun[0] + calculation_parameters.isha_angle,
+                False,
+            )
+        )
+
+    crossings: list[tuple[float, Coordinates, Prayer]] = []
+    for prayer, condition, rising in conditions:
+        values = [
+            condition(seconds, sun, latitude)
+            for seconds, sun, latitude in zip(track.seconds, suns, track.latitudes)
+        ]
+        for index in range(len(values) - 1):
+            before, after = values[index], values[index + 1]
+            if prayer == Prayer.DHUHR:
+                # the hour angle jumps from 180 to -180 at midnight (or back for
+                # an observer outrunning the sun westwards), follow it continuously
+                after = before + closest_angle(after - before)
+            if not (before < 0 <= after if rising else before >= 0 > after):
+                continue
+            # asr is in the afternoon
+            if prayer == Prayer.ASR and suns[index][1] < 0:
+                continue
+            crossings.append((*_solve(track, index, condition, rising), prayer))
+
+    if isha_interval and isha_interval >= 1:
+        # at the position of the observer after the interval, missing when the
+        # trajectory ends before
+        for seconds, _, prayer in list(crossings):
+            if prayer != Prayer.MAGHRIB:
+                continue
+            seconds += isha_interval * 60
+            if (coordinates := track.locate(seconds)) is not None:
+                crossings.append((seconds, coordinates, Prayer.ISHA))
+
+    events = []
+    for seconds, coordinates, prayer in sorted(crossings, key=lambda e: e[0]):
+        prayer_name = prayer.name.lower()
+        when = datetime.fromtimestamp(round(seconds), tz=timezone.utc) + timedelta(
+            minutes=getattr(calculation_parameters.adjustments, prayer_name)
+            + getattr(calculation_parameters.method_adjustments, prayer_name)
+        )
+        when = rounded_minute(when)
+        if time_zone is not None:
+            when = when.astimezone(time_zone)
+        events.append(
+            TrajectoryEvent(prayer, when, coordinates.latitude, coordinates.longitude)
+        )
+    return events
+
+
+def _solve(
+    track: _Track, index: int, condition: Callable[..., float], rising: bool
+) -> tuple[float, Coordinates]:
+    # bisection on the interpolated trajectory between samples index and index + 1
+    low, high = track.seconds[index], track.seconds[index + 1]
+    while high - low > _PRECISION_SECONDS:
+        middle = (low + high) / 2
+        coordinates = track.position(index, middle)
+        value = condition(middle, track.sun(middle, coordinates), coordinates.latitude)
+        if (value >= 0) == rising:
+            high = middle
+        else:
+            low = middle
+    return high, track.position(index, high)
@@ -1,6 +1,11 @@
 from adhanpy.data.Coordinates import Coordinates
+from adhanpy.data.Observer import Observer
 from adhanpy.util.FloatUtil import closest_angle, unwind_angle, normalize_with_bound
 import math
+from typing import Iterable, Optional, Union
+
+# altitude of the sun at sunrise and sunset, with the refraction and the radius of the sun
+SUNRISE_ALTITUDE = -50.0 / 60.0
 
 
 def mean_solar_longitude(T: float) -> float:
@@ -147,7 +152,7 @@ def interpolate_angles(y2: float, y1: float, y3: float, n: float) -> float:
 def corrected_hour_angle(
     m0: float,
     h0: float,
-    coordinates: Coordinates,
+    coordinates: Union[Coordinates, Observer],
     afterTransit: bool,
     Θ0: float,
     α2: float,
@@ -156,28 +161,152 @@ def corrected_hour_angle(
     δ2: float,
     δ1: float,
     δ3: float,
+    sin_δ2: Optional[float] = None,
+    cos_δ2: Optional[float] = None,
 ) -> float:
     # Equation from page Astronomical Algorithms 102
-    Lw = coordinates.longitude * -1
-    term1 = math.sin(math.radians(h0)) - (
-        math.sin(math.radians(coordinates.latitude)) * math.sin(math.radians(δ2))
+    return corrected_hour_angles(
+        m0,
+        (h0,),
+        coordinates,
+        afterTransit,
+        Θ0,
+        α2,
+        α1,
+        α3,
+        δ2,
+        δ1,
+        δ3,
+        sin_δ2,
+        cos_δ2,
+    )[0]
+
+
+def corrected_hour_angles(
+    m0: float,
+    h0s: Iterable[float],
+    coordinates: Union[Coordinates, Observer],
+    afterTransit: bool,
+    Θ0: float,
+    α2: float,
+    α1: float,
+    α3: float,
+    δ2: float,
+    δ1: float,
+    δ3: float,
+    sin_δ2: Optional[float] = None,
+    cos_δ2: Optional[float] = None,
+) -> list[float]:
+    """
+    Same as corrected_hour_angle for several altitudes at once, the trigonometry
+    of the declination of the day is only evaluated once, and not at all when
+    sin_δ2 and cos_δ2 are given (e.g. by SolarCoordinates). The trigonometry of
+    the latitude is cached by Observer.
+    """
+    observer = Observer.of(coordinates)
+    sin_φ = observer.sin_latitude
+    cos_φ = observer.cos_latitude
+    if sin_δ2 is None or cos_δ2 is None:
+        δ2_radians = math.radians(δ2)
+        sin_δ2, cos_δ2 = math.sin(δ2_radians), math.cos(δ2_radians)
+    sin_φ_sin_δ2 = sin_φ * sin_δ2
+    cos_φ_cos_δ2 = cos_φ * cos_δ2
+    Lw = observer.longitude * -1
+    return [
+        _corrected_hour_angle(
+            m0,
+            h0,
+            Lw,
+            sin_φ,
+            cos_φ,
+            sin_φ_sin_δ2,
+            cos_φ_cos_δ2,
+            afterTransit,
+            Θ0,
+            α2,
+            α1,
+            α3,
+            δ2,
+            δ1,
+            δ3,
+        )
+        for h0 in h0s
+    ]
+
+
+def _corrected_hour_angle(
+    m0: float,
+    h0: float,
+    Lw: float,
+    sin_φ: float,
+    cos_φ: float,
+    sin_φ_sin_δ2: float,
+    cos_φ_cos_δ2: float,
+    afterTransit: bool,
+    Θ0: float,
+    α2: float,
+    α1: float,
+    α3: float,
+    δ2: float,
+    δ1: float,
+    δ3: float,
+) -> float:
+    H0 = approximate_hour_angle(h0, sin_φ_sin_δ2, cos_φ_cos_δ2)
+    return correct_hour_angle(
+        m0, H0, h0, Lw, sin_φ, cos_φ, afterTransit, Θ0, α2, α1, α3, δ2, δ1, δ3
     )
-    term2 = math.cos(math.radians(coordinates.latitude)) * math.cos(math.radians(δ2))
+
+
+def approximate_hour_angle(
+    h0: float, sin_φ_sin_δ2: float, cos_φ_cos_δ2: float
+) -> float:
+    """
+    Hour angle H0 in degrees of the altitude h0 from the declination of the day,
+    nan when the sun never is at h0. It only depends on the latitude, not on the
+    longitude.
+    """
+    # Equation from page Astronomical Algorithms 102
+    term1 = math.sin(math.radians(h0)) - sin_φ_sin_δ2
+    try:
+        return math.degrees(math.acos(term1 / cos_φ_cos_δ2))
+    except (ValueError, ZeroDivisionError):
+        return math.nan
+
+
+def correct_hour_angle(
+    m0: float,
+    H0: float,
+    h0: float,
+    Lw: float,
+    sin_φ: float,
+    cos_φ: float,
+    afterTransit: bool,
+    Θ0: float,
+    α2: float,
+    α1: float,
+    α3: float,
+    δ2: float,
+    δ1: float,
+    δ3: float,
+) -> float:
+    """
+    Hours of the altitude h0 corrected from the hour angle H0 of
+    approximate_hour_angle, as corrected_hour_angle, nan when H0 is nan
+    """
+    # Equation from page Astronomical Algorithms 102
+    if math.isnan(H0):
+        return math.nan
     try:
-        H0 = math.degrees(math.acos(term1 / term2))
         m = m0 + (H0 / 360) if afterTransit else m0 - (H0 / 360)
         θ = unwind_angle(Θ0 + (360.985647 * m))
         α = unwind_angle(interpolate_angles(α2, α1, α3, m))
-        δ = interpolate(δ2, δ1, δ3, m)
-        H = θ - Lw - α
-        h = altitude_of_celestial_body(coordinates.latitude, δ, H)
+        δ = math.radians(interpolate(δ2, δ1, δ3, m))
+        H = math.radians(θ - Lw - α)
+        cos_δ = math.cos(δ)
+        # altitude_of_celestial_body with the latitude terms already evaluated
+        h = math.degrees(math.asin(sin_φ * math.sin(δ) + cos_φ * cos_δ * math.cos(H)))
         term3 = h - h0
-        term4 = (
-            360
-            * math.cos(math.radians(δ))
-            * math.cos(math.radians(coordinates.latitude))
-            * math.sin(math.radians(H))
-        )
+        term4 = 360 * cos_δ * cos_φ * math.sin(H)
         Δm = term3 / term4
     except:
         return math.nan
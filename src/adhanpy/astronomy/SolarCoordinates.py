@@ -11,10 +11,20 @@ from adhanpy.astronomy.Astronomical import (
     nutation_in_longitude,
     nutation_in_obliquity,
 )
-from adhanpy.util.FloatUtil import unwind_angle
+from adhanpy.util.FloatUtil import closest_angle, unwind_angle
 
 
 class SolarCoordinates:
+    # one is kept per day by every SolarTime, without an instance dictionary
+    __slots__ = (
+        "declination",
+        "sin_declination",
+        "cos_declination",
+        "right_ascension",
+        "apparent_sidereal_time",
+        "equation_of_time",
+    )
+
     def __init__(self, julian_day) -> None:
         T = julian_century(julian_day)
         L0 = mean_solar_longitude(T)
@@ -29,6 +39,9 @@ class SolarCoordinates:
 
         # Equation from Astronomical Algorithms page 165
         self.declination = math.degrees(math.asin(math.sin(εapp) * math.sin(λ)))
+        δ = math.radians(self.declination)
+        self.sin_declination = math.sin(δ)
+        self.cos_declination = math.cos(δ)
 
         # Equation from Astronomical Algorithms page 165
         self.right_ascension = unwind_angle(
@@ -39,3 +52,8 @@ class SolarCoordinates:
         self.apparent_sidereal_time = θ0 + (
             ((ΔΨ * 3600) * math.cos(math.radians(ε0 + Δε))) / 3600
         )
+
+        # Equation from Astronomical Algorithms page 185, in degrees
+        self.equation_of_time = closest_angle(
+            L0 - 0.0057183 - self.right_ascension + ΔΨ * math.cos(math.radians(ε0 + Δε))
+        )
@@ -0,0 +1,219 @@
+import math
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Optional
+from adhanpy.astronomy.Astronomical import altitude_of_celestial_body
+from adhanpy.astronomy.CalendricalHelper import julian_day
+from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.data.Coordinates import Coordinates
+from adhanpy.util.FloatUtil import closest_angle, unwind_angle
+
+# quantities fitted for each segment, in this order
+_QUANTITIES = (
+    "declination",
+    "right_ascension",
+    "apparent_sidereal_time",
+    "equation_of_time",
+)
+
+
+@dataclass(frozen=True)
+class EphemerisCoordinates:
+    """
+    Same attributes as SolarCoordinates (in degrees) so that it can be passed
+    wherever SolarCoordinates are expected, e.g. SolarTime(..., solar_coordinates)
+    """
+
+    declination: float
+    right_ascension: float
+    apparent_sidereal_time: float
+    equation_of_time: float
+
+    @property
+    def sin_declination(self) -> float:
+        return math.sin(math.radians(self.declination))
+
+    @property
+    def cos_declination(self) -> float:
+        return math.cos(math.radians(self.declination))
+
+
+def _mean_sidereal_rotation(jd: float) -> float:
+    # linear part of the mean sidereal time, Astronomical Algorithms page 88
+    return 280.46061837 + 360.98564736629 * (jd - 2451545)
+
+
+class SolarEphemeris:
+    def __init__(
+        self,
+        start_julian_day: float,
+        end_julian_day: float,
+        segment_days: int = 16,
+        degree: int = 10,
+    ) -> None:
+        """
+        Chebyshev polynomial fit of SolarCoordinates between two julian days, the
+        range is split in segments of segment_days each with its own polynomial
+        of the given degree per quantity.
+        Arguments:
+            start_julian_day: first julian day covered
+            end_julian_day: last julian day covered
+            segment_days: length of each fitted segment, at most 120 days
+            degree: degree of the Chebyshev polynomials
+        """
+        if end_julian_day <= start_julian_day:
+            raise ValueError("end_julian_day must be after start_julian_day.")
+        if not 0 < segment_days <= 120:
+            raise ValueError("segment_days must be between 1 and 120.")
+        if degree < 1:
+            raise ValueError("degree must be at least 1.")
+
+        self.start_julian_day = start_julian_day
+        self.end_julian_day = end_julian_day
+        self.segment_days = segment_days
+        self.degree = degree
+        self.segments = math.ceil((end_julian_day - start_julian_day) / segment_days)
+
+        # coefficients of segment s and quantity q start at (s * 4 + q) * (degree + 1)
+        self._coefficients = array("d")
+        for segment in range(self.segments):
+            self._fit_segment(start_julian_day + segment * segment_days)
+
+    @classmethod
+    def for_years(cls, start_year: int, end_year: int, **kwargs) -> "SolarEphemeris":
+        """
+        Ephemeris covering from the 1st of January of start_year to the 31st of
+        December of end_year, both included
+        """
+        return cls(
+            julian_day(start_year, 1, 1) - 1,
+            julian_day(end_year + 1, 1, 1) + 1,
+            **kwargs,
+        )
+
+    def _fit_segment(self, segment_start: float) -> None:
+        n = self.degree + 1
+        half_length = self.segment_days / 2
+        middle = segment_start + half_length
+
+        samples: list[list[float]] = [[] for _ in _QUANTITIES]
+        for k in range(n):
+            jd = middle + half_length * math.cos(math.pi * (k + 0.5) / n)
+            solar = SolarCoordinates(jd)
+            samples[0].append(solar.declination)
+            samples[1].append(solar.right_ascension)
+            samples[2].append(
+                closest_angle(
+                    solar.apparent_sidereal_time - _mean_sidereal_rotation(jd)
+                )
+            )
+            samples[3].append(solar.equation_of_time)
+
+        # right ascension wraps at 360, make it continuous over the segment
+        first = samples[1][0]
+        samples[1] = [first + closest_angle(value - first) for value in samples[1]]
+
+        for values in samples:
+            for j in range(n):
+                coefficient = (2.0 / n) * sum(
+                    value * math.cos(math.pi * j * (k + 0.5) / n)
+                    for k, value in enumerate(values)
+                )
+                self._coefficients.append(coefficient / 2 if j == 0 else coefficient)
+
+    def _evaluate(self, jd: float, quantity: int) -> float:
+        if not self.start_julian_day <= jd <= self.end_julian_day:
+            raise ValueError(f"Julian day {jd} is outside of the fitted range.")
+
+        segment = min(
+            int((jd - self.start_julian_day) / self.segment_days), self.segments - 1
+        )
+        half_length = self.segment_days / 2
+        x = (
+            jd - (self.start_julian_day + segment * self.segment_days + half_length)
+        ) / half_length
+
+        # Clenshaw recurrence
+        n = self.degree + 1
+        offset = (segment * len(_QUANTITIES) + quantity) * n
+        b1 = b2 = 0.0
+        for j in range(offset + n - 1, offset, -1):
+            b1, b2 = 2 * x * b1 - b2 + self._coefficients[j], b1
+        return x * b1 - b2 + self._coefficients[offset]
+
+    def declination(self, jd: float) -> float:
+        return self._evaluate(jd, 0)
+
+    def right_ascension(self, jd: float) -> float:
+        return unwind_angle(self._evaluate(jd, 1))
+
+    def apparent_sidereal_time(self, jd: float) -> float:
+        return unwind_angle(_mean_sidereal_rotation(jd) + self._evaluate(jd, 2))
+
+    def equation_of_time(self, jd: float) -> float:
+        return self._evaluate(jd, 3)
+
+    def coordinates(self, jd: float) -> EphemerisCoordinates:
+        return EphemerisCoordinates(
+            self.declination(jd),
+            self.right_ascension(jd),
+            self.apparent_sidereal_time(jd),
+            self.equation_of_time(jd),
+        )
+
+    def solar_altitude(self, jd: float, coordinates: Coordinates) -> float:
+        """
+        Altitude of the sun in degrees at the instant jd (fractional julian day, UT)
+        as seen from coordinates
+        """
+        H = (
+            self.apparent_sidereal_time(jd)
+            + coordinates.longitude
+            - self.right_ascension(jd)
+        )
+        return altitude_of_celestial_body(coordinates.latitude, self.declination(jd), H)
+
+    def max_deviation(self, step_days: float = 0.25) -> dict[str, float]:
+        """
+        Compare the fit against SolarCoordinates every step_days over the whole
+        range and return the maximum absolute deviation in degrees per quantity.
+        """
+        deviations = dict.fromkeys(_QUANTITIES, 0.0)
+        getters: dict[str, Callable[[float], float]] = {
+            name: getattr(self, name) for name in _QUANTITIES
+        }
+        steps = int((self.end_julian_day - self.start_julian_day) / step_days)
+        for step in range(steps + 1):
+            jd = self.start_julian_day + step * step_days
+            solar = SolarCoordinates(jd)
+            for name, getter in getters.items():
+                deviation = abs(closest_angle(getter(jd) - getattr(solar, name)))
+                if deviation > deviations[name]:
+                    deviations[name] = deviation
+        return deviations
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """
+    Fit and verify tool:
+        python -m adhanpy.astronomy.SolarEphemeris START_YEAR END_YEAR [SEGMENT_DAYS DEGREE]
+    """
+    args = sys.argv[1:] if argv is None else argv
+    start_year, end_year = int(args[0]), int(args[1])
+    segment_days = int(args[2]) if len(args) > 2 else 16
+    degree = int(args[3]) if len(args) > 3 else 10
+
+    ephemeris = SolarEphemeris.for_years(
+        start_year, end_year, segment_days=segment_days, degree=degree
+    )
+    print(
+        f"{ephemeris.segments} segments of {segment_days} days, degree {degree}, "
+        f"{len(ephemeris._coefficients)} coefficients"
+    )
+    for name, deviation in ephemeris.max_deviation().items():
+        print(f"{name}: max deviation {deviation:.3e} degrees")
+
+
+if __name__ == "__main__":
+    main()
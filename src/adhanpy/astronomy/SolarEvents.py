@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Sequence, Union
+from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.astronomy.SolarTime import SolarTime
+from adhanpy.data.Observer import Observer
+from adhanpy.data.ShadowLength import ShadowLength
+from adhanpy.util.DateComponents import DateComponents
+from adhanpy.util.TimeComponents import TimeComponents
+
+
+class SolarEvents:
+    def __init__(
+        self,
+        coordinates: Union[tuple[float, float], Observer],
+        date: datetime,
+        solar_coordinates: Optional[Sequence[SolarCoordinates]] = None,
+    ) -> None:
+        """
+        First stage of PrayerTimes: the solar events of a location and date which
+        do not depend on the calculation parameters, in UTC and not rounded.
+        The times of the sun at a given altitude (fajr, isha) or shadow length (asr)
+        are computed on first use and kept, so that applying other parameters to
+        the same events needs no more astronomy for the altitudes and shadow lengths
+        already used. The first use of another altitude or shadow length needs its
+        hour angle, unless it is computed up front with precompute.
+        Arguments:
+            coordinates: (latitude, longitude) or Observer
+            date: the year, month and day are used
+            solar_coordinates: optional SolarCoordinates of the day before, the day,
+                the day after and two days after the date, computed when not given
+        Raises:
+            RuntimeError when the sun does not rise or set at the location and date
+        """
+        self.observer = (
+            coordinates
+            if isinstance(coordinates, Observer)
+            else Observer(coordinates[0], coordinates[1])
+        )
+        self.date_components = DateComponents.from_utc(date)
+        # UTC midnight of the date
+        self.date = datetime(
+            self.date_components.year,
+            self.date_components.month,
+            self.date_components.day,
+            tzinfo=timezone.utc,
+        )
+        self.day_of_year = self.date.timetuple().tm_yday
+
+        tomorrow_date_components = DateComponents.from_utc(
+            self.date + timedelta(days=1)
+        )
+
+        if solar_coordinates is None:
+            self.solar_time = SolarTime(self.date_components, self.observer)
+            tomorrow_solar_time = SolarTime(tomorrow_date_components, self.observer)
+        else:
+            prev_solar, solar, next_solar, after_next_solar = solar_coordinates
+            self.solar_time = SolarTime(
+                self.date_components,
+                self.observer,
+                (prev_solar, solar, next_solar),
+            )
+            tomorrow_solar_time = SolarTime(
+                tomorrow_date_components,
+                self.observer,
+                (solar, next_solar, after_next_solar),
+            )
+
+        transit = self._time(self.solar_time.transit)
+        sunrise = self._time(self.solar_time.sunrise)
+        sunset = self._time(self.solar_time.sunset)
+        tomorrow_sunrise_components = TimeComponents.from_float(
+            tomorrow_solar_time.sunrise
+        )
+
+        if (
+            transit is None
+            or sunrise is None
+            or sunset is None
+            or tomorrow_sunrise_components is None
+        ):
+            raise RuntimeError
+
+        self.transit: datetime = transit
+        self.sunrise: datetime = sunrise
+        self.sunset: datetime = sunset
+        self.tomorrow_sunrise = tomorrow_sunrise_components.date_components(
+            tomorrow_date_components
+        )
+        # in milliseconds
+        self.night_length = (
+            self.tomorrow_sunrise.timestamp() * 1000 - self.sunset.timestamp() * 1000
+        )
+
+        self._hour_angles: dict[tuple[float, bool], Optional[datetime]] = {}
+        self._afternoons: dict[float, Optional[datetime]] = {}
+
+    def hour_angle(self, angle: float, after_transit: bool) -> Optional[datetime]:
+        """Time the sun is at angle degrees of altitude, None if it never is"""
+        key = (angle, after_transit)
+        if key not in self._hour_angles:
+            self._hour_angles[key] = self._time(
+                self.solar_time.hour_angle(angle, after_transit)
+            )
+        return self._hour_angles[key]
+
+    def precompute(
+        self,
+        morning_altitudes: Iterable[float] = (),
+        evening_altitudes: Iterable[float] = (),
+        shadow_lengths: Iterable[ShadowLength] = (),
+    ) -> None:
+        """
+        Compute up front the times of altitudes before transit (morning) and after
+        transit (evening) and of shadow lengths not computed yet, the trigonometry
+        of the declination is shared by the altitudes
+        """
+        for altitudes, after_transit in (
+            (morning_altitudes, False),
+            (evening_altitudes, True),
+        ):
+            missing = [
+                altitude
+                for altitude in dict.fromkeys(altitudes)
+                if (altitude, after_transit) not in self._hour_angles
+            ]
+            if not missing:
+                continue
+            hours = self.solar_time.hour_angles(missing, after_transit)
+            for altitude, value in zip(missing, hours):
+                self._hour_angles[(altitude, after_transit)] = self._time(value)
+
+        for shadow_length in shadow_lengths:
+            self.afternoon(shadow_length)
+
+    def afternoon(self, shadow_length: ShadowLength) -> Optional[datetime]:
+        """Time the shadow of an object is shadow_length plus its noon shadow"""
+        key = shadow_length.shadow_length
+        if key not in self._afternoons:
+            self._afternoons[key] = self._time(self.solar_time.afternoon(shadow_length))
+        return self._afternoons[key]
+
+    def _time(self, hours: float) -> Optional[datetime]:
+        time_components = TimeComponents.from_float(hours)
+        if time_components is None:
+            return None
+        return time_components.date_components(self.date_components)
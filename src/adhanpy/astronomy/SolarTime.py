@@ -1,30 +1,66 @@
 import math
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
 from adhanpy.astronomy.Astronomical import (
+    SUNRISE_ALTITUDE,
     approximate_transit,
     corrected_hour_angle,
+    corrected_hour_angles,
     corrected_transit,
 )
 from adhanpy.astronomy.CalendricalHelper import julian_day
+from adhanpy.data.Observer import Observer
 from adhanpy.data.ShadowLength import ShadowLength
 from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.util.DateComponents import DateComponents
 
 
 class SolarTime:
-    def __init__(self, date_components, coordinates):
-        julian_date = julian_day(
-            date_components.year, date_components.month, date_components.day
-        )
+    __slots__ = (
+        "prev_solar",
+        "solar",
+        "next_solar",
+        "observer",
+        "approximate_transit",
+        "transit",
+        "sunrise",
+        "sunset",
+    )
+
+    def __init__(
+        self,
+        date_components,
+        coordinates,
+        solar_coordinates: Optional[
+            tuple[SolarCoordinates, SolarCoordinates, SolarCoordinates]
+        ] = None,
+    ):
+        """
+        Arguments:
+            date_components: DateComponents
+            coordinates: Coordinates or Observer, the sine and cosine of the
+                latitude of an Observer are reused for every hour angle
+            solar_coordinates: optional (previous day, day, next day) SolarCoordinates
+                already computed for the date, they are computed when not given
+        """
+        if solar_coordinates is None:
+            julian_date = julian_day(
+                date_components.year, date_components.month, date_components.day
+            )
+            solar_coordinates = (
+                SolarCoordinates(julian_date - 1),
+                SolarCoordinates(julian_date),
+                SolarCoordinates(julian_date + 1),
+            )
 
-        self.prev_solar = SolarCoordinates(julian_date - 1)
-        self.solar = SolarCoordinates(julian_date)
-        self.next_solar = SolarCoordinates(julian_date + 1)
+        self.prev_solar, self.solar, self.next_solar = solar_coordinates
+        coordinates = Observer.of(coordinates)
 
         self.approximate_transit = approximate_transit(
             coordinates.longitude,
             self.solar.apparent_sidereal_time,
             self.solar.right_ascension,
         )
-        solar_altitude = -50.0 / 60.0
 
         self.observer = coordinates
         self.transit = corrected_transit(
@@ -37,7 +73,7 @@ class SolarTime:
         )
         self.sunrise = corrected_hour_angle(
             self.approximate_transit,
-            solar_altitude,
+            SUNRISE_ALTITUDE,
             coordinates,
             False,
             self.solar.apparent_sidereal_time,
@@ -47,10 +83,12 @@ class SolarTime:
             self.solar.declination,
             self.prev_solar.declination,
             self.next_solar.declination,
+            self.solar.sin_declination,
+            self.solar.cos_declination,
         )
         self.sunset = corrected_hour_angle(
             self.approximate_transit,
-            solar_altitude,
+            SUNRISE_ALTITUDE,
             coordinates,
             True,
             self.solar.apparent_sidereal_time,
@@ -60,6 +98,8 @@ class SolarTime:
             self.solar.declination,
             self.prev_solar.declination,
             self.next_solar.declination,
+            self.solar.sin_declination,
+            self.solar.cos_declination,
         )
 
     def hour_angle(self, angle, after_transit):
@@ -75,6 +115,31 @@ class SolarTime:
             self.solar.declination,
             self.prev_solar.declination,
             self.next_solar.declination,
+            self.solar.sin_declination,
+            self.solar.cos_declination,
+        )
+
+    def hour_angles(
+        self, altitudes: Iterable[float], after_transit: bool
+    ) -> list[float]:
+        """
+        Same as hour_angle for a list of altitudes, for instance to sweep several
+        twilight angles in one call.
+        """
+        return corrected_hour_angles(
+            self.approximate_transit,
+            altitudes,
+            self.observer,
+            after_transit,
+            self.solar.apparent_sidereal_time,
+            self.solar.right_ascension,
+            self.prev_solar.right_ascension,
+            self.next_solar.right_ascension,
+            self.solar.declination,
+            self.prev_solar.declination,
+            self.next_solar.declination,
+            self.solar.sin_declination,
+            self.solar.cos_declination,
         )
 
     def afternoon(self, shadow_length: ShadowLength):
@@ -84,3 +149,50 @@ class SolarTime:
         angle = math.degrees(math.atan(1.0 / inverse))
 
         return self.hour_angle(angle, True)
+
+
+def solar_times(date_components, days: int, coordinates) -> Iterable[SolarTime]:
+    """
+    Yield the SolarTime of `days` consecutive days starting at date_components,
+    the SolarCoordinates of a day are shared with the two neighbouring days
+    instead of being computed three times.
+    """
+    start = datetime(
+        date_components.year,
+        date_components.month,
+        date_components.day,
+        tzinfo=timezone.utc,
+    )
+    julian_date = julian_day(
+        date_components.year, date_components.month, date_components.day
+    )
+    prev_solar = SolarCoordinates(julian_date - 1)
+    solar = SolarCoordinates(julian_date)
+    coordinates = Observer.of(coordinates)
+
+    for offset in range(days):
+        next_solar = SolarCoordinates(julian_date + offset + 1)
+        yield SolarTime(
+            DateComponents.from_utc(start + timedelta(days=offset)),
+            coordinates,
+            (prev_solar, solar, next_solar),
+        )
+        prev_solar, solar = solar, next_solar
+
+
+def hour_angles_for_dates(
+    date_components,
+    days: int,
+    coordinates,
+    altitudes: Iterable[float],
+    after_transit: bool,
+) -> list[list[float]]:
+    """
+    SolarTime.hour_angles evaluated for `days` consecutive days starting at
+    date_components, returns one list of hours per day in the order of altitudes.
+    """
+    altitudes = list(altitudes)
+    return [
+        solar_time.hour_angles(altitudes, after_transit)
+        for solar_time in solar_times(date_components, days, coordinates)
+    ]
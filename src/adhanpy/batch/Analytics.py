@@ -0,0 +1,221 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Sequence, Union
+from zoneinfo import ZoneInfo
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.batch.BatchPrayerTimes import iter_solar_coordinates
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import PolicyTimes, apply_policy
+from adhanpy.data.Observer import Observer
+from adhanpy.data.Prayer import MINUTES_PER_DAY, PRAYERS, Prayer
+
+
+@dataclass(frozen=True)
+class Threshold:
+    """Days a prayer is after (or before) a time of the day, e.g. isha after 23:00"""
+
+    prayer: Prayer
+    time: time
+    before: bool = False
+
+
+@dataclass(frozen=True)
+class Extreme:
+    date: date
+    # minutes since the local midnight of the date, past 1440 when the prayer is
+    # after the next midnight and negative when before the midnight of the date
+    minutes: int
+
+    @property
+    def clock(self) -> str:
+        """Time of the day as HH:MM"""
+        return f"{self.minutes // 60 % 24:02d}:{self.minutes % 60:02d}"
+
+
+@dataclass(frozen=True)
+class MonthlySummary:
+    year: int
+    month: int
+    days: int
+    earliest: Extreme
+    latest: Extreme
+    # mean minutes since local midnight
+    mean: float
+
+
+@dataclass(frozen=True)
+class PrayerSummary:
+    prayer: Prayer
+    earliest: Extreme
+    latest: Extreme
+    monthly: list[MonthlySummary]
+
+
+@dataclass(frozen=True)
+class ThresholdDays:
+    threshold: Threshold
+    # days the prayer is past the threshold
+    days: list[date]
+    # first day of each change, with whether the prayer is past the threshold from it
+    crossings: list[tuple[date, bool]]
+
+
+@dataclass(frozen=True)
+class LocationSummary:
+    coordinates: tuple[float, float]
+    # prayers of days where prayer times can be calculated
+    prayers: dict[Prayer, PrayerSummary]
+    thresholds: list[ThresholdDays]
+    # days where prayer times cannot be calculated
+    failed_days: list[date]
+
+
+@dataclass
+class _Month:
+    days: int
+    total: int
+    earliest: Extreme
+    latest: Extreme
+
+
+@dataclass
+class _Location:
+    coordinates: tuple[float, float]
+    # the trigonometry of the latitude is shared by the days
+    observer: Observer
+    time_zone: Optional[ZoneInfo]
+    # per prayer of PRAYERS: months in order
+    months: list[dict[tuple[int, int], _Month]]
+    thresholds: list[ThresholdDays]
+    # per threshold: whether the prayer was past it the last day
+    states: list[Optional[bool]]
+    failed_days: list[date] = field(default_factory=list)
+
+
+def analyze(
+    locations: Sequence[tuple[float, float]],
+    start: datetime,
+    days: int,
+    calculation_parameters: CalculationParameters,
+    time_zones: Union[None, ZoneInfo, Sequence[Optional[ZoneInfo]]] = None,
+    thresholds: Sequence[Threshold] = (),
+) -> list[LocationSummary]:
+    """
+    Earliest and latest time of each prayer with its date, monthly earliest,
+    latest and mean, and the days past the thresholds, for each location over
+    days from start. A single pass over the days computes all the locations of a
+    day with the solar coordinates of the day (SolarEvents and apply_policy, no
+    PrayerTimes), and keeps only the aggregates.
+    Arguments:
+        time_zones: time zone of all the locations or of each location, times of
+            the day are in UTC when None
+        thresholds: Threshold
+    """
+    if isinstance(time_zones, ZoneInfo) or time_zones is None:
+        time_zones = [time_zones] * len(locations)
+    elif len(time_zones) != len(locations):
+        raise ValueError("time_zones must have a time zone per location.")
+
+    states = [
+        _Location(
+            coordinates,
+            Observer(coordinates[0], coordinates[1]),
+            time_zone,
+            [{} for _ in PRAYERS],
+            [ThresholdDays(threshold, [], []) for threshold in thresholds],
+            [None] * len(thresholds),
+        )
+        for coordinates, time_zone in zip(locations, time_zones)
+    ]
+    limits = [
+        (
+            PRAYERS.index(threshold.prayer),
+            threshold.time.hour * 60 + threshold.time.minute,
+            threshold.before,
+        )
+        for threshold in thresholds
+    ]
+
+    for offset, window in enumerate(iter_solar_coordinates(start, days)):
+        day = start + timedelta(days=offset)
+        for state in states:
+            try:
+                times = apply_policy(
+                    SolarEvents(state.observer, day, window), calculation_parameters
+                )
+            except (RuntimeError, ValueError):
+                state.failed_days.append(day.date())
+                continue
+            _add(state, day.date(), times, limits)
+
+    return [_summary(state) for state in states]
+
+
+def _add(
+    state: _Location,
+    day: date,
+    times: PolicyTimes,
+    limits: list[tuple[int, int, bool]],
+) -> None:
+    ordinal = day.toordinal()
+    month_key = (day.year, day.month)
+    minutes = []
+    for prayer in PRAYERS:
+        when = getattr(times, prayer.name.lower())
+        if state.time_zone is not None:
+            when = when.astimezone(state.time_zone)
+        minutes.append(
+            (when.toordinal() - ordinal) * MINUTES_PER_DAY
+            + when.hour * 60
+            + when.minute
+        )
+
+    for months, value in zip(state.months, minutes):
+        month = months.get(month_key)
+        if month is None:
+            extreme = Extreme(day, value)
+            months[month_key] = _Month(1, value, extreme, extreme)
+            continue
+        month.days += 1
+        month.total += value
+        if value < month.earliest.minutes:
+            month.earliest = Extreme(day, value)
+        if value > month.latest.minutes:
+            month.latest = Extreme(day, value)
+
+    for index, (position, limit, before) in enumerate(limits):
+        value = minutes[position]
+        past = value < limit if before else value > limit
+        result = state.thresholds[index]
+        if past:
+            result.days.append(day)
+        if state.states[index] is not None and past != state.states[index]:
+            result.crossings.append((day, past))
+        state.states[index] = past
+
+
+def _summary(state: _Location) -> LocationSummary:
+    prayers = {}
+    for prayer, months in zip(PRAYERS, state.months):
+        if not months:
+            continue
+        monthly = [
+            MonthlySummary(
+                year,
+                month,
+                summary.days,
+                summary.earliest,
+                summary.latest,
+                summary.total / summary.days,
+            )
+            for (year, month), summary in months.items()
+        ]
+        prayers[prayer] = PrayerSummary(
+            prayer,
+            min(monthly, key=lambda month: month.earliest.minutes).earliest,
+            max(monthly, key=lambda month: month.latest.minutes).latest,
+            monthly,
+        )
+    return LocationSummary(
+        state.coordinates, prayers, state.thresholds, state.failed_days
+    )
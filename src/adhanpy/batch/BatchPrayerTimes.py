@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.astronomy.CalendricalHelper import julian_day
+from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+
+def solar_coordinates_for(date: datetime) -> list[SolarCoordinates]:
+    """
+    SolarCoordinates from the day before to two days after date, as expected by
+    the solar_coordinates argument of PrayerTimes
+    """
+    jd = julian_day(date.year, date.month, date.day)
+    return [SolarCoordinates(jd + offset) for offset in (-1, 0, 1, 2)]
+
+
+def iter_solar_coordinates(
+    start: datetime, days: int
+) -> Iterator[list[SolarCoordinates]]:
+    """
+    solar_coordinates_for of consecutive days from start, the SolarCoordinates of a
+    day are computed once and shared with the windows of the neighbouring days
+    """
+    jd = julian_day(start.year, start.month, start.day)
+    window = [SolarCoordinates(jd + offset) for offset in (-1, 0, 1)]
+    for offset in range(days):
+        window.append(SolarCoordinates(jd + offset + 2))
+        yield window
+        window = window[1:]
+
+
+def prayer_times_batch(
+    coordinates: Iterable[tuple[float, float]],
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+) -> list[Union[PrayerTimes, Exception]]:
+    """
+    PrayerTimes of many locations for the same date and parameters, the solar
+    coordinates of the date are computed once for all locations instead of six
+    times per location. The result of a location where prayer times cannot be
+    calculated is the exception PrayerTimes raised.
+    """
+    solar_coordinates = solar_coordinates_for(date)
+    results: list[Union[PrayerTimes, Exception]] = []
+    for location in coordinates:
+        try:
+            results.append(
+                PrayerTimes(
+                    location,
+                    date,
+                    calculation_parameters=calculation_parameters,
+                    time_zone=time_zone,
+                    solar_coordinates=solar_coordinates,
+                )
+            )
+        except (RuntimeError, ValueError) as error:
+            results.append(error)
+    return results
@@ -0,0 +1,325 @@
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Optional
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import apply_policy
+from adhanpy.calculation.Regime import DeclinationTable, RegimeClassifier
+from adhanpy.data.Observer import Observer
+from adhanpy.data.Prayer import PRAYERS
+
+MAGIC = b"ADHG"
+FORMAT = "adhanpy-grid"
+VERSION = 1
+
+# minutes stored where prayer times cannot be calculated
+MISSING = -0x8000
+
+# magic, length of the JSON header
+_PREFIX = struct.Struct("<4sI")
+# the completion flags and the data start on a page boundary
+_ALIGNMENT = 4096
+
+
+def generate_grid(
+    path: str,
+    bounds: tuple[float, float, float, float],
+    step: float,
+    start: date,
+    days: int,
+    calculation_parameters: CalculationParameters,
+    band_rows: int = 32,
+    block_days: int = 8,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Compute the prayer times of a latitude and longitude grid for days from start
+    into a file read by GridStore, one chunk of band_rows latitudes by block_days
+    days at a time, so that memory is bounded by a chunk however large the grid.
+    A chunk is flagged complete in the file once written: calling generate_grid
+    again with the same arguments after an interruption only computes the chunks
+    left. The file is:
+        prefix (8 bytes): magic and length of the JSON header
+        JSON header: the grid, days, prayers, chunking and offsets of the flags
+            and data
+        flags (1 byte per chunk), from the first page boundary: 1 once complete
+        data, from the next page boundary: for each day, latitude from north to
+            south and longitude from west to east, the minutes of fajr, sunrise,
+            dhuhr, asr, maghrib and isha since the UTC midnight of the day, 6 int16
+    All integers are little endian.
+    Arguments:
+        bounds: (south, west, north, east) in degrees
+        step: degrees between grid points, in latitude and longitude
+        progress: called with the chunks completed and the number of chunks
+    Returns:
+        number of chunks computed
+    """
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    if days < 1 or band_rows < 1 or block_days < 1:
+        raise ValueError("days, band_rows and block_days must be at least 1.")
+
+    south, west, north, east = bounds
+    rows = int(math.floor((north - south) / step + 1e-9)) + 1
+    columns = int(math.floor((east - west) / step + 1e-9)) + 1
+    bands = -(-rows // band_rows)
+    blocks = -(-days // block_days)
+    chunks = bands * blocks
+
+    header: dict = {
+        "format": FORMAT,
+        "version": VERSION,
+        "north": north,
+        "west": west,
+        "step": step,
+        "rows": rows,
+        "columns": columns,
+        "start": start.isoformat(),
+        "days": days,
+        "prayers": [prayer.name.lower() for prayer in PRAYERS],
+        "type": "<i2",
+        "missing": MISSING,
+        "units": "minutes since the UTC midnight of the day",
+        "parameters": repr(calculation_parameters.cache_key()),
+        "band_rows": band_rows,
+        "block_days": block_days,
+        "chunks": chunks,
+    }
+    # room for the two offsets added to the header
+    header_length = len(_encode(header)) + 64
+    header["flags_offset"] = _aligned(_PREFIX.size + header_length)
+    header["data_offset"] = _aligned(header["flags_offset"] + chunks)
+    encoded = _encode(header)
+    size = header["data_offset"] + days * rows * columns * len(PRAYERS) * 2
+
+    if os.path.exists(path):
+        with open(path, "rb") as stored:
+            existing = _read_header(stored.read(header["flags_offset"]))
+        if existing != header or os.path.getsize(path) != size:
+            raise ValueError(f"{path} holds another grid.")
+    else:
+        with open(path, "wb") as created:
+            created.write(_PREFIX.pack(MAGIC, len(encoded)) + encoded)
+            created.truncate(size)
+
+    computed = 0
+    with open(path, "r+b") as file, mmap.mmap(file.fileno(), size) as mapped:
+        flags_offset = header["flags_offset"]
+        for chunk in range(chunks):
+            if mapped[flags_offset + chunk]:
+                continue
+            block, band = divmod(chunk, bands)
+            first_row = band * band_rows
+            last_row = min(rows, first_row + band_rows)
+            first_day = block * block_days
+            for day_index in range(first_day, min(days, first_day + block_days)):
+                day = start + timedelta(days=day_index)
+                values = _day_minutes(
+                    datetime(day.year, day.month, day.day),
+                    [north - row * step for row in range(first_row, last_row)],
+                    [west + column * step for column in range(columns)],
+                    calculation_parameters,
+                )
+                position = header["data_offset"] + (
+                    (day_index * rows + first_row) * columns * len(PRAYERS) * 2
+                )
+                mapped[position : position + len(values)] = values
+            # the data reaches the disk before the chunk is flagged complete
+            mapped.flush()
+            mapped[flags_offset + chunk] = 1
+            mapped.flush()
+            computed += 1
+            if progress is not None:
+                progress(chunk + 1, chunks)
+    return computed
+
+
+class GridStore:
+    def __init__(self, path: str) -> None:
+        """
+        Memory map a file written by generate_grid, reading a region and days only
+        pages in the rows of the region on these days.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.header = _read_header(self._mmap)
+        except ValueError:
+            self._mmap.close()
+            raise
+
+        self.north = self.header["north"]
+        self.west = self.header["west"]
+        self.step = self.header["step"]
+        self.rows = self.header["rows"]
+        self.columns = self.header["columns"]
+        self.days = self.header["days"]
+        self.start = date.fromisoformat(self.header["start"])
+        self._data_offset = self.header["data_offset"]
+        self._flags_offset = self.header["flags_offset"]
+
+    @property
+    def complete(self) -> bool:
+        """Whether generate_grid has written every chunk"""
+        flags = self._mmap[
+            self._flags_offset : self._flags_offset + self.header["chunks"]
+        ]
+        return all(flags)
+
+    def latitude(self, row: int) -> float:
+        return self.north - row * self.step
+
+    def longitude(self, column: int) -> float:
+        return self.west + column * self.step
+
+    def row(self, latitude: float) -> int:
+        """Row of the grid point nearest to latitude"""
+        return self._check(round((self.north - latitude) / self.step), self.rows)
+
+    def column(self, longitude: float) -> int:
+        """Column of the grid point nearest to longitude"""
+        return self._check(round((longitude - self.west) / self.step), self.columns)
+
+    def minutes(self, day: date, row: int, column: int) -> tuple[int, ...]:
+        """Minutes since the UTC midnight of the day of each prayer of PRAYERS"""
+        self._check(column, self.columns)
+        values = self._read(self._day(day), row, column, column + 1)
+        if values[0] == MISSING:
+            raise ValueError(
+                f"Prayer times at {self.latitude(row)}, {self.longitude(column)} "
+                f"on {day} could not be calculated."
+            )
+        return tuple(values)
+
+    def region(
+        self,
+        bounds: tuple[float, float, float, float],
+        first_day: date,
+        days: int = 1,
+    ) -> list[list[array]]:
+        """
+        Minutes of the grid points within bounds (south, west, north, east), for
+        each day then each row from north to south: an array of the minutes of
+        each prayer of PRAYERS of each column from west to east, MISSING where
+        prayer times cannot be calculated. Bounds reaching past the grid are
+        clamped to it, there are no rows when they do not overlap it.
+        """
+        south, west, north, east = bounds
+        first_row = max(0, math.ceil((self.north - north) / self.step - 1e-9))
+        last_row = min(
+            self.rows - 1, math.floor((self.north - south) / self.step + 1e-9)
+        )
+        first_column = max(0, math.ceil((west - self.west) / self.step - 1e-9))
+        last_column = min(
+            self.columns - 1, math.floor((east - self.west) / self.step + 1e-9)
+        )
+        if first_column > last_column:
+            first_row, last_row = 0, -1
+
+        first = self._day(first_day)
+        if first + days > self.days:
+            raise IndexError("Days out of range.")
+        return [
+            [
+                self._read(day_index, row, first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)
+            ]
+            for day_index in range(first, first + days)
+        ]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "GridStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read(self, day_index: int, row: int, first: int, last: int) -> array:
+        # columns first to last excluded of a row
+        self._check(row, self.rows)
+        if not 0 <= first < last <= self.columns:
+            raise IndexError("Grid columns out of range.")
+        position = self._data_offset + (
+            ((day_index * self.rows + row) * self.columns + first) * len(PRAYERS) * 2
+        )
+        values = array("h")
+        values.frombytes(
+            self._mmap[position : position + (last - first) * len(PRAYERS) * 2]
+        )
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def _day(self, day: date) -> int:
+        index = (day - self.start).days
+        if not 0 <= index < self.days:
+            raise IndexError(f"{day} is not in the grid.")
+        return index
+
+    def _check(self, index: int, size: int) -> int:
+        if not 0 <= index < size:
+            raise IndexError("Grid index out of range.")
+        return index
+
+
+def _day_minutes(
+    day: datetime,
+    latitudes: list[float],
+    longitudes: list[float],
+    calculation_parameters: CalculationParameters,
+) -> bytes:
+    # minutes of the prayers of the grid points of a day, row by row, the solar
+    # coordinates of the day are shared by all the points and the latitudes where
+    # prayer times cannot be calculated are known without computing them
+    midnight = day.replace(tzinfo=timezone.utc)
+    solar_coordinates = solar_coordinates_for(day)
+    classifier = RegimeClassifier(calculation_parameters, DeclinationTable(day, 1))
+    values = array("h")
+    for latitude in latitudes:
+        if not classifier.regime(latitude, day).calculable:
+            values.extend([MISSING] * len(PRAYERS) * len(longitudes))
+            continue
+        for longitude in longitudes:
+            try:
+                events = SolarEvents(
+                    Observer(latitude, longitude), day, solar_coordinates
+                )
+                times = apply_policy(events, calculation_parameters)
+            except (RuntimeError, ValueError):
+                values.extend([MISSING] * len(PRAYERS))
+                continue
+            for prayer in PRAYERS:
+                time = getattr(times, prayer.name.lower())
+                values.append(int((time - midnight).total_seconds() // 60))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode(header: dict) -> bytes:
+    return json.dumps(header, sort_keys=True).encode()
+
+
+def _aligned(offset: int) -> int:
+    return offset + -offset % _ALIGNMENT
+
+
+def _read_header(buffer) -> dict:
+    if len(buffer) < _PREFIX.size:
+        raise ValueError("File is not a prayer time grid.")
+    magic, length = _PREFIX.unpack_from(buffer)
+    if magic != MAGIC or len(buffer) < _PREFIX.size + length:
+        raise ValueError("File is not a prayer time grid.")
+    header = json.loads(bytes(buffer[_PREFIX.size : _PREFIX.size + length]))
+    if header.get("format") != FORMAT or header.get("version") != VERSION:
+        raise ValueError("File is not a prayer time grid.")
+    return header
@@ -0,0 +1,191 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+from zoneinfo import ZoneInfo
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import PolicyTimes, apply_policy
+from adhanpy.data.Prayer import PRAYERS
+
+
+@dataclass(frozen=True)
+class _Node:
+    # seconds since the UTC midnight of the day of each prayer, not rounded
+    seconds: tuple[float, ...]
+    # whether fajr and isha are their safe bounds
+    bounds: tuple[bool, bool]
+
+
+@dataclass(frozen=True)
+class InterpolatedCalendar:
+    start: datetime
+    # times of PRAYERS of each day rounded to the minute as PrayerTimes does, in
+    # the time zone or UTC, None where prayer times cannot be calculated
+    days: list[Optional[tuple[datetime, ...]]]
+    # days evaluated exactly: the nodes and the days of fallback segments
+    exact: int
+    # segments between nodes evaluated exactly instead of interpolated
+    fallbacks: int
+
+
+def interpolated_calendar(
+    coordinates: tuple[float, float],
+    start: datetime,
+    days: int,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+    step: int = 7,
+    tolerance: float = 5.0,
+) -> InterpolatedCalendar:
+    """
+    Prayer times of consecutive days from start, evaluated exactly every step days
+    and interpolated in between with a cubic through the four nearest exact days,
+    on the seconds since the UTC midnight before rounding. The days between two
+    exact days are evaluated exactly instead when the interpolation is unreliable:
+    - prayer times cannot be calculated on one of the four exact days
+    - fajr or isha switches between the twilight angle and its safe bound (high
+      latitude rule, Moonsighting Committee seasonal bound) on these days
+    - the cubic differs by more than tolerance seconds midway from the cubic
+      through the exact days a step later (or earlier), the estimate of the
+      interpolation error, or there is no such cubic
+    Arguments:
+        step: days between exact evaluations, 1 evaluates every day exactly
+        tolerance: seconds of estimated error accepted
+    """
+    if step < 1:
+        raise ValueError("step must be at least 1.")
+    if tolerance < 0:
+        raise ValueError("tolerance must not be negative.")
+
+    origin = datetime(start.year, start.month, start.day)
+    nodes: dict[int, Optional[_Node]] = {}
+
+    def node(offset: int) -> Optional[_Node]:
+        if offset not in nodes:
+            nodes[offset] = _evaluate(
+                coordinates, origin + timedelta(days=offset), calculation_parameters
+            )
+        return nodes[offset]
+
+    results: list[Optional[tuple[datetime, ...]]] = []
+    exact = 0
+    fallbacks = 0
+    for first in range(0, days, step):
+        last = min(first + step, days)
+        stencil = [node(first + index * step) for index in range(-2, 4)]
+        segment = [stencil[2]]
+        if last - first > 1:
+            if _reliable(stencil, tolerance):
+                values = [node.seconds for node in stencil[1:5] if node is not None]
+                for offset in range(first + 1, last):
+                    x = (offset - first) / step
+                    seconds = tuple(_cubic(points, x) for points in zip(*values))
+                    segment.append(_Node(seconds, (False, False)))
+            else:
+                fallbacks += 1
+                exact += last - first - 1
+                segment += [
+                    _evaluate(
+                        coordinates,
+                        origin + timedelta(days=offset),
+                        calculation_parameters,
+                    )
+                    for offset in range(first + 1, last)
+                ]
+
+        for offset, value in zip(range(first, last), segment):
+            results.append(
+                None
+                if value is None
+                else _times(origin + timedelta(days=offset), value.seconds, time_zone)
+            )
+
+    exact += sum(1 for offset in nodes if 0 <= offset < days)
+    return InterpolatedCalendar(start, results, exact, fallbacks)
+
+
+def raw_times(
+    coordinates: tuple[float, float],
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+) -> PolicyTimes:
+    """UTC times of the prayers not rounded, as interpolated_calendar evaluates them"""
+    return apply_policy(
+        SolarEvents(coordinates, date, solar_coordinates_for(date)),
+        calculation_parameters,
+        rounded=False,
+    )
+
+
+def _evaluate(
+    coordinates: tuple[float, float],
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+) -> Optional[_Node]:
+    try:
+        times = raw_times(coordinates, date, calculation_parameters)
+    except (RuntimeError, ValueError):
+        return None
+    midnight = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+    return _Node(
+        tuple(
+            (getattr(times, prayer.name.lower()) - midnight).total_seconds()
+            for prayer in PRAYERS
+        ),
+        (times.fajr_bound, times.isha_bound),
+    )
+
+
+def _reliable(stencil: Sequence[Optional[_Node]], tolerance: float) -> bool:
+    # stencil: the exact days from two steps before the start of a segment to three
+    # steps after; the cubic centred on the segment is compared with a cubic
+    # shifted by a step, each through four exact days of the same kind
+    shifts = [
+        shift
+        for shift in (1, 2, 0)
+        if all(node is not None for node in stencil[shift : shift + 4])
+        and len({node.bounds for node in stencil[shift : shift + 4] if node}) == 1
+    ]
+    if len(shifts) < 2 or shifts[0] != 1:
+        return False
+
+    for prayer in range(len(PRAYERS)):
+        centred, shifted = (
+            _cubic(
+                [node.seconds[prayer] for node in stencil[shift : shift + 4] if node],
+                1.5 - shift,
+            )
+            for shift in shifts[:2]
+        )
+        if abs(centred - shifted) > tolerance:
+            return False
+    return True
+
+
+def _cubic(values: Sequence[float], x: float) -> float:
+    # the cubic through values at -1, 0, 1 and 2, at x
+    before, at, after, later = values
+    return (
+        -before * x * (x - 1) * (x - 2) / 6
+        + at * (x + 1) * (x - 1) * (x - 2) / 2
+        - after * (x + 1) * x * (x - 2) / 2
+        + later * (x + 1) * x * (x - 1) / 6
+    )
+
+
+def _times(
+    date: datetime, seconds: Sequence[float], time_zone: Optional[ZoneInfo]
+) -> tuple[datetime, ...]:
+    # rounded to the minute as rounded_minute does, which does not round past the
+    # end of an hour
+    midnight = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+    times = []
+    for value in seconds:
+        minutes, second = divmod(math.floor(value), 60)
+        if second > 30 and minutes % 60 != 59:
+            minutes += 1
+        time = midnight + timedelta(minutes=minutes)
+        times.append(time if time_zone is None else time.astimezone(time_zone))
+    return tuple(times)
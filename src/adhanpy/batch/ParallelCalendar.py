@@ -0,0 +1,167 @@
+import copy
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Sequence, Union
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.batch.BatchPrayerTimes import iter_solar_coordinates, prayer_times_batch
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+
+def calendar(
+    coordinates: tuple[float, float],
+    start: datetime,
+    days: int,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+) -> list[PrayerTimes]:
+    """
+    PrayerTimes of consecutive days from start, the solar coordinates of a day
+    are computed once and shared with the PrayerTimes of the neighbouring days
+    """
+    results = []
+    for result in iter_calendar(
+        coordinates, start, days, calculation_parameters, time_zone
+    ):
+        if isinstance(result, Exception):
+            raise result
+        results.append(result)
+    return results
+
+
+def iter_calendar(
+    coordinates: tuple[float, float],
+    start: datetime,
+    days: int,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+) -> Iterator[Union[PrayerTimes, Exception]]:
+    """
+    Same as calendar one day at a time, in constant memory however many days. The
+    result of a day where prayer times cannot be calculated is the exception
+    PrayerTimes raised.
+    """
+    for offset, window in enumerate(iter_solar_coordinates(start, days)):
+        result: Union[PrayerTimes, Exception]
+        try:
+            result = PrayerTimes(
+                coordinates,
+                start + timedelta(days=offset),
+                calculation_parameters=calculation_parameters,
+                time_zone=time_zone,
+                solar_coordinates=window,
+            )
+        except (RuntimeError, ValueError) as error:
+            result = error
+        yield result
+
+
+def parallel_calendar(
+    coordinates: tuple[float, float],
+    start: datetime,
+    days: int,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> list[PrayerTimes]:
+    """
+    Same as calendar with the days split in one range per worker computed by
+    threads, which run in parallel on free-threaded Python builds.
+    Arguments:
+        workers: number of threads, default to the number of CPUs
+        executor: executor to run the ranges on instead of a new ThreadPoolExecutor
+    """
+    workers = _workers(workers, days)
+    # a snapshot so that the workers see the same parameters even if the caller
+    # changes them while they run, the results reference the caller's parameters
+    # as the PrayerTimes of calendar do
+    snapshot = copy.deepcopy(calculation_parameters)
+    ranges = _split(days, workers)
+
+    def run(pool: Executor) -> list[PrayerTimes]:
+        futures = [
+            pool.submit(
+                calendar,
+                coordinates,
+                start + timedelta(days=first),
+                last - first,
+                snapshot,
+                time_zone,
+            )
+            for first, last in ranges
+        ]
+        return _attach(
+            [prayer_times for future in futures for prayer_times in future.result()],
+            calculation_parameters,
+        )
+
+    if executor is not None:
+        return run(executor)
+    with ThreadPoolExecutor(workers, thread_name_prefix="adhanpy") as pool:
+        return run(pool)
+
+
+def parallel_batch(
+    coordinates: Sequence[tuple[float, float]],
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> list[Union[PrayerTimes, Exception]]:
+    """
+    Same as prayer_times_batch with the locations split in one range per worker
+    computed by threads, see parallel_calendar for the arguments
+    """
+    workers = _workers(workers, len(coordinates))
+    snapshot = copy.deepcopy(calculation_parameters)
+    ranges = _split(len(coordinates), workers)
+
+    def run(pool: Executor) -> list[Union[PrayerTimes, Exception]]:
+        futures = [
+            pool.submit(
+                prayer_times_batch,
+                coordinates[first:last],
+                date,
+                snapshot,
+                time_zone,
+            )
+            for first, last in ranges
+        ]
+        return _attach(
+            [result for future in futures for result in future.result()],
+            calculation_parameters,
+        )
+
+    if executor is not None:
+        return run(executor)
+    with ThreadPoolExecutor(workers, thread_name_prefix="adhanpy") as pool:
+        return run(pool)
+
+
+def _attach(results: list, calculation_parameters: CalculationParameters) -> list:
+    for result in results:
+        if isinstance(result, PrayerTimes):
+            result.calculation_parameters = calculation_parameters
+    return results
+
+
+def _workers(workers: Optional[int], items: int) -> int:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    return max(1, min(workers, items))
+
+
+def _split(items: int, parts: int) -> list[tuple[int, int]]:
+    size, remainder = divmod(items, parts)
+    ranges = []
+    first = 0
+    for part in range(parts):
+        last = first + size + (part < remainder)
+        ranges.append((first, last))
+        first = last
+    return ranges
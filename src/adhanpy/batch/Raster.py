@@ -0,0 +1,541 @@
+import math
+import struct
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+from adhanpy.astronomy.Astronomical import (
+    SUNRISE_ALTITUDE,
+    approximate_hour_angle,
+    approximate_transit,
+    correct_hour_angle,
+    corrected_transit,
+)
+from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.Regime import DeclinationTable, RegimeClassifier
+from adhanpy.calculation.Twilight import (
+    season_adjusted_evening_twilight,
+    season_adjusted_morning_twilight,
+)
+from adhanpy.data.NightPortions import NightPortions
+from adhanpy.data.Observer import Observer
+from adhanpy.data.Prayer import MINUTES_PER_DAY, Prayer
+from adhanpy.data.ShadowLength import ShadowLength
+from adhanpy.util.TimeComponents import TimeComponents
+
+# a grid point (row, column)
+_Point = tuple[int, int]
+# the crossing of a level on the edge between two neighbouring grid points
+_Edge = tuple[_Point, _Point]
+
+# edges of a cell crossed by a level for each case of corners above it (bit 3 top
+# left, 2 top right, 1 bottom right, 0 bottom left), as pairs of edges 0 top,
+# 1 right, 2 bottom, 3 left; the saddles 5 and 10 are resolved with the centre
+_SEGMENTS: dict[int, tuple[tuple[int, int], ...]] = {
+    0: (),
+    1: ((3, 2),),
+    2: ((2, 1),),
+    3: ((3, 1),),
+    4: ((0, 1),),
+    6: ((0, 2),),
+    7: ((3, 0),),
+    8: ((3, 0),),
+    9: ((0, 2),),
+    11: ((0, 1),),
+    12: ((3, 1),),
+    13: ((2, 1),),
+    14: ((3, 2),),
+    15: (),
+}
+
+
+@dataclass(frozen=True)
+class Raster:
+    prayer: Prayer
+    date: datetime
+    south: float
+    west: float
+    north: float
+    east: float
+    rows: int
+    columns: int
+    # minutes of the prayer since the midnight of the date in utc_offset, row by
+    # row from north to south and west to east, nan where it cannot be calculated
+    values: array
+    # minutes east of UTC of the values
+    utc_offset: int = 0
+
+    def latitude(self, row: float) -> float:
+        return self.north - row * (self.north - self.south) / max(1, self.rows - 1)
+
+    def longitude(self, column: float) -> float:
+        return self.west + column * (self.east - self.west) / max(1, self.columns - 1)
+
+    def value(self, row: int, column: int) -> float:
+        return self.values[row * self.columns + column]
+
+    def range(self) -> tuple[float, float]:
+        """Lowest and highest value, nan when there is no value"""
+        values = [value for value in self.values if not math.isnan(value)]
+        if not values:
+            return math.nan, math.nan
+        return min(values), max(values)
+
+    def to_png(
+        self, low: Optional[float] = None, high: Optional[float] = None
+    ) -> bytes:
+        """
+        8 bit grayscale PNG of the values, from black at low to white at high
+        (defaults to the range), transparent where there is no value
+        """
+        lowest, highest = self.range()
+        low = lowest if low is None else low
+        high = highest if high is None else high
+        scale = 255 / (high - low) if high > low else 0.0
+
+        scanlines = bytearray()
+        for row in range(self.rows):
+            # filter type none, then gray and alpha of each pixel
+            scanlines.append(0)
+            for value in self.values[row * self.columns : (row + 1) * self.columns]:
+                if math.isnan(value):
+                    scanlines += b"\x00\x00"
+                else:
+                    gray = round((value - low) * scale)
+                    scanlines += bytes((min(255, max(0, gray)), 255))
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return (
+                struct.pack(">I", len(data))
+                + kind
+                + data
+                + struct.pack(">I", zlib.crc32(kind + data))
+            )
+
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + chunk(
+                b"IHDR", struct.pack(">IIBBBBB", self.columns, self.rows, 8, 4, 0, 0, 0)
+            )
+            + chunk(b"IDAT", zlib.compress(bytes(scanlines)))
+            + chunk(b"IEND", b"")
+        )
+
+
+def raster(
+    prayer: Prayer,
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+    bounds: tuple[float, float, float, float],
+    rows: int,
+    columns: int,
+    time_zone: Optional[ZoneInfo] = None,
+) -> Raster:
+    """
+    Time of a prayer over a grid of locations, not rounded to the minute so that
+    contours are smooth, the same times as apply_policy with rounded=False. The
+    solar coordinates of the date are computed once for the whole grid, the
+    approximate transits once per column and the hour angles before correction
+    once per row, so that each location only corrects the altitudes its prayer
+    needs: one for sunrise, dhuhr, asr and maghrib, up to four for fajr and isha
+    with their safe bounds. Rows are skipped or use the safe bound directly from
+    their Regime.
+    Arguments:
+        bounds: (south, west, north, east) in degrees, the grid goes from corner
+            to corner
+        rows, columns: grid points from north to south and from west to east
+        time_zone: values are minutes since the local midnight in the UTC offset of
+            time_zone at noon of the date, since the UTC midnight when None
+    """
+    if prayer == Prayer.NONE:
+        raise ValueError("prayer must be a prayer.")
+    if rows < 2 or columns < 2:
+        raise ValueError("The grid must have at least 2 rows and 2 columns.")
+
+    south, west, north, east = bounds
+    midnight = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+    utc_offset = 0
+    if time_zone is not None:
+        offset = (midnight + timedelta(hours=12)).astimezone(time_zone).utcoffset()
+        utc_offset = 0 if offset is None else int(offset.total_seconds() // 60)
+
+    prev_solar, solar, next_solar, after_next_solar = solar_coordinates_for(date)
+    today = _Sun(prev_solar, solar, next_solar)
+    tomorrow = _Sun(solar, next_solar, after_next_solar)
+    classifier = RegimeClassifier(calculation_parameters, DeclinationTable(date, 1))
+    night_portions = calculation_parameters.night_portions()
+    moon_sighting = (
+        calculation_parameters.method == CalculationMethod.MOON_SIGHTING_COMMITTEE
+    )
+    isha_interval = calculation_parameters.isha_interval
+    # fajr and isha need the night for their safe bounds, isha after an interval
+    # only needs the sunset
+    night = prayer == Prayer.FAJR or (
+        prayer == Prayer.ISHA and not (isha_interval and isha_interval >= 1)
+    )
+    name = prayer.name.lower()
+    # from seconds since the UTC midnight to minutes since the local midnight
+    shift = 60 * (
+        getattr(calculation_parameters.adjustments, name)
+        + getattr(calculation_parameters.method_adjustments, name)
+        + utc_offset
+    )
+    if prayer == Prayer.ISHA and not night:
+        shift += isha_interval * 60
+
+    values = array("d")
+    grid = Raster(
+        prayer, date, south, west, north, east, rows, columns, values, utc_offset
+    )
+    # what only depends on the longitude
+    longitudes = [grid.longitude(column) for column in range(columns)]
+    transits = [today.approximate_transit(longitude) for longitude in longitudes]
+    tomorrow_transits = [
+        tomorrow.approximate_transit(longitude) for longitude in longitudes
+    ]
+    dhuhrs = [
+        _seconds(today.transit(transit, longitude))
+        for transit, longitude in zip(transits, longitudes)
+    ]
+
+    for row in range(rows):
+        latitude = grid.latitude(row)
+        regime = classifier.regime(latitude, date)
+        # only the trigonometry of the latitude is used
+        observer = Observer(latitude, 0.0)
+        # apply_policy raises when asr cannot be calculated, whatever the prayer
+        asr = today.afternoon(
+            observer, calculation_parameters.madhab.get_shadow_length()
+        )
+        if not regime.calculable or math.isnan(today.hour_angle(observer, asr)):
+            values.extend([math.nan] * columns)
+            continue
+
+        if prayer == Prayer.DHUHR:
+            times = dhuhrs
+        elif prayer == Prayer.ASR:
+            times = today.times(observer, asr, True, transits, longitudes)
+        elif not night:
+            times = today.times(
+                observer,
+                SUNRISE_ALTITUDE,
+                prayer != Prayer.SUNRISE,
+                transits,
+                longitudes,
+            )
+        else:
+            times = _night_times(
+                prayer,
+                calculation_parameters,
+                night_portions,
+                midnight,
+                today,
+                tomorrow,
+                observer,
+                # the sun does not reach the angle, the safe bound is used
+                regime.fajr_bound if prayer == Prayer.FAJR else regime.isha_bound,
+                moon_sighting,
+                transits,
+                tomorrow_transits,
+                longitudes,
+            )
+        values.extend(
+            math.nan if time is None else (time + shift) / 60 for time in times
+        )
+    return grid
+
+
+def levels(grid: Raster, interval: float) -> list[float]:
+    """Multiples of interval minutes within the range of the raster"""
+    if interval <= 0:
+        raise ValueError("interval must be positive.")
+    low, high = grid.range()
+    if math.isnan(low):
+        return []
+    first = math.ceil(low / interval)
+    last = math.floor(high / interval)
+    return [index * interval for index in range(first, last + 1)]
+
+
+def contour(grid: Raster, level: float) -> list[list[tuple[float, float]]]:
+    """
+    Lines where the raster equals level as lists of (longitude, latitude), found
+    with marching squares. Lines are closed (their first and last points are the
+    same) when they do not reach the edge of the grid or a cell without values.
+    """
+    neighbours: dict[_Edge, list[_Edge]] = {}
+    values = grid.values
+    columns = grid.columns
+    for row in range(grid.rows - 1):
+        for column in range(columns - 1):
+            top_left = values[row * columns + column]
+            top_right = values[row * columns + column + 1]
+            bottom_right = values[(row + 1) * columns + column + 1]
+            bottom_left = values[(row + 1) * columns + column]
+            corners = (top_left, top_right, bottom_right, bottom_left)
+            if any(math.isnan(value) for value in corners):
+                continue
+
+            case = (
+                (top_left > level) << 3
+                | (top_right > level) << 2
+                | (bottom_right > level) << 1
+                | (bottom_left > level)
+            )
+            if case in (5, 10):
+                centre_above = sum(corners) / 4 > level
+                # the centre joins the corners on its side of the level
+                if (case == 5) == centre_above:
+                    segments: tuple[tuple[int, int], ...] = ((3, 0), (2, 1))
+                else:
+                    segments = ((0, 1), (3, 2))
+            else:
+                segments = _SEGMENTS[case]
+
+            edges = (
+                ((row, column), (row, column + 1)),
+                ((row, column + 1), (row + 1, column + 1)),
+                ((row + 1, column), (row + 1, column + 1)),
+                ((row, column), (row + 1, column)),
+            )
+            for first, second in segments:
+                neighbours.setdefault(edges[first], []).append(edges[second])
+                neighbours.setdefault(edges[second], []).append(edges[first])
+
+    lines = []
+    # open lines start at an edge crossed in one cell only, then closed lines
+    starts = [edge for edge, ends in neighbours.items() if len(ends) == 1]
+    starts += list(neighbours)
+    for start in starts:
+        if not neighbours.get(start):
+            continue
+        path = [start]
+        current = start
+        while neighbours.get(current):
+            following = neighbours[current].pop()
+            neighbours[following].remove(current)
+            path.append(following)
+            current = following
+        lines.append([_crossing(grid, edge, level) for edge in path])
+    return lines
+
+
+def isochrones(
+    grid: Raster,
+    interval: float = 10.0,
+    contour_levels: Optional[Iterable[float]] = None,
+) -> dict:
+    """
+    GeoJSON FeatureCollection with a MultiLineString feature per level, every
+    interval minutes unless contour_levels are given
+    """
+    features = []
+    for level in levels(grid, interval) if contour_levels is None else contour_levels:
+        lines = contour(grid, level)
+        if not lines:
+            continue
+        minutes = round(level) % MINUTES_PER_DAY
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "MultiLineString",
+                    "coordinates": [
+                        [
+                            [round(longitude, 6), round(latitude, 6)]
+                            for longitude, latitude in line
+                        ]
+                        for line in lines
+                    ],
+                },
+                "properties": {
+                    "prayer": grid.prayer.name.lower(),
+                    "date": grid.date.strftime("%Y-%m-%d"),
+                    "minutes": level,
+                    "time": f"{minutes // 60:02d}:{minutes % 60:02d}",
+                    "utc_offset": grid.utc_offset,
+                },
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _crossing(grid: Raster, edge: _Edge, level: float) -> tuple[float, float]:
+    (row, column), (other_row, other_column) = edge
+    value = grid.value(row, column)
+    other = grid.value(other_row, other_column)
+    fraction = (level - value) / (other - value) if other != value else 0.5
+    return (
+        grid.longitude(column + fraction * (other_column - column)),
+        grid.latitude(row + fraction * (other_row - row)),
+    )
+
+
+class _Sun:
+    def __init__(
+        self,
+        prev_solar: SolarCoordinates,
+        solar: SolarCoordinates,
+        next_solar: SolarCoordinates,
+    ) -> None:
+        """The SolarCoordinates of a day and of its neighbours, as SolarTime uses them"""
+        self.prev_solar = prev_solar
+        self.solar = solar
+        self.next_solar = next_solar
+
+    def approximate_transit(self, longitude: float) -> float:
+        return approximate_transit(
+            longitude, self.solar.apparent_sidereal_time, self.solar.right_ascension
+        )
+
+    def transit(self, approximate: float, longitude: float) -> float:
+        return corrected_transit(
+            approximate,
+            longitude,
+            self.solar.apparent_sidereal_time,
+            self.solar.right_ascension,
+            self.prev_solar.right_ascension,
+            self.next_solar.right_ascension,
+        )
+
+    def hour_angle(self, observer: Observer, altitude: float) -> float:
+        return approximate_hour_angle(
+            altitude,
+            observer.sin_latitude * self.solar.sin_declination,
+            observer.cos_latitude * self.solar.cos_declination,
+        )
+
+    def times(
+        self,
+        observer: Observer,
+        altitude: float,
+        after_transit: bool,
+        transits: list[float],
+        longitudes: list[float],
+    ) -> list[Optional[int]]:
+        """
+        Seconds since the UTC midnight of the times of altitude at longitudes, as
+        SolarEvents.hour_angle, from their approximate transits. The hour angle
+        before correction only depends on the latitude.
+        """
+        hour_angle = self.hour_angle(observer, altitude)
+        if math.isnan(hour_angle):
+            return [None] * len(longitudes)
+
+        solar = self.solar
+        return [
+            _seconds(
+                correct_hour_angle(
+                    transit,
+                    hour_angle,
+                    altitude,
+                    -longitude,
+                    observer.sin_latitude,
+                    observer.cos_latitude,
+                    after_transit,
+                    solar.apparent_sidereal_time,
+                    solar.right_ascension,
+                    self.prev_solar.right_ascension,
+                    self.next_solar.right_ascension,
+                    solar.declination,
+                    self.prev_solar.declination,
+                    self.next_solar.declination,
+                )
+            )
+            for transit, longitude in zip(transits, longitudes)
+        ]
+
+    def afternoon(self, observer: Observer, shadow_length: ShadowLength) -> float:
+        # altitude of SolarTime.afternoon
+        tangent = abs(observer.latitude - self.solar.declination)
+        inverse = shadow_length.shadow_length + math.tan(math.radians(tangent))
+        return math.degrees(math.atan(1.0 / inverse))
+
+
+def _seconds(hours: float) -> Optional[int]:
+    # seconds since the UTC midnight of the time SolarEvents gives for hours
+    time_components = TimeComponents.from_float(hours)
+    if time_components is None:
+        return None
+    return (
+        time_components.hours * 3600
+        + time_components.minutes * 60
+        + time_components.seconds
+    )
+
+
+def _night_times(
+    prayer: Prayer,
+    calculation_parameters: CalculationParameters,
+    night_portions: NightPortions,
+    midnight: datetime,
+    today: _Sun,
+    tomorrow: _Sun,
+    observer: Observer,
+    bound: bool,
+    moon_sighting: bool,
+    transits: list[float],
+    tomorrow_transits: list[float],
+    longitudes: list[float],
+) -> list[Optional[int]]:
+    # fajr or isha with an angle of apply_policy in seconds since the UTC midnight
+    fajr = prayer == Prayer.FAJR
+    sunset = today.times(observer, SUNRISE_ALTITUDE, True, transits, longitudes)
+    next_sunrise = tomorrow.times(
+        observer, SUNRISE_ALTITUDE, False, tomorrow_transits, longitudes
+    )
+    base = (
+        today.times(observer, SUNRISE_ALTITUDE, False, transits, longitudes)
+        if fajr
+        else sunset
+    )
+    # the Moonsighting Committee does not use the angles from 55° of latitude
+    after_55 = moon_sighting and observer.latitude >= 55
+    if bound or after_55:
+        twilights: list[Optional[int]] = [None] * len(longitudes)
+    else:
+        angle = (
+            calculation_parameters.fajr_angle
+            if fajr
+            else calculation_parameters.isha_angle
+        )
+        twilights = today.times(observer, -angle, not fajr, transits, longitudes)
+
+    seasonal = None
+    if moon_sighting:
+        season_adjusted = (
+            season_adjusted_morning_twilight
+            if fajr
+            else season_adjusted_evening_twilight
+        )
+        bound_time = season_adjusted(
+            observer.latitude, midnight.timetuple().tm_yday, midnight.year, midnight
+        )
+        seasonal = int((bound_time - midnight).total_seconds())
+    portion = night_portions.fajr if fajr else night_portions.isha
+    # a time before the base for fajr, after the base for isha
+    sign = -1 if fajr else 1
+
+    times: list[Optional[int]] = []
+    for start, twilight, end, evening in zip(base, twilights, next_sunrise, sunset):
+        if start is None or end is None or evening is None:
+            times.append(None)
+            continue
+        # as SolarEvents.night_length in milliseconds
+        night_length = float((86400 + end - evening) * 1000)
+        if after_55:
+            twilight = start + sign * int(night_length / 7000)
+        if seasonal is None:
+            safe = start + sign * int(portion * night_length / 1000)
+        else:
+            safe = start + seasonal
+        if twilight is None or sign * (twilight - safe) > 0:
+            times.append(safe)
+        else:
+            times.append(twilight)
+    return times
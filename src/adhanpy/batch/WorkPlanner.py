@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Hashable, Iterable, Iterator, Optional, Union
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+# cells per side of the grid the Hilbert curve goes through
+_HILBERT_ORDER = 16
+
+
+@dataclass(frozen=True)
+class Subscriber:
+    id: Hashable
+    coordinates: tuple[float, float]
+    calculation_parameters: CalculationParameters
+    time_zone: Optional[ZoneInfo] = None
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    """A distinct computation of the plan for each date, and who gets its result"""
+
+    coordinates: tuple[float, float]
+    calculation_parameters: CalculationParameters
+    time_zone: Optional[ZoneInfo]
+    subscribers: tuple[Hashable, ...]
+
+
+@dataclass(frozen=True)
+class WorkPlan:
+    dates: list[datetime]
+    # ordered by parameters, time zone then along a Hilbert curve
+    items: list[WorkItem]
+    # subscribers planned
+    rows: int
+
+    @property
+    def keys(self) -> int:
+        """PrayerTimes computed by run"""
+        return len(self.dates) * len(self.items)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """PrayerTimes one per subscriber and date would compute for each one run does"""
+        return self.rows / len(self.items) if self.items else 1.0
+
+    def run(self) -> Iterator[tuple[datetime, WorkItem, Union[PrayerTimes, Exception]]]:
+        """
+        PrayerTimes of each item for each date, date by date so that the solar
+        coordinates of a date are computed once. The result of an item where prayer
+        times cannot be calculated is the exception PrayerTimes raised.
+        """
+        for date in self.dates:
+            solar_coordinates = solar_coordinates_for(date)
+            for item in self.items:
+                result: Union[PrayerTimes, Exception]
+                try:
+                    result = PrayerTimes(
+                        item.coordinates,
+                        date,
+                        calculation_parameters=item.calculation_parameters,
+                        time_zone=item.time_zone,
+                        solar_coordinates=solar_coordinates,
+                    )
+                except (RuntimeError, ValueError) as error:
+                    result = error
+                yield date, item, result
+
+    def fan_out(
+        self,
+    ) -> Iterator[tuple[Hashable, datetime, Union[PrayerTimes, Exception]]]:
+        """Results of run for each subscriber, subscribers of an item share its result"""
+        for date, item, result in self.run():
+            for subscriber in item.subscribers:
+                yield subscriber, date, result
+
+    def format(self) -> str:
+        return (
+            f"{self.rows} subscribers x {len(self.dates)} dates -> {self.keys} "
+            f"PrayerTimes, dedup ratio {self.dedup_ratio:.1f}x"
+        )
+
+
+def plan(
+    subscribers: Iterable[Subscriber],
+    dates: Iterable[datetime],
+    precision: Optional[int] = 2,
+) -> WorkPlan:
+    """
+    Collapse subscribers to the distinct (coordinates, parameters, time zone) to
+    compute for each date and order them for locality: dates in order, then
+    parameters, then time zone, then nearby locations after each other.
+    Arguments:
+        subscribers: Subscriber
+        dates: the year, month and day are used
+        precision: decimals the coordinates are rounded to, 2 moves a location by
+            less than 1.2 km and the prayer times by a few seconds, None does not
+            round
+    """
+    parameters: dict[tuple, CalculationParameters] = {}
+    groups: dict[tuple, list[Hashable]] = {}
+    # rows usually share a few parameter objects, their keys are built once and
+    # the objects kept so that their ids are not reused
+    parameters_keys: dict[int, tuple[CalculationParameters, tuple]] = {}
+    rows = 0
+    for subscriber in subscribers:
+        rows += 1
+        calculation_parameters = subscriber.calculation_parameters
+        known = parameters_keys.get(id(calculation_parameters))
+        if known is None:
+            parameters_key = calculation_parameters.cache_key()
+            parameters_keys[id(calculation_parameters)] = (
+                calculation_parameters,
+                parameters_key,
+            )
+            parameters.setdefault(parameters_key, calculation_parameters)
+        else:
+            parameters_key = known[1]
+        latitude, longitude = subscriber.coordinates
+        if precision is not None:
+            latitude = round(latitude, precision)
+            longitude = round(longitude, precision)
+        groups.setdefault(
+            (parameters_key, subscriber.time_zone, latitude, longitude), []
+        ).append(subscriber.id)
+
+    # parameter sets in the order they were first seen, parameter keys may hold None
+    parameters_order = {key: index for index, key in enumerate(parameters)}
+
+    def locality(group: tuple) -> tuple:
+        parameters_key, time_zone, latitude, longitude = group
+        return (
+            parameters_order[parameters_key],
+            "" if time_zone is None else str(time_zone),
+            hilbert_index(latitude, longitude),
+        )
+
+    items = [
+        WorkItem(
+            (group[2], group[3]),
+            parameters[group[0]],
+            group[1],
+            tuple(groups[group]),
+        )
+        for group in sorted(groups, key=locality)
+    ]
+    # only the day is used, times and time zones of the same day are one date
+    days = {datetime(date.year, date.month, date.day) for date in dates}
+    return WorkPlan(sorted(days), items, rows)
+
+
+def hilbert_index(
+    latitude: float, longitude: float, order: int = _HILBERT_ORDER
+) -> int:
+    """
+    Position of a location along a Hilbert curve filling a 2^order by 2^order grid
+    of latitudes and longitudes, nearby locations are mostly close along the curve
+    """
+    side = 1 << order
+    x = min(side - 1, max(0, int((longitude + 180.0) / 360.0 * side)))
+    y = min(side - 1, max(0, int((latitude + 90.0) / 180.0 * side)))
+
+    index = 0
+    half = side >> 1
+    while half > 0:
+        rx = 1 if x & half else 0
+        ry = 1 if y & half else 0
+        index += half * half * ((3 * rx) ^ ry)
+        # rotate the quadrant so that the curve is continuous
+        if ry == 0:
+            if rx == 1:
+                x = side - 1 - x
+                y = side - 1 - y
+            x, y = y, x
+        half >>= 1
+    return index
@@ -0,0 +1,252 @@
+import argparse
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional, Sequence
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import apply_policy
+from adhanpy.data.Prayer import PRAYERS
+from adhanpy.util.CalendarUtil import rounded_minute
+
+# UTC times of PRAYERS for (latitude, longitude), date and parameters, not rounded to
+# the minute where the engine can, raises RuntimeError or ValueError where prayer
+# times cannot be calculated
+Engine = Callable[
+    [tuple[float, float], datetime, CalculationParameters], Sequence[datetime]
+]
+
+
+def scalar_engine(
+    coordinates: tuple[float, float],
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+) -> Sequence[datetime]:
+    """The reference: the stages of PrayerTimes without rounding to the minute"""
+    times = apply_policy(
+        SolarEvents(coordinates, date), calculation_parameters, rounded=False
+    )
+    return [getattr(times, prayer.name.lower()) for prayer in PRAYERS]
+
+
+def shared_solar_coordinates_engine(
+    coordinates: tuple[float, float],
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+) -> Sequence[datetime]:
+    """PrayerTimes with the solar coordinates shared by the batch APIs"""
+    events = SolarEvents(
+        coordinates,
+        date,
+        _solar_coordinates(date.year, date.month, date.day),
+    )
+    times = apply_policy(events, calculation_parameters, rounded=False)
+    return [getattr(times, prayer.name.lower()) for prayer in PRAYERS]
+
+
+ENGINES: dict[str, Engine] = {
+    "scalar": scalar_engine,
+    "shared-solar-coordinates": shared_solar_coordinates_engine,
+}
+
+
+@lru_cache(maxsize=8)
+def _solar_coordinates(year: int, month: int, day: int) -> list:
+    # samples are ordered by date so the locations of a date share its coordinates
+    return solar_coordinates_for(datetime(year, month, day))
+
+
+def sample_locations(
+    latitude_step: float = 10.0,
+    longitude_step: float = 30.0,
+    max_latitude: float = 70.0,
+) -> list[tuple[float, float]]:
+    """Global grid of locations up to max_latitude north and south"""
+    locations = []
+    latitude = -max_latitude
+    while latitude <= max_latitude:
+        longitude = -180.0
+        while longitude < 180.0:
+            locations.append((latitude, longitude))
+            longitude += longitude_step
+        latitude += latitude_step
+    return locations
+
+
+def sample_dates(
+    start_year: int = 2000, years: int = 20, per_year: int = 6
+) -> list[datetime]:
+    """per_year dates evenly spread over each year, shifted a little every year"""
+    dates = []
+    for year in range(start_year, start_year + years):
+        for index in range(per_year):
+            day = (index * 365 // per_year + year - start_year) % 365
+            dates.append(datetime(year, 1, 1) + timedelta(days=day))
+    return dates
+
+
+@dataclass(frozen=True)
+class PrayerError:
+    prayer: str
+    # samples where both engines calculated the prayer
+    samples: int
+    # absolute differences in seconds of the unrounded times
+    max: float
+    p50: float
+    p95: float
+    p99: float
+    # fraction of the samples where the times rounded to the minute differ
+    mismatched_minutes: float
+    # samples where only one of the engines calculated the prayer
+    mismatched_failures: int
+
+
+@dataclass(frozen=True)
+class AccuracyReport:
+    engine: str
+    samples: int
+    # seconds to compute all the samples with the reference and with the engine
+    reference_seconds: float
+    engine_seconds: float
+    prayers: list[PrayerError]
+
+    @property
+    def speedup(self) -> float:
+        return self.reference_seconds / self.engine_seconds
+
+    def format(self) -> str:
+        lines = [
+            f"{self.engine}: {self.samples} samples, "
+            f"speedup {self.speedup:.2f}x "
+            f"({self.reference_seconds:.2f}s -> {self.engine_seconds:.2f}s)",
+            "prayer     max (s)   p50 (s)   p95 (s)   p99 (s)  minutes  failures",
+        ]
+        for error in self.prayers:
+            lines.append(
+                f"{error.prayer:8s} {error.max:9.3f} {error.p50:9.3f} "
+                f"{error.p95:9.3f} {error.p99:9.3f} {error.mismatched_minutes:8.3%} "
+                f"{error.mismatched_failures:9d}"
+            )
+        return "\n".join(lines)
+
+
+def compare(
+    engine: Engine,
+    reference: Engine = scalar_engine,
+    locations: Optional[Iterable[tuple[float, float]]] = None,
+    dates: Optional[Iterable[datetime]] = None,
+    methods: Optional[Iterable[CalculationMethod]] = None,
+    name: Optional[str] = None,
+) -> AccuracyReport:
+    """
+    Compare the prayer times of an engine with the reference for every location,
+    date and method, by default sample_locations(), sample_dates() and all the
+    CalculationMethod values
+    """
+    locations = sample_locations() if locations is None else list(locations)
+    dates = sample_dates() if dates is None else list(dates)
+    parameters = [
+        CalculationParameters(method=method)
+        for method in (CalculationMethod if methods is None else methods)
+    ]
+    samples = [
+        (location, date, calculation_parameters)
+        for calculation_parameters in parameters
+        for date in dates
+        for location in locations
+    ]
+    if not samples:
+        raise ValueError("No samples to compare.")
+
+    reference_seconds, expected = _run(reference, samples)
+    engine_seconds, actual = _run(engine, samples)
+
+    prayers = []
+    for position, prayer in enumerate(PRAYERS):
+        differences = []
+        mismatched_minutes = 0
+        mismatched_failures = 0
+        for times, other in zip(expected, actual):
+            if times is None or other is None:
+                mismatched_failures += (times is None) != (other is None)
+                continue
+            differences.append(abs((other[position] - times[position]).total_seconds()))
+            mismatched_minutes += rounded_minute(other[position]) != rounded_minute(
+                times[position]
+            )
+
+        differences.sort()
+
+        def percentile(value: float) -> float:
+            return (
+                differences[int(value * (len(differences) - 1))] if differences else 0.0
+            )
+
+        prayers.append(
+            PrayerError(
+                prayer.name.lower(),
+                len(differences),
+                differences[-1] if differences else 0.0,
+                percentile(0.50),
+                percentile(0.95),
+                percentile(0.99),
+                mismatched_minutes / len(differences) if differences else 0.0,
+                mismatched_failures,
+            )
+        )
+
+    return AccuracyReport(
+        name or str(getattr(engine, "__name__", engine)),
+        len(samples),
+        reference_seconds,
+        engine_seconds,
+        prayers,
+    )
+
+
+def _run(
+    engine: Engine,
+    samples: list[tuple[tuple[float, float], datetime, CalculationParameters]],
+) -> tuple[float, list[Optional[Sequence[datetime]]]]:
+    results: list[Optional[Sequence[datetime]]] = []
+    start = time.perf_counter()
+    for coordinates, date, calculation_parameters in samples:
+        try:
+            results.append(engine(coordinates, date, calculation_parameters))
+        except (RuntimeError, ValueError):
+            results.append(None)
+    return time.perf_counter() - start, results
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m adhanpy.bench.Accuracy",
+        description="Error and speedup of prayer time engines against PrayerTimes",
+    )
+    parser.add_argument(
+        "--engine", choices=sorted(ENGINES), default="shared-solar-coordinates"
+    )
+    parser.add_argument("--latitude-step", type=float, default=10.0)
+    parser.add_argument("--longitude-step", type=float, default=30.0)
+    parser.add_argument("--max-latitude", type=float, default=70.0)
+    parser.add_argument("--start-year", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--per-year", type=int, default=6)
+    args = parser.parse_args(argv)
+
+    report = compare(
+        ENGINES[args.engine],
+        locations=sample_locations(
+            args.latitude_step, args.longitude_step, args.max_latitude
+        ),
+        dates=sample_dates(args.start_year, args.years, args.per_year),
+        name=args.engine,
+    )
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import argparse
+import asyncio
+import bisect
+import calendar
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterator, Optional
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.server.HttpServer import next_prayer, request_latencies
+
+_MWL = CalculationMethod.MUSLIM_WORLD_LEAGUE
+_MSC = CalculationMethod.MOON_SIGHTING_COMMITTEE
+_ISNA = CalculationMethod.NORTH_AMERICA
+_SG = CalculationMethod.SINGAPORE
+
+# (name, latitude, longitude, population in millions, time zone, usual method)
+CITIES = [
+    ("Jakarta", -6.21, 106.85, 33.4, "Asia/Jakarta", _SG),
+    ("Karachi", 24.86, 67.01, 16.8, "Asia/Karachi", CalculationMethod.KARACHI),
+    ("Lahore", 31.55, 74.34, 13.5, "Asia/Karachi", CalculationMethod.KARACHI),
+    ("Dhaka", 23.81, 90.41, 23.2, "Asia/Dhaka", CalculationMethod.KARACHI),
+    ("Cairo", 30.04, 31.24, 22.2, "Africa/Cairo", CalculationMethod.EGYPTIAN),
+    ("Istanbul", 41.01, 28.98, 15.8, "Europe/Istanbul", _MWL),
+    ("Tehran", 35.69, 51.39, 9.5, "Asia/Tehran", _MWL),
+    ("Lagos", 6.52, 3.38, 15.9, "Africa/Lagos", _MWL),
+    ("Kano", 12.00, 8.52, 4.3, "Africa/Lagos", _MWL),
+    ("Riyadh", 24.71, 46.68, 7.7, "Asia/Riyadh", CalculationMethod.UMM_AL_QURA),
+    ("Makkah", 21.42, 39.83, 2.4, "Asia/Riyadh", CalculationMethod.UMM_AL_QURA),
+    ("Dubai", 25.20, 55.27, 3.6, "Asia/Dubai", CalculationMethod.DUBAI),
+    ("Doha", 25.29, 51.53, 2.4, "Asia/Qatar", CalculationMethod.QATAR),
+    ("Kuwait City", 29.38, 47.99, 3.2, "Asia/Kuwait", CalculationMethod.KUWAIT),
+    ("Kuala Lumpur", 3.14, 101.69, 8.6, "Asia/Kuala_Lumpur", _SG),
+    ("Casablanca", 33.57, -7.59, 3.8, "Africa/Casablanca", _MWL),
+    ("Algiers", 36.75, 3.06, 2.9, "Africa/Algiers", _MWL),
+    ("Paris", 48.86, 2.35, 11.1, "Europe/Paris", CalculationMethod.UOIF),
+    ("London", 51.51, -0.13, 9.6, "Europe/London", _MSC),
+    ("Berlin", 52.52, 13.40, 3.7, "Europe/Berlin", _MWL),
+    ("New York", 40.71, -74.01, 18.9, "America/New_York", _ISNA),
+    ("Toronto", 43.65, -79.38, 6.3, "America/Toronto", _ISNA),
+    ("Chicago", 41.88, -87.63, 8.9, "America/Chicago", _ISNA),
+    ("Sydney", -33.87, 151.21, 5.3, "Australia/Sydney", _MWL),
+    # high latitudes, where the safe bounds and seasonal rules kick in
+    ("Stockholm", 59.33, 18.07, 1.7, "Europe/Stockholm", _MWL),
+    ("Oslo", 59.91, 10.75, 1.1, "Europe/Oslo", _MSC),
+    ("Helsinki", 60.17, 24.94, 1.3, "Europe/Helsinki", _MWL),
+    ("Reykjavik", 64.15, -21.94, 0.2, "Atlantic/Reykjavik", _MWL),
+    ("Anchorage", 61.22, -149.90, 0.3, "America/Anchorage", _ISNA),
+    ("Tromso", 69.65, 18.96, 0.1, "Europe/Oslo", _MSC),
+]
+
+KINDS = ("day", "month", "year", "next")
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    kind: str
+    coordinates: tuple[float, float]
+    date: datetime
+    method: CalculationMethod
+    time_zone: ZoneInfo
+
+
+@dataclass
+class RequestMix:
+    # relative weights of the request kinds
+    day: float = 0.70
+    month: float = 0.08
+    year: float = 0.02
+    next: float = 0.20
+    # probability of repeating a previous request (cache hits)
+    repeat_rate: float = 0.5
+    # zipf exponent of the repeats, the higher the more skewed towards a few requests
+    repeat_skew: float = 1.2
+    # random offset in degrees around the city centres
+    jitter: float = 0.1
+    # dates are drawn within this many days from start_date
+    date_spread: int = 30
+    start_date: datetime = field(default_factory=lambda: datetime(2024, 3, 1))
+
+
+@dataclass
+class LoadReport:
+    requests: int
+    errors: int
+    elapsed: float
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    # (upper bound in seconds, number of requests) for power of two buckets
+    histogram: list[tuple[float, int]]
+
+    @classmethod
+    def from_latencies(
+        cls, latencies: list[float], elapsed: float, errors: int = 0
+    ) -> "LoadReport":
+        latencies = sorted(latencies)
+        if not latencies:
+            raise ValueError("No latencies to report.")
+
+        histogram: list[tuple[float, int]] = []
+        bound = 1e-4
+        start = 0
+        while start < len(latencies):
+            end = bisect.bisect_right(latencies, bound, start)
+            histogram.append((bound, end - start))
+            start = end
+            bound *= 2
+
+        def percentile(value: float) -> float:
+            return latencies[int(value * (len(latencies) - 1))]
+
+        return cls(
+            requests=len(latencies),
+            errors=errors,
+            elapsed=elapsed,
+            throughput=len(latencies) / elapsed if elapsed > 0 else float("inf"),
+            p50=percentile(0.50),
+            p95=percentile(0.95),
+            p99=percentile(0.99),
+            max=latencies[-1],
+            histogram=histogram,
+        )
+
+    def format(self) -> str:
+        lines = [
+            f"{self.requests} requests, {self.errors} errors in {self.elapsed:.2f} s, "
+            f"{self.throughput:.0f} requests/s",
+            f"p50 {self.p50 * 1000:.3f} ms, p95 {self.p95 * 1000:.3f} ms, "
+            f"p99 {self.p99 * 1000:.3f} ms, max {self.max * 1000:.3f} ms",
+        ]
+        width = max(count for _, count in self.histogram)
+        for bound, count in self.histogram:
+            bar = "#" * round(40 * count / width)
+            lines.append(f"<= {bound * 1000:9.3f} ms {count:8d} {bar}")
+        return "\n".join(lines)
+
+
+def generate_requests(
+    count: int, mix: Optional[RequestMix] = None, seed: Optional[int] = None
+) -> Iterator[LoadRequest]:
+    """
+    Synthesize `count` requests: population weighted cities with some jitter,
+    a mix of day, month, year and next prayer requests, and zipf distributed
+    repeats of previous requests.
+    """
+    mix = mix if mix is not None else RequestMix()
+    rng = random.Random(seed)
+    population = [city[3] for city in CITIES]
+    kind_weights = [mix.day, mix.month, mix.year, mix.next]
+    time_zones = {city[4]: ZoneInfo(city[4]) for city in CITIES}
+    previous: list[LoadRequest] = []
+    repeat_weights: list[float] = []
+    total_weight = 0.0
+
+    for _ in range(count):
+        if previous and rng.random() < mix.repeat_rate:
+            yield rng.choices(previous, cum_weights=repeat_weights)[0]
+            continue
+
+        _, latitude, longitude, _, zone, method = rng.choices(
+            CITIES, weights=population
+        )[0]
+        request = LoadRequest(
+            rng.choices(KINDS, weights=kind_weights)[0],
+            (
+                round(latitude + rng.uniform(-mix.jitter, mix.jitter), 4),
+                round(longitude + rng.uniform(-mix.jitter, mix.jitter), 4),
+            ),
+            mix.start_date + timedelta(days=rng.randrange(mix.date_spread)),
+            method,
+            time_zones[zone],
+        )
+        previous.append(request)
+        # cumulative zipf weights, the earliest requests are the most repeated
+        total_weight += 1 / len(previous) ** mix.repeat_skew
+        repeat_weights.append(total_weight)
+        yield request
+
+
+def compute_request(request: LoadRequest) -> Any:
+    """Serve a request in process with the public API"""
+    parameters = CalculationParameters(method=request.method)
+    if request.kind == "next":
+        now = request.date.replace(hour=12, tzinfo=timezone.utc)
+        return next_prayer(request.coordinates, parameters, now, request.time_zone)
+
+    if request.kind == "day":
+        start, days = request.date, 1
+    elif request.kind == "month":
+        start = request.date.replace(day=1)
+        days = calendar.monthrange(start.year, start.month)[1]
+    else:
+        start = request.date.replace(month=1, day=1)
+        days = 366 if calendar.isleap(start.year) else 365
+
+    return [
+        PrayerTimes(
+            request.coordinates,
+            start + timedelta(days=offset),
+            calculation_parameters=parameters,
+            time_zone=request.time_zone,
+        )
+        for offset in range(days)
+    ]
+
+
+def run_in_process(
+    requests: list[LoadRequest],
+    concurrency: int = 1,
+    rate: Optional[float] = None,
+    handler: Callable[[LoadRequest], Any] = compute_request,
+) -> LoadReport:
+    """
+    Run the requests with `concurrency` threads, as fast as possible or at a
+    target `rate` of requests per second (open loop: latencies include the time
+    spent waiting for a free thread). handler defaults to compute_request and can
+    be replaced to measure caching or batching layers.
+    """
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def run(request: LoadRequest, scheduled: float) -> None:
+        nonlocal errors
+        try:
+            handler(request)
+        except Exception:
+            with lock:
+                errors += 1
+        latency = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(latency)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index, request in enumerate(requests):
+            scheduled = time.perf_counter()
+            if rate is not None:
+                scheduled = start + index / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(run, request, scheduled)
+    return LoadReport.from_latencies(latencies, time.perf_counter() - start, errors)
+
+
+def request_path(request: LoadRequest) -> str:
+    """Path of the request on the HTTP server of adhanpy.server"""
+    latitude, longitude = request.coordinates
+    query = (
+        f"latitude={latitude}&longitude={longitude}&method={request.method.name}"
+        f"&time_zone={request.time_zone.key}"
+    )
+    if request.kind == "next":
+        return f"/next?{query}"
+    if request.kind == "day":
+        return f"/day?{query}&date={request.date.date().isoformat()}"
+    if request.kind == "month":
+        start = request.date.replace(day=1)
+        days = calendar.monthrange(start.year, start.month)[1]
+    else:
+        start = request.date.replace(month=1, day=1)
+        days = 366 if calendar.isleap(start.year) else 365
+    return f"/range?{query}&start={start.date().isoformat()}&days={days}"
+
+
+def run_http(
+    requests: list[LoadRequest],
+    host: str,
+    port: int,
+    concurrency: int = 16,
+    rate: Optional[float] = None,
+) -> LoadReport:
+    """
+    Send the requests to a running adhanpy.server over keep-alive connections, as
+    fast as possible or at a target `rate` of requests per second as
+    run_in_process. Responses other than 200 and 304 are errors.
+    """
+    latencies, elapsed, errors = asyncio.run(
+        request_latencies(
+            host,
+            port,
+            [request_path(request) for request in requests],
+            len(requests),
+            concurrency,
+            rate,
+        )
+    )
+    return LoadReport.from_latencies(latencies, elapsed, errors)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m adhanpy.bench.LoadGenerator",
+        description="Drive adhanpy with a production like request mix",
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--rate", type=float, help="target requests per second")
+    parser.add_argument("--repeat-rate", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--http", metavar="HOST:PORT", help="send the requests to an adhanpy.server"
+    )
+    args = parser.parse_args(argv)
+
+    requests = list(
+        generate_requests(
+            args.requests, RequestMix(repeat_rate=args.repeat_rate), args.seed
+        )
+    )
+    if args.http:
+        host, _, port = args.http.rpartition(":")
+        report = run_http(requests, host, int(port), args.concurrency, args.rate)
+    else:
+        report = run_in_process(requests, args.concurrency, args.rate)
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
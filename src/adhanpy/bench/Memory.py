@@ -0,0 +1,192 @@
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.astronomy.SolarEphemeris import SolarEphemeris
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.astronomy.SolarTime import SolarTime
+from adhanpy.batch.BatchPrayerTimes import prayer_times_batch
+from adhanpy.batch.ParallelCalendar import calendar
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import apply_policy, precompute
+from adhanpy.data.Coordinates import Coordinates
+from adhanpy.timetable.PackedTimetable import PackedTimetable, encode_timetable
+from adhanpy.timetable.SpatialIndex import SpatialIndex
+from adhanpy.util.DateComponents import DateComponents
+
+_DATE = datetime(2024, 3, 10)
+_COORDINATES = (51.5, -0.13)
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    # bytes still allocated per object once it is created
+    bytes: float
+    # memory blocks still allocated per object
+    allocations: float
+
+
+def retained(factory: Callable[[], Any], count: int = 100) -> MemoryUsage:
+    """
+    Memory retained per object by count objects created by factory and kept alive,
+    the first object is created before measuring so that lazy imports and
+    interned values are not counted
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1.")
+
+    factory()
+    gc.collect()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        objects = [factory() for _ in range(count)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    # leave out the memory tracemalloc allocates for itself while snapshotting
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(ignored).compare_to(
+        before.filter_traces(ignored), "filename"
+    )
+    size = sum(difference.size_diff for difference in differences)
+    allocations = sum(difference.count_diff for difference in differences)
+    del objects
+    return MemoryUsage(size / count, allocations / count)
+
+
+def peak(function: Callable[[], Any]) -> int:
+    """Peak bytes allocated while function runs, above the memory in use before"""
+    gc.collect()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        function()
+        _, highest = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+    return highest - current
+
+
+def _parameters() -> CalculationParameters:
+    return CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+
+def per_prayer_times(count: int = 100) -> MemoryUsage:
+    parameters = _parameters()
+    return retained(
+        lambda: PrayerTimes(_COORDINATES, _DATE, calculation_parameters=parameters),
+        count,
+    )
+
+
+def per_solar_time(count: int = 100) -> MemoryUsage:
+    date_components = DateComponents.from_utc(_DATE)
+    coordinates = Coordinates(*_COORDINATES)
+    return retained(lambda: SolarTime(date_components, coordinates), count)
+
+
+def per_solar_events(count: int = 100, every_method: bool = False) -> MemoryUsage:
+    """
+    Memory retained per SolarEvents kept to re-apply policies, with the times of
+    the altitudes and shadow length of a policy cached, or of every method and
+    madhab when every_method
+    """
+    parameters = _parameters()
+    every_parameters = [
+        CalculationParameters(method=method) for method in CalculationMethod
+    ]
+
+    def solar_events() -> SolarEvents:
+        events = SolarEvents(_COORDINATES, _DATE)
+        if every_method:
+            precompute(events, every_parameters)
+        apply_policy(events, parameters)
+        return events
+
+    return retained(solar_events, count)
+
+
+def per_calendar_day(days: int = 366) -> MemoryUsage:
+    """Memory retained by a year long calendar of PrayerTimes divided by its days"""
+    parameters = _parameters()
+    usage = retained(
+        lambda: calendar(_COORDINATES, datetime(2024, 1, 1), days, parameters), 1
+    )
+    return MemoryUsage(usage.bytes / days, usage.allocations / days)
+
+
+def bulk_peak(locations: int = 1000) -> int:
+    """Peak bytes of computing the PrayerTimes of locations for one date"""
+    parameters = _parameters()
+    coordinates = [
+        (-60 + 120 * index / locations, -180 + 360 * index / locations)
+        for index in range(locations)
+    ]
+    return peak(lambda: prayer_times_batch(coordinates, _DATE, parameters))
+
+
+def retained_sizes(locations: int = 1000) -> dict[str, float]:
+    """Bytes retained by the precomputed structures kept around by applications"""
+    coordinates = [
+        (-60 + 120 * index / locations, -180 + 360 * index / locations)
+        for index in range(locations)
+    ]
+    # encoded up front so that the garbage of encoding is not counted, copied so
+    # that each PackedTimetable owns its buffer
+    year = encode_timetable(
+        calendar(_COORDINATES, datetime(2024, 1, 1), 366, _parameters())
+    )
+    return {
+        "SolarEphemeris of a year": retained(
+            lambda: SolarEphemeris.for_years(2024, 2024), 1
+        ).bytes,
+        f"SpatialIndex of {locations} locations": retained(
+            lambda: SpatialIndex(coordinates), 1
+        ).bytes,
+        "PackedTimetable of a year": retained(
+            lambda: PackedTimetable(bytearray(year)), 1
+        ).bytes,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m adhanpy.bench.Memory",
+        description="Memory used by adhanpy objects and bulk workloads",
+    )
+    parser.add_argument("--locations", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    for name, usage in (
+        ("PrayerTimes", per_prayer_times()),
+        ("SolarTime", per_solar_time()),
+        ("SolarEvents", per_solar_events()),
+        ("SolarEvents of every method", per_solar_events(every_method=True)),
+        ("calendar day", per_calendar_day()),
+    ):
+        print(
+            f"{name:30s} {usage.bytes:10.0f} bytes {usage.allocations:8.1f} allocations"
+        )
+    print(
+        f"{f'peak of {args.locations} locations':30s} "
+        f"{bulk_peak(args.locations):10d} bytes"
+    )
+    for name, size in retained_sizes(args.locations).items():
+        print(f"{name:30s} {size:10.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Sequence
+from adhanpy.batch.ParallelCalendar import parallel_calendar
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+
+@dataclass(frozen=True)
+class ScalingResult:
+    threads: int
+    # best wall time in seconds of the repeats
+    seconds: float
+    # calendar days computed per second
+    throughput: float
+    # throughput relative to one thread
+    speedup: float
+
+    @property
+    def efficiency(self) -> float:
+        return self.speedup / self.threads
+
+
+def gil_enabled() -> bool:
+    """False on a free-threaded build running without the GIL"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def scaling(
+    threads: Sequence[int] = (1, 2, 4, 8),
+    days: int = 366,
+    locations: int = 8,
+    repeat: int = 3,
+) -> list[ScalingResult]:
+    """
+    Time parallel_calendar computing a calendar of days for several locations
+    with each number of threads, one executor per number of threads is created
+    before timing so that thread start up is not measured
+    """
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    start = datetime(2024, 1, 1)
+    coordinates = [(-60 + 120 * index / locations, 0.0) for index in range(locations)]
+
+    results: list[ScalingResult] = []
+    for count in threads:
+        with ThreadPoolExecutor(count) as executor:
+            best = float("inf")
+            for _ in range(repeat):
+                began = time.perf_counter()
+                for location in coordinates:
+                    parallel_calendar(
+                        location,
+                        start,
+                        days,
+                        parameters,
+                        workers=count,
+                        executor=executor,
+                    )
+                best = min(best, time.perf_counter() - began)
+
+        throughput = days * locations / best
+        results.append(
+            ScalingResult(
+                count,
+                best,
+                throughput,
+                throughput / results[0].throughput if results else 1.0,
+            )
+        )
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m adhanpy.bench.Scaling",
+        description="Speedup of parallel_calendar with the number of threads",
+    )
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--days", type=int, default=366)
+    parser.add_argument("--locations", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(
+        f"Python {sys.version.split()[0]}, "
+        f"{'free-threaded' if free_threaded else 'GIL'} build, "
+        f"GIL {'enabled' if gil_enabled() else 'disabled'}, "
+        f"{os.cpu_count()} CPUs"
+    )
+    print("threads   seconds   days/s  speedup  efficiency")
+    for result in scaling(args.threads, args.days, args.locations, args.repeat):
+        print(
+            f"{result.threads:7d} {result.seconds:9.3f} {result.throughput:8.0f} "
+            f"{result.speedup:8.2f} {result.efficiency:11.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -61,7 +61,27 @@ class CalculationParameters:
 
         raise ValueError("Invalid high latitude rule")
 
+    def cache_key(self) -> tuple:
+        """
+        Hashable snapshot of the parameters, parameters with equal keys give the
+        same prayer times
+        """
+        return (
+            self.method.name,
+            self.madhab.name,
+            self.high_latitude_rule.name,
+            self.isha_interval,
+            self.fajr_angle,
+            self.isha_angle,
+            self.adjustments.as_tuple(),
+            self.method_adjustments.as_tuple(),
+        )
+
     def _set_parameters_using_method(self) -> None:
         method_parameters = METHODS_PARAMETERS[self.method]
         for key, value in method_parameters.items():
+            # METHODS_PARAMETERS is shared by all parameters (and threads), each
+            # parameters gets its own copy of the adjustments it can mutate
+            if isinstance(value, PrayerAdjustments):
+                value = PrayerAdjustments(*value.as_tuple())
             setattr(self, key, value)
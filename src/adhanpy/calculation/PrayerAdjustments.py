@@ -42,3 +42,6 @@ class PrayerAdjustments:
         self.asr = asr
         self.maghrib = maghrib
         self.isha = isha
+
+    def as_tuple(self) -> tuple[int, int, int, int, int, int]:
+        return (self.fajr, self.sunrise, self.dhuhr, self.asr, self.maghrib, self.isha)
@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.Twilight import (
+    season_adjusted_evening_twilight,
+    season_adjusted_morning_twilight,
+)
+from adhanpy.data.NightPortions import NightPortions
+from adhanpy.util.CalendarUtil import rounded_minute
+
+
+@dataclass(frozen=True)
+class PolicyTimes:
+    """Prayer times in UTC once the calculation parameters are applied"""
+
+    fajr: datetime
+    sunrise: datetime
+    dhuhr: datetime
+    asr: datetime
+    maghrib: datetime
+    isha: datetime
+    # whether fajr and isha are the high latitude safe bound (or the Moonsighting
+    # Committee seasonal bound) rather than the time of the twilight angle
+    fajr_bound: bool = False
+    isha_bound: bool = False
+
+
+def apply_policy(
+    events: SolarEvents,
+    calculation_parameters: CalculationParameters,
+    rounded: bool = True,
+) -> PolicyTimes:
+    """
+    Second stage of PrayerTimes: apply the fajr and isha angles or isha interval,
+    the madhab, the high latitude safe bounds, the Moonsighting Committee seasonal
+    rules and the adjustments to solar events. Only the altitudes and shadow
+    length not already used with the events need astronomy, so re-applying
+    changed adjustments, high latitude rule or isha interval to cached events
+    is a few datetime operations. Other angles or madhabs need an hour angle on
+    first use, unless the events are prepared with precompute.
+    Arguments:
+        events: SolarEvents of the location and date
+        calculation_parameters: CalculationParameters
+        rounded: round the times to the minute as PrayerTimes does
+    Raises:
+        RuntimeError when asr cannot be calculated
+    """
+    night_portions = calculation_parameters.night_portions()
+    adjust = _adjuster(calculation_parameters, rounded)
+
+    asr = events.afternoon(calculation_parameters.madhab.get_shadow_length())
+    if asr is None:
+        raise RuntimeError
+
+    fajr, fajr_bound = _fajr(events, calculation_parameters, night_portions)
+    isha, isha_bound = _isha(events, calculation_parameters, night_portions)
+    return PolicyTimes(
+        fajr=adjust("fajr", fajr),
+        sunrise=adjust("sunrise", events.sunrise),
+        dhuhr=adjust("dhuhr", events.transit),
+        asr=adjust("asr", asr),
+        maghrib=adjust("maghrib", events.sunset),
+        isha=adjust("isha", isha),
+        fajr_bound=fajr_bound,
+        isha_bound=isha_bound,
+    )
+
+
+def precompute(
+    events: SolarEvents,
+    calculation_parameters: Iterable[CalculationParameters],
+) -> None:
+    """
+    Compute on events the hour angles of the fajr and isha angles and of the asr
+    shadow lengths of each calculation parameters up front, so that apply_policy
+    with any of them needs no trigonometry
+    """
+    every_parameters = list(calculation_parameters)
+    events.precompute(
+        [-parameters.fajr_angle for parameters in every_parameters],
+        [
+            -parameters.isha_angle
+            for parameters in every_parameters
+            if not (parameters.isha_interval and parameters.isha_interval >= 1)
+        ],
+        [parameters.madhab.get_shadow_length() for parameters in every_parameters],
+    )
+
+
+def _fajr(
+    events: SolarEvents,
+    calculation_parameters: CalculationParameters,
+    night_portions: NightPortions,
+) -> tuple[datetime, bool]:
+    fajr = events.hour_angle(-calculation_parameters.fajr_angle, False)
+    latitude = events.observer.latitude
+
+    if calculation_parameters.method == CalculationMethod.MOON_SIGHTING_COMMITTEE:
+        if latitude >= 55:
+            fajr = events.sunrise + timedelta(
+                seconds=-1 * int(events.night_length / 7000)
+            )
+
+        safe_fajr = season_adjusted_morning_twilight(
+            latitude, events.day_of_year, events.date.year, events.sunrise
+        )
+    else:
+        night_fraction = int(night_portions.fajr * events.night_length / 1000)
+        safe_fajr = events.sunrise + timedelta(seconds=-1 * night_fraction)
+
+    if fajr is None or fajr < safe_fajr:
+        return safe_fajr, True
+    return fajr, False
+
+
+def _isha(
+    events: SolarEvents,
+    calculation_parameters: CalculationParameters,
+    night_portions: NightPortions,
+) -> tuple[datetime, bool]:
+    isha_interval = calculation_parameters.isha_interval
+    if isha_interval and isha_interval >= 1:
+        return events.sunset + timedelta(seconds=isha_interval * 60), False
+
+    isha: Optional[datetime] = events.hour_angle(
+        -calculation_parameters.isha_angle, True
+    )
+    latitude = events.observer.latitude
+    moon_sighting = (
+        calculation_parameters.method == CalculationMethod.MOON_SIGHTING_COMMITTEE
+    )
+
+    if moon_sighting and latitude >= 55:
+        isha = events.sunset + timedelta(seconds=int(events.night_length / 7000))
+
+    if moon_sighting:
+        safe_isha = season_adjusted_evening_twilight(
+            latitude, events.day_of_year, events.date.year, events.sunset
+        )
+    else:
+        night_fraction = int(night_portions.isha * events.night_length / 1000)
+        safe_isha = events.sunset + timedelta(seconds=int(night_fraction))
+
+    if isha is None or isha > safe_isha:
+        return safe_isha, True
+    return isha, False
+
+
+def _adjuster(calculation_parameters: CalculationParameters, rounded: bool):
+    adjustments = calculation_parameters.adjustments
+    method_adjustments = calculation_parameters.method_adjustments
+
+    def adjust(prayer_name: str, time: datetime) -> datetime:
+        adjusted = (
+            time + timedelta(minutes=getattr(adjustments, prayer_name))
+        ) + timedelta(minutes=getattr(method_adjustments, prayer_name))
+        return rounded_minute(adjusted) if rounded else adjusted
+
+    return adjust
@@ -0,0 +1,153 @@
+import math
+from array import array
+from datetime import date, timedelta
+from enum import Enum
+from typing import Sequence
+from adhanpy.astronomy.Astronomical import SUNRISE_ALTITUDE
+from adhanpy.astronomy.CalendricalHelper import julian_day
+from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+
+class Regime(Enum):
+
+    POLAR_DAY = 0
+    """
+    The sun stays above the horizon on the date or the next day: there is no sunset or no
+    sunrise the next day and prayer times cannot be calculated.
+    """
+
+    POLAR_NIGHT = 1
+    """
+    The sun stays below the horizon on the date or the next day: there is no sunrise on one of
+    them and prayer times cannot be calculated.
+    """
+
+    TWILIGHT = 2
+    """
+    The sun reaches the fajr and isha angles, fajr and isha are the times of the angles unless
+    the safe bounds are nearer to sunrise and sunset. Also when the angles are not used: isha
+    interval, Moonsighting Committee from 55° of latitude.
+    """
+
+    FAJR_BOUND = 3
+    """
+    The sun does not reach the fajr angle, fajr is the safe bound. Isha as TWILIGHT.
+    """
+
+    ISHA_BOUND = 4
+    """
+    The sun does not reach the isha angle, isha is the safe bound. Fajr as TWILIGHT.
+    """
+
+    SAFE_BOUND = 5
+    """
+    The sun reaches neither the fajr nor the isha angle, both are the safe bounds.
+    """
+
+    @property
+    def calculable(self) -> bool:
+        """Whether PrayerTimes can be calculated"""
+        return self not in (Regime.POLAR_DAY, Regime.POLAR_NIGHT)
+
+    @property
+    def fajr_bound(self) -> bool:
+        """Whether fajr is the safe bound whatever the time of the angle would be"""
+        return self in (Regime.FAJR_BOUND, Regime.SAFE_BOUND)
+
+    @property
+    def isha_bound(self) -> bool:
+        """Whether isha is the safe bound whatever the time of the angle would be"""
+        return self in (Regime.ISHA_BOUND, Regime.SAFE_BOUND)
+
+
+class DeclinationTable:
+    def __init__(self, start: date, days: int) -> None:
+        """
+        Sine and cosine of the declination of the sun at the UTC midnight of days
+        from start and of the day after, from the SolarCoordinates PrayerTimes uses
+        """
+        if days < 1:
+            raise ValueError("days must be at least 1.")
+
+        self.start = date(start.year, start.month, start.day)
+        self.days = days
+        self.sin_declinations = array("d")
+        self.cos_declinations = array("d")
+        jd = julian_day(start.year, start.month, start.day)
+        for offset in range(days + 1):
+            solar = SolarCoordinates(jd + offset)
+            self.sin_declinations.append(solar.sin_declination)
+            self.cos_declinations.append(solar.cos_declination)
+
+    def index(self, day: date) -> int:
+        index = (date(day.year, day.month, day.day) - self.start).days
+        if not 0 <= index < self.days:
+            raise IndexError(f"{day} is not in the table.")
+        return index
+
+    def day(self, index: int) -> date:
+        return self.start + timedelta(days=index)
+
+
+class RegimeClassifier:
+    def __init__(
+        self, calculation_parameters: CalculationParameters, table: DeclinationTable
+    ) -> None:
+        """
+        Regime of latitudes and days of table under calculation_parameters, from
+        the same test as the hour angles of SolarTime: an altitude is reached when
+        the cosine of its hour angle is within -1 and 1. PrayerTimes raises exactly
+        for the polar regimes.
+        """
+        self.table = table
+        self._sunrise = math.sin(math.radians(SUNRISE_ALTITUDE))
+        self._fajr = math.sin(math.radians(-calculation_parameters.fajr_angle))
+        self._isha = math.sin(math.radians(-calculation_parameters.isha_angle))
+        isha_interval = calculation_parameters.isha_interval
+        self._isha_interval = bool(isha_interval and isha_interval >= 1)
+        # the Moonsighting Committee does not use the angles from 55° of latitude
+        self._moon_sighting = (
+            calculation_parameters.method == CalculationMethod.MOON_SIGHTING_COMMITTEE
+        )
+
+    def regime(self, latitude: float, day: date) -> Regime:
+        return self._regime(latitude, self.table.index(day))
+
+    def regimes(self, latitudes: Sequence[float]) -> list[list[Regime]]:
+        """Regime of each latitude (rows) and each day of the table (columns)"""
+        return [
+            [self._regime(latitude, index) for index in range(self.table.days)]
+            for latitude in latitudes
+        ]
+
+    def _regime(self, latitude: float, index: int) -> Regime:
+        φ = math.radians(latitude)
+        sin_φ = math.sin(φ)
+        cos_φ = math.cos(φ)
+        sin_δ = self.table.sin_declinations
+        cos_δ = self.table.cos_declinations
+
+        def cos_hour_angle(sin_altitude: float, day: int) -> float:
+            return (sin_altitude - sin_φ * sin_δ[day]) / (cos_φ * cos_δ[day])
+
+        # sunrise and sunset of the day and sunrise of the next day
+        for day in (index, index + 1):
+            sunrise = cos_hour_angle(self._sunrise, day)
+            if sunrise < -1:
+                return Regime.POLAR_DAY
+            if sunrise > 1:
+                return Regime.POLAR_NIGHT
+
+        if self._moon_sighting and latitude >= 55:
+            return Regime.TWILIGHT
+        fajr_bound = cos_hour_angle(self._fajr, index) < -1
+        isha_bound = not self._isha_interval and cos_hour_angle(self._isha, index) < -1
+        if fajr_bound and isha_bound:
+            return Regime.SAFE_BOUND
+        if fajr_bound:
+            return Regime.FAJR_BOUND
+        if isha_bound:
+            return Regime.ISHA_BOUND
+        return Regime.TWILIGHT
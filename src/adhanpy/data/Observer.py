@@ -0,0 +1,28 @@
+import math
+from dataclasses import dataclass, field
+from typing import Union
+from adhanpy.data.Coordinates import Coordinates
+
+
+@dataclass(frozen=True)
+class Observer:
+    """
+    Coordinates of an observer with the trigonometry of the latitude evaluated
+    once, to be reused by every hour angle computed for the observer
+    """
+
+    latitude: float
+    longitude: float
+    sin_latitude: float = field(init=False, repr=False, compare=False)
+    cos_latitude: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        φ = math.radians(self.latitude)
+        object.__setattr__(self, "sin_latitude", math.sin(φ))
+        object.__setattr__(self, "cos_latitude", math.cos(φ))
+
+    @classmethod
+    def of(cls, coordinates: Union["Observer", Coordinates]) -> "Observer":
+        if isinstance(coordinates, Observer):
+            return coordinates
+        return cls(coordinates.latitude, coordinates.longitude)
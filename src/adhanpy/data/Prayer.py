@@ -16,3 +16,17 @@ class Prayer(Enum):
     MAGHRIB = 5
 
     ISHA = 6
+
+
+# the times of a day in order, as the attributes of PrayerTimes
+PRAYERS = (
+    Prayer.FAJR,
+    Prayer.SUNRISE,
+    Prayer.DHUHR,
+    Prayer.ASR,
+    Prayer.MAGHRIB,
+    Prayer.ISHA,
+)
+
+# minutes of a day, the unit of times of day in packed and rendered timetables
+MINUTES_PER_DAY = 24 * 60
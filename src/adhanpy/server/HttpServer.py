@@ -0,0 +1,522 @@
+import asyncio
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.HighLatitudeRule import HighLatitudeRule
+from adhanpy.calculation.Madhab import Madhab
+from adhanpy.data.Prayer import PRAYERS, Prayer
+from adhanpy.server.SingleFlight import AsyncSingleFlight
+
+
+# prayer times of a given location, date and parameters never change
+DAY_MAX_AGE = 86400
+MAX_RANGE_DAYS = 366
+
+
+class _Response:
+    def __init__(
+        self,
+        status: HTTPStatus,
+        payload: Optional[dict] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.status = status
+        self.body = b"" if payload is None else json.dumps(payload).encode()
+        self.headers = headers if headers is not None else {}
+
+
+class _Request:
+    def __init__(self, path: str, query: dict[str, list[str]]) -> None:
+        self.path = path
+        self.query = query
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.query.get(name)
+        return values[-1] if values else default
+
+    def required(self, name: str) -> str:
+        value = self.get(name)
+        if value is None:
+            raise ValueError(f"Missing query parameter {name}.")
+        return value
+
+    def coordinates(self) -> tuple[float, float]:
+        latitude = float(self.required("latitude"))
+        longitude = float(self.required("longitude"))
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError("Coordinates out of range.")
+        return latitude, longitude
+
+    def date(self, name: str) -> date:
+        return date.fromisoformat(self.required(name))
+
+    def time_zone(self) -> Optional[ZoneInfo]:
+        name = self.get("time_zone")
+        if name is None:
+            return None
+        try:
+            return ZoneInfo(name)
+        except (KeyError, ValueError):
+            raise ValueError(f"Unknown time zone {name}.")
+
+    def parameters(self) -> CalculationParameters:
+        method = self.get("method")
+        if method is None and self.get("fajr_angle") is None:
+            raise ValueError("Either method or fajr_angle must be passed.")
+        parameters = CalculationParameters(
+            method=None if method is None else _enum(CalculationMethod, method),
+            isha_interval=int(self.get("isha_interval", "0") or 0),
+            fajr_angle=float(self.get("fajr_angle", "0") or 0),
+            isha_angle=float(self.get("isha_angle", "0") or 0),
+        )
+        parameters.madhab = _enum(Madhab, self.get("madhab", "SHAFI") or "SHAFI")
+        parameters.high_latitude_rule = _enum(
+            HighLatitudeRule,
+            self.get("high_latitude_rule", "MIDDLE_OF_THE_NIGHT")
+            or "MIDDLE_OF_THE_NIGHT",
+        )
+        return parameters
+
+
+def _enum(enum, name: str):
+    try:
+        return enum[name.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown {enum.__name__} {name}.")
+
+
+def _etag(*key) -> str:
+    return '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+
+
+def _prayer_times_json(prayer_times: PrayerTimes) -> dict[str, str]:
+    payload = {"date": prayer_times.date.isoformat()}
+    for prayer in PRAYERS:
+        name = prayer.name.lower()
+        payload[name] = getattr(prayer_times, name).isoformat()
+    return payload
+
+
+def _location_key(
+    coordinates: tuple[float, float],
+    parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo],
+) -> tuple:
+    return (
+        coordinates,
+        parameters.cache_key(),
+        None if time_zone is None else time_zone.key,
+    )
+
+
+def day_endpoint(request: _Request) -> tuple[str, Callable[[], dict]]:
+    coordinates = request.coordinates()
+    day = request.date("date")
+    parameters = request.parameters()
+    time_zone = request.time_zone()
+
+    def compute() -> dict:
+        return _prayer_times_json(
+            PrayerTimes(
+                coordinates,
+                datetime(day.year, day.month, day.day),
+                calculation_parameters=parameters,
+                time_zone=time_zone,
+            )
+        )
+
+    key = _location_key(coordinates, parameters, time_zone)
+    return _etag("day", key, day.isoformat()), compute
+
+
+def range_endpoint(request: _Request) -> tuple[str, Callable[[], dict]]:
+    coordinates = request.coordinates()
+    start = request.date("start")
+    days = int(request.required("days"))
+    if not 0 < days <= MAX_RANGE_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_RANGE_DAYS}.")
+    parameters = request.parameters()
+    time_zone = request.time_zone()
+
+    def compute() -> dict:
+        return {
+            "days": [
+                _prayer_times_json(
+                    PrayerTimes(
+                        coordinates,
+                        datetime(start.year, start.month, start.day)
+                        + timedelta(days=offset),
+                        calculation_parameters=parameters,
+                        time_zone=time_zone,
+                    )
+                )
+                for offset in range(days)
+            ]
+        }
+
+    key = _location_key(coordinates, parameters, time_zone)
+    return _etag("range", key, start.isoformat(), days), compute
+
+
+def next_prayer(
+    coordinates: tuple[float, float],
+    parameters: CalculationParameters,
+    now: datetime,
+    time_zone: Optional[ZoneInfo] = None,
+) -> tuple[Prayer, datetime]:
+    """Next prayer after now, looking at the following days if needed"""
+    day = now.astimezone(time_zone if time_zone is not None else timezone.utc)
+    for offset in range(-1, 2):
+        prayer_times = PrayerTimes(
+            coordinates,
+            day + timedelta(days=offset),
+            calculation_parameters=parameters,
+            time_zone=time_zone,
+        )
+        prayer = prayer_times.next_prayer(now)
+        if prayer != Prayer.NONE:
+            return prayer, getattr(prayer_times, prayer.name.lower())
+    raise RuntimeError
+
+
+class PrayerTimesServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: int = 4,
+        max_pending: int = 256,
+        keep_alive_timeout: float = 15.0,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        """
+        Minimal asyncio HTTP/1.1 server for prayer times:
+            GET /day?latitude=&longitude=&date=YYYY-MM-DD
+            GET /range?latitude=&longitude=&start=YYYY-MM-DD&days=N
+            GET /next?latitude=&longitude=
+        each taking either method (a CalculationMethod name) or fajr_angle with
+        isha_angle or isha_interval, and optionally madhab, high_latitude_rule and
+        time_zone. Prayer times are computed in a pool of `workers` threads and
+        requests beyond `max_pending` being computed get a 503. Identical requests
+        arriving while the same response is computed share its computation.
+        Arguments:
+            port: 0 picks a free port, available in self.port once started
+            clock: current time used by /next
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_pending = max_pending
+        self.keep_alive_timeout = keep_alive_timeout
+        self.clock = clock
+        self.pending = 0
+        self.single_flight: AsyncSingleFlight[dict] = AsyncSingleFlight()
+        self.routes: dict[str, Callable[[_Request], Any]] = {
+            "/day": day_endpoint,
+            "/range": range_endpoint,
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self) -> "PrayerTimesServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request_line = await asyncio.wait_for(
+                        reader.readline(), self.keep_alive_timeout
+                    )
+                except asyncio.TimeoutError:
+                    break
+                except ValueError:
+                    # longer than the limit of the stream: the rest of the request
+                    # cannot be told from the next one
+                    response = _Response(
+                        HTTPStatus.BAD_REQUEST, {"error": "Request line too long."}
+                    )
+                    self._write(writer, response, False)
+                    await writer.drain()
+                    break
+                if not request_line.strip():
+                    break
+
+                try:
+                    headers = await _read_headers(reader)
+                    if content_length := _content_length(headers):
+                        await reader.readexactly(content_length)
+                    method, target, version = _request_line(request_line)
+                except _BadRequest as error:
+                    response = _Response(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+                    keep_alive = False
+                else:
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = (
+                        connection != "close"
+                        if version == "HTTP/1.1"
+                        else connection == "keep-alive"
+                    )
+                    response = await self._respond(method, target, headers)
+
+                self._write(writer, response, keep_alive)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, method: str, target: str, headers: dict[str, str]
+    ) -> _Response:
+        if method != "GET":
+            return _Response(
+                HTTPStatus.METHOD_NOT_ALLOWED,
+                {"error": f"Method {method} not allowed."},
+                {"Allow": "GET"},
+            )
+
+        url = urlsplit(target)
+        request = _Request(url.path, parse_qs(url.query))
+        try:
+            if url.path == "/next":
+                return await self._next(request)
+
+            route = self.routes.get(url.path)
+            if route is None:
+                return _Response(
+                    HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}."}
+                )
+
+            etag, compute = route(request)
+            cache_headers = {
+                "ETag": etag,
+                "Cache-Control": f"public, max-age={DAY_MAX_AGE}",
+            }
+            if _etag_matches(etag, headers.get("if-none-match")):
+                return _Response(HTTPStatus.NOT_MODIFIED, None, cache_headers)
+
+            payload = await self.single_flight.do(etag, lambda: self._compute(compute))
+        except ValueError as error:
+            return _Response(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+        except _Overloaded:
+            return _Response(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Too many pending requests."},
+                {"Retry-After": "1"},
+            )
+        except RuntimeError:
+            return _Response(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"error": "Prayer times cannot be calculated for this location."},
+            )
+
+        return _Response(HTTPStatus.OK, payload, cache_headers)
+
+    async def _next(self, request: _Request) -> _Response:
+        coordinates = request.coordinates()
+        parameters = request.parameters()
+        time_zone = request.time_zone()
+        now = self.clock()
+
+        prayer, when = await self._compute(
+            lambda: next_prayer(coordinates, parameters, now, time_zone)
+        )
+        max_age = max(0, int((when - now).total_seconds()))
+        return _Response(
+            HTTPStatus.OK,
+            {"prayer": prayer.name.lower(), "time": when.isoformat()},
+            {
+                "ETag": _etag(
+                    "next",
+                    _location_key(coordinates, parameters, time_zone),
+                    when.isoformat(),
+                ),
+                "Cache-Control": f"public, max-age={max_age}",
+            },
+        )
+
+    async def _compute(self, compute: Callable[[], Any]) -> Any:
+        if self.pending >= self.max_pending:
+            raise _Overloaded
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, compute
+            )
+        finally:
+            self.pending -= 1
+
+    def _write(
+        self, writer: asyncio.StreamWriter, response: _Response, keep_alive: bool
+    ) -> None:
+        lines = [f"HTTP/1.1 {response.status.value} {response.status.phrase}"]
+        if response.status != HTTPStatus.NOT_MODIFIED:
+            lines.append("Content-Type: application/json")
+            lines.append(f"Content-Length: {len(response.body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        lines.extend(f"{name}: {value}" for name, value in response.headers.items())
+        writer.write(
+            ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + response.body
+        )
+
+
+class _Overloaded(Exception):
+    pass
+
+
+class _BadRequest(Exception):
+    pass
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise _BadRequest("Header line too long.")
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, separator, value = line.decode("latin-1").partition(":")
+        if not separator:
+            raise _BadRequest("Malformed header line.")
+        headers[name.strip().lower()] = value.strip()
+
+
+def _content_length(headers: dict[str, str]) -> int:
+    value = headers.get("content-length", "0")
+    if not (value.isascii() and value.isdigit()):
+        raise _BadRequest("Malformed Content-Length.")
+    return int(value)
+
+
+def _request_line(line: bytes) -> tuple[str, str, str]:
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise _BadRequest("Malformed request line.")
+    method, target, version = parts
+    return method, target, version
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    # weak comparison of RFC 9110, as If-None-Match requires
+    if if_none_match is None:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+async def request_latencies(
+    host: str,
+    port: int,
+    paths: list[str],
+    requests: int = 1000,
+    concurrency: int = 16,
+    rate: Optional[float] = None,
+) -> tuple[list[float], float, int]:
+    """
+    Send `requests` GET requests cycling through paths over `concurrency`
+    keep-alive connections, as fast as possible or at a target `rate` of requests
+    per second (open loop: latencies include the time spent waiting for a free
+    connection). Return the latency of each request, the total elapsed time in
+    seconds and the number of responses other than 200 and 304.
+    """
+    latencies: list[float] = []
+    errors = 0
+    start = time.perf_counter()
+
+    async def client(first: int) -> None:
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            # requests are dealt to the connections in turn, in the order of the
+            # schedule when there is a rate
+            for index in range(first, requests, concurrency):
+                path = paths[index % len(paths)]
+                scheduled = time.perf_counter()
+                if rate is not None:
+                    scheduled = start + index / rate
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                writer.write(
+                    f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+                )
+                await writer.drain()
+                status = int((await reader.readline()).split()[1])
+                content_length = 0
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    if line.lower().startswith(b"content-length:"):
+                        content_length = int(line.split(b":")[1])
+                await reader.readexactly(content_length)
+                latencies.append(time.perf_counter() - scheduled)
+                if status not in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED):
+                    errors += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(client(index) for index in range(concurrency)))
+    return latencies, time.perf_counter() - start, errors
+
+
+async def benchmark(
+    host: str,
+    port: int,
+    paths: list[str],
+    requests: int = 1000,
+    concurrency: int = 16,
+) -> dict[str, float]:
+    """
+    Same as request_latencies, returning the throughput and latency percentiles
+    """
+    latencies, elapsed, errors = await request_latencies(
+        host, port, paths, requests, concurrency
+    )
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[int(0.50 * (len(latencies) - 1))],
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "p99": latencies[int(0.99 * (len(latencies) - 1))],
+    }
@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional, Union
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.batch.BatchPrayerTimes import prayer_times_batch
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+BatchKernel = Callable[
+    [list[tuple[float, float]], datetime, CalculationParameters, Optional[ZoneInfo]],
+    list[Union[PrayerTimes, Exception]],
+]
+
+
+@dataclass
+class MicroBatcherMetrics:
+    # requests submitted
+    requests: int = 0
+    # batches taken from the queue
+    batches: int = 0
+    # groups of requests sharing a date and parameters computed together
+    groups: int = 0
+    # largest batch taken from the queue
+    max_batch_size: int = 0
+    # largest number of requests waiting in the queue when a batch was taken
+    max_queue_depth: int = 0
+
+
+@dataclass
+class _Request:
+    coordinates: tuple[float, float]
+    date: datetime
+    calculation_parameters: CalculationParameters
+    time_zone: Optional[ZoneInfo]
+    future: Future
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        max_batch_size: int = 256,
+        max_delay: float = 0.002,
+        kernel: BatchKernel = prayer_times_batch,
+    ) -> None:
+        """
+        Collect single PrayerTimes requests for up to max_batch_size requests or
+        max_delay seconds after the first one, then compute requests sharing a
+        date, parameters and time zone in one call of the batch kernel. A larger
+        max_delay makes bigger batches (throughput) at the cost of latency.
+        Requests are computed in a background thread, call close() when done.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.kernel = kernel
+        self.metrics = MicroBatcherMetrics()
+        self._queue: queue.SimpleQueue[Optional[_Request]] = queue.SimpleQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="adhanpy-micro-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        coordinates: tuple[float, float],
+        date: datetime,
+        calculation_parameters: CalculationParameters,
+        time_zone: Optional[ZoneInfo] = None,
+    ) -> Future:
+        """
+        Return a future resolved with the PrayerTimes (or the exception raised
+        computing them), asyncio callers can await asyncio.wrap_future(future)
+        """
+        future: Future = Future()
+        request = _Request(coordinates, date, calculation_parameters, time_zone, future)
+        # under the lock of close so that no request is queued after the sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed.")
+            self.metrics.requests += 1
+            self._queue.put(request)
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        """Compute the requests already submitted and stop the background thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            request = self._queue.get()
+            if request is None:
+                break
+            # a cancelled future cannot take a result, drop its request
+            if not request.future.set_running_or_notify_cancel():
+                continue
+
+            self.metrics.max_queue_depth = max(
+                self.metrics.max_queue_depth, self._queue.qsize() + 1
+            )
+            batch = [request]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    request = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                if request.future.set_running_or_notify_cancel():
+                    batch.append(request)
+
+            self._compute(batch)
+
+    def _compute(self, batch: list[_Request]) -> None:
+        self.metrics.batches += 1
+        self.metrics.max_batch_size = max(self.metrics.max_batch_size, len(batch))
+
+        groups: dict[tuple, list[_Request]] = {}
+        for request in batch:
+            key = (
+                (request.date.year, request.date.month, request.date.day),
+                request.calculation_parameters.cache_key(),
+                None if request.time_zone is None else request.time_zone.key,
+            )
+            groups.setdefault(key, []).append(request)
+
+        for requests in groups.values():
+            self.metrics.groups += 1
+            first = requests[0]
+            try:
+                results = self.kernel(
+                    [request.coordinates for request in requests],
+                    first.date,
+                    first.calculation_parameters,
+                    first.time_zone,
+                )
+            except Exception as error:
+                for request in requests:
+                    request.future.set_exception(error)
+                continue
+
+            for request, result in zip(requests, results):
+                if isinstance(result, Exception):
+                    request.future.set_exception(result)
+                else:
+                    request.future.set_result(result)
@@ -0,0 +1,256 @@
+import asyncio
+import copy
+import heapq
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Hashable, Iterable, Optional
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Prayer import Prayer
+
+# prayers with an adhan
+ADHAN_PRAYERS = frozenset(
+    (Prayer.FAJR, Prayer.DHUHR, Prayer.ASR, Prayer.MAGHRIB, Prayer.ISHA)
+)
+
+# days tried before giving up on a location where no prayer time can be calculated
+_MAX_DAYS_WITHOUT_EVENTS = 366
+
+
+@dataclass(frozen=True)
+class Notification:
+    prayer: Prayer
+    time: datetime
+    subscribers: tuple[Hashable, ...]
+
+
+@dataclass
+class SchedulerMetrics:
+    # PrayerTimes computed to refill the timer heap
+    days_loaded: int = 0
+    # (group, prayer) events fired
+    events: int = 0
+    # notifications passed to dispatch, one per subscriber
+    notifications: int = 0
+    # calls of dispatch
+    batches: int = 0
+    # events dropped for being later than max_lateness
+    late: int = 0
+
+
+@dataclass(eq=False)
+class _Group:
+    # subscribers sharing coordinates, parameters and prayers share their events
+    key: tuple
+    coordinates: tuple[float, float]
+    calculation_parameters: CalculationParameters
+    prayers: frozenset
+    next_day: date
+    subscribers: set = field(default_factory=set)
+
+
+class NotificationScheduler:
+    def __init__(
+        self,
+        dispatch: Callable[[list[Notification]], None],
+        batch_size: int = 1000,
+        max_lateness: Optional[timedelta] = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        """
+        Fire notifications at the prayer times of many subscribers from a single
+        timer heap: subscribers with the same coordinates, parameters and prayers
+        form a group with one set of events, and the events of all groups at the
+        same instant are kept under that instant. Only the next day of events of
+        each group is loaded, the following day is loaded when its last event
+        fires, so memory grows with the distinct events rather than with
+        subscribers times prayers.
+        Arguments:
+            dispatch: called with the notifications of an instant, the prayers
+                at the same instant together, at most batch_size subscribers
+                per call
+            max_lateness: events later than this when fired are dropped (e.g.
+                after the process was suspended), None fires them all
+            clock: current time
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        self.dispatch = dispatch
+        self.batch_size = batch_size
+        self.max_lateness = max_lateness
+        self.clock = clock
+        self.metrics = SchedulerMetrics()
+        self._groups: dict[tuple, _Group] = {}
+        self._subscriptions: dict[Hashable, _Group] = {}
+        # distinct instants, and the (group, prayer, last event of the day) at each
+        self._heap: list[datetime] = []
+        self._events: dict[datetime, list[tuple[_Group, Prayer, bool]]] = {}
+        self._wake: Optional[asyncio.Event] = None
+
+    def subscribe(
+        self,
+        subscriber: Hashable,
+        coordinates: tuple[float, float],
+        calculation_parameters: CalculationParameters,
+        prayers: Iterable[Prayer] = ADHAN_PRAYERS,
+    ) -> None:
+        """Notify subscriber at its prayers from now on, replacing a previous subscription"""
+        if subscriber in self._subscriptions:
+            self.unsubscribe(subscriber)
+
+        prayers = frozenset(prayers)
+        key = (tuple(coordinates), calculation_parameters.cache_key(), prayers)
+        group = self._groups.get(key)
+        if group is None:
+            now = self.clock()
+            group = self._groups[key] = _Group(
+                key,
+                (coordinates[0], coordinates[1]),
+                copy.deepcopy(calculation_parameters),
+                prayers,
+                # the evening prayers west of Greenwich are on the next UTC date
+                now.astimezone(timezone.utc).date() - timedelta(days=1),
+            )
+            self._load(group, now)
+
+        group.subscribers.add(subscriber)
+        self._subscriptions[subscriber] = group
+
+    def unsubscribe(self, subscriber: Hashable) -> None:
+        group = self._subscriptions.pop(subscriber)
+        group.subscribers.discard(subscriber)
+        if not group.subscribers:
+            # its events are skipped when they fire
+            del self._groups[group.key]
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def groups(self) -> int:
+        return len(self._groups)
+
+    @property
+    def scheduled(self) -> int:
+        """Events in the timer heap, including those of removed groups"""
+        return sum(len(events) for events in self._events.values())
+
+    def next_time(self) -> Optional[datetime]:
+        return self._heap[0] if self._heap else None
+
+    def run_due(self, now: Optional[datetime] = None) -> int:
+        """Dispatch the notifications due at now (defaults to the clock), returns their number"""
+        if now is None:
+            now = self.clock()
+
+        notifications = 0
+        while self._heap and self._heap[0] <= now:
+            instant = heapq.heappop(self._heap)
+            events = self._events.pop(instant)
+
+            subscribers: dict[Prayer, list[Hashable]] = {}
+            late = self.max_lateness is not None and now - instant > self.max_lateness
+            for group, prayer, last in events:
+                if self._groups.get(group.key) is not group:
+                    continue
+                if last:
+                    self._load(group, instant)
+                if late:
+                    self.metrics.late += 1
+                    continue
+                self.metrics.events += 1
+                subscribers.setdefault(prayer, []).extend(group.subscribers)
+
+            notifications += self._dispatch(instant, subscribers)
+        return notifications
+
+    def _dispatch(
+        self, instant: datetime, subscribers: dict[Prayer, list[Hashable]]
+    ) -> int:
+        # the prayers of an instant share calls, batch_size subscribers at most each
+        batch: list[Notification] = []
+        size = 0
+        for prayer, members in sorted(
+            subscribers.items(), key=lambda item: item[0].value
+        ):
+            start = 0
+            while start < len(members):
+                stop = start + self.batch_size - size
+                notification = Notification(prayer, instant, tuple(members[start:stop]))
+                batch.append(notification)
+                size += len(notification.subscribers)
+                start = stop
+                if size == self.batch_size:
+                    self._send(batch)
+                    batch, size = [], 0
+        if batch:
+            self._send(batch)
+        return sum(len(members) for members in subscribers.values())
+
+    def _send(self, batch: list[Notification]) -> None:
+        self.metrics.batches += 1
+        self.metrics.notifications += sum(
+            len(notification.subscribers) for notification in batch
+        )
+        self.dispatch(batch)
+
+    async def run(self) -> None:
+        """Dispatch notifications as they are due until cancelled"""
+        self._wake = asyncio.Event()
+        try:
+            while True:
+                self.run_due()
+                next_time = self.next_time()
+                delay = (
+                    None
+                    if next_time is None
+                    else max(0.0, (next_time - self.clock()).total_seconds())
+                )
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wake = None
+
+    def _load(self, group: _Group, after: datetime) -> None:
+        # schedule the events after `after` of the next day having some
+        for _ in range(_MAX_DAYS_WITHOUT_EVENTS):
+            day = group.next_day
+            group.next_day += timedelta(days=1)
+            self.metrics.days_loaded += 1
+            try:
+                prayer_times = PrayerTimes(
+                    group.coordinates,
+                    datetime(day.year, day.month, day.day),
+                    calculation_parameters=group.calculation_parameters,
+                )
+            except (RuntimeError, ValueError):
+                continue
+
+            # prayers of a group can share an instant, e.g. with adjustments
+            events = sorted(
+                (
+                    (time, prayer)
+                    for prayer in group.prayers
+                    if (time := prayer_times.time_for_prayer(prayer)) is not None
+                    and time > after
+                ),
+                key=lambda event: event[0],
+            )
+            for index, (time, prayer) in enumerate(events):
+                self._schedule(time, (group, prayer, index == len(events) - 1))
+            if events:
+                return
+
+    def _schedule(self, time: datetime, event: tuple[_Group, Prayer, bool]) -> None:
+        events = self._events.get(time)
+        if events is None:
+            events = self._events[time] = []
+            heapq.heappush(self._heap, time)
+            if self._wake is not None and self._heap[0] == time:
+                self._wake.set()
+        events.append(event)
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+from zoneinfo import ZoneInfo
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightMetrics:
+    # calls made
+    calls: int = 0
+    # computations actually run
+    computations: int = 0
+    # calls which waited for a computation started by another call
+    coalesced: int = 0
+    # calls which gave up waiting
+    timeouts: int = 0
+
+
+def prayer_times_key(
+    coordinates: tuple[float, float],
+    date: datetime,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+) -> tuple:
+    """Key identifying the PrayerTimes computed from these arguments"""
+    return (
+        coordinates,
+        (date.year, date.month, date.day),
+        calculation_parameters.cache_key(),
+        None if time_zone is None else time_zone.key,
+    )
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        """
+        Coalesce concurrent calls for the same key from several threads: the first
+        call runs the computation and the calls arriving while it runs wait for it
+        and get the same result (or exception), which must not be mutated.
+        Arguments:
+            timeout: default time in seconds a call waits for a computation started
+                by another call before raising TimeoutError, None waits forever
+        """
+        self.timeout = timeout
+        self.metrics = SingleFlightMetrics()
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    def do(
+        self,
+        key: Hashable,
+        compute: Callable[[], T],
+        timeout: Optional[float] = None,
+    ) -> T:
+        with self._lock:
+            self.metrics.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.metrics.computations += 1
+            else:
+                self.metrics.coalesced += 1
+
+        if leader:
+            try:
+                call.result = compute()
+            except BaseException as error:
+                call.error = error
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.metrics.timeouts += 1
+            raise TimeoutError(f"Timed out waiting for the computation of {key}.")
+
+        if call.error is not None:
+            raise call.error
+        return call.result  # type: ignore[return-value]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight(Generic[T]):
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        """
+        Same as SingleFlight for coroutines of one event loop, compute returns an
+        awaitable, e.g. loop.run_in_executor(...) for CPU bound work. A call timing
+        out does not cancel the computation shared with the other calls.
+        """
+        self.timeout = timeout
+        self.metrics = SingleFlightMetrics()
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        self.metrics.calls += 1
+        future = self._calls.get(key)
+        if future is None:
+            self.metrics.computations += 1
+            future = asyncio.ensure_future(compute())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.metrics.coalesced += 1
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            raise TimeoutError(f"Timed out waiting for the computation of {key}.")
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # the exception is raised to the callers still waiting, if all of them
+        # timed out it would otherwise be logged as never retrieved
+        if not future.cancelled():
+            future.exception()
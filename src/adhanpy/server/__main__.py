@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+from adhanpy.server.HttpServer import PrayerTimesServer, benchmark
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = PrayerTimesServer(
+        args.host, args.port, workers=args.workers, max_pending=args.max_pending
+    )
+    await server.start()
+    print(f"Serving prayer times on http://{server.host}:{server.port}")
+
+    if not args.benchmark:
+        await server.serve_forever()
+        return
+
+    paths = [
+        f"/day?latitude={latitude}&longitude={longitude}&date=2024-03-{day:02d}"
+        f"&method=MUSLIM_WORLD_LEAGUE"
+        for latitude, longitude in ((51.5, -0.13), (21.42, 39.83), (-33.87, 151.21))
+        for day in range(1, 29)
+    ]
+    results = await benchmark(
+        server.host, server.port, paths, args.benchmark, args.concurrency
+    )
+    await server.close()
+    print(
+        f"{results['requests']} requests, {results['errors']} errors, "
+        f"{results['throughput']:.0f} requests/s, "
+        f"p50 {results['p50'] * 1000:.2f} ms, p95 {results['p95'] * 1000:.2f} ms, "
+        f"p99 {results['p99'] * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m adhanpy.server", description="Prayer times HTTP server"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        default=0,
+        metavar="REQUESTS",
+        help="send REQUESTS requests to the server, print throughput and latencies and exit",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
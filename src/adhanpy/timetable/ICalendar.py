@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, TextIO
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.batch.ParallelCalendar import iter_calendar
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Prayer import Prayer
+
+PRODUCT_ID = "-//adhanpy//Prayer times//EN"
+
+# prayers with an adhan
+ADHAN_PRAYERS = (Prayer.FAJR, Prayer.DHUHR, Prayer.ASR, Prayer.MAGHRIB, Prayer.ISHA)
+
+# content lines longer than this many octets are folded
+_LINE_LENGTH = 75
+
+
+def write_ics(
+    file: TextIO,
+    coordinates: tuple[float, float],
+    start: datetime,
+    days: int,
+    calculation_parameters: CalculationParameters,
+    time_zone: Optional[ZoneInfo] = None,
+    prayers: Iterable[Prayer] = ADHAN_PRAYERS,
+    alarm: Optional[int] = None,
+    duration: int = 15,
+    name: Optional[str] = None,
+    stamp: Optional[datetime] = None,
+) -> int:
+    """
+    Write an iCalendar feed of the prayer times of consecutive days from start,
+    computing and writing one day at a time so that memory does not grow with
+    days. Days where prayer times cannot be calculated have no events.
+    Arguments:
+        time_zone: events are in this time zone, described by a VTIMEZONE, or
+            in UTC when None
+        prayers: prayers having an event
+        alarm: minutes before each event a display alarm goes off, None for no alarm
+        duration: minutes each event lasts
+        name: name of the calendar
+        stamp: DTSTAMP of the events, defaults to now
+    Returns:
+        number of events written
+    """
+    prayers = tuple(prayers)
+    stamp = stamp or datetime.now(timezone.utc)
+    end = start + timedelta(days=days)
+    _write(file, header(name))
+    if time_zone is not None:
+        _write(file, vtimezone(time_zone, start, end))
+
+    events = 0
+    for prayer_times in iter_calendar(
+        coordinates, start, days, calculation_parameters, time_zone
+    ):
+        if isinstance(prayer_times, Exception):
+            continue
+        for prayer in prayers:
+            _write(
+                file,
+                vevent(prayer_times, prayer, alarm, duration, stamp, coordinates),
+            )
+            events += 1
+
+    _write(file, ["END:VCALENDAR"])
+    return events
+
+
+def header(name: Optional[str] = None) -> list[str]:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODUCT_ID}"]
+    if name is not None:
+        lines.append(f"X-WR-CALNAME:{escape(name)}")
+    return lines
+
+
+def vevent(
+    prayer_times: PrayerTimes,
+    prayer: Prayer,
+    alarm: Optional[int] = None,
+    duration: int = 15,
+    stamp: Optional[datetime] = None,
+    coordinates: Optional[tuple[float, float]] = None,
+) -> list[str]:
+    """Content lines of the VEVENT of a prayer"""
+    time = prayer_times.time_for_prayer(prayer)
+    if time is None:
+        raise ValueError(f"{prayer} has no time.")
+
+    title = prayer.name.capitalize()
+    location = "" if coordinates is None else f"-{coordinates[0]}-{coordinates[1]}"
+    # the day of the prayer times, fajr or isha may fall on the day before or after
+    day = prayer_times.date
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{day:%Y%m%d}-{prayer.name.lower()}{location}@adhanpy",
+        f"DTSTAMP:{_utc(stamp or datetime.now(timezone.utc))}",
+        f"DTSTART{_start(prayer_times, time)}",
+        f"DURATION:PT{duration}M",
+        f"SUMMARY:{title}",
+        "TRANSP:TRANSPARENT",
+    ]
+    if alarm is not None:
+        lines += [
+            "BEGIN:VALARM",
+            "ACTION:DISPLAY",
+            f"DESCRIPTION:{title}",
+            f"TRIGGER:-PT{alarm}M",
+            "END:VALARM",
+        ]
+    lines.append("END:VEVENT")
+    return lines
+
+
+def vtimezone(time_zone: ZoneInfo, start: datetime, end: datetime) -> list[str]:
+    """
+    Content lines of a VTIMEZONE with the UTC offsets of time_zone from start to
+    end, one observance per offset change found in the time zone
+    """
+    first = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    last = datetime(end.year, end.month, end.day, tzinfo=timezone.utc)
+
+    initial = first.astimezone(time_zone)
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{time_zone}"]
+    lines += _observance(initial, initial.utcoffset())
+
+    before = initial
+    day = first
+    while day < last:
+        day += timedelta(days=1)
+        after = day.astimezone(time_zone)
+        if after.utcoffset() != before.utcoffset():
+            change = _change(time_zone, day - timedelta(days=1), day)
+            lines += _observance(change, before.utcoffset())
+        before = after
+
+    lines.append("END:VTIMEZONE")
+    return lines
+
+
+def escape(text: str) -> str:
+    """Escape TEXT value characters of RFC 5545"""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Fold a content line longer than 75 octets as RFC 5545 requires"""
+    if len(line.encode()) <= _LINE_LENGTH:
+        return line
+    parts: list[str] = []
+    current = ""
+    size = 0
+    for character in line:
+        length = len(character.encode())
+        # continuation lines start with a space which counts in their length
+        if size + length > _LINE_LENGTH - (1 if parts else 0):
+            parts.append(current)
+            current = ""
+            size = 0
+        current += character
+        size += length
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def _write(file: TextIO, lines: Iterable[str]) -> None:
+    file.write("".join(fold(line) + "\r\n" for line in lines))
+
+
+def _change(time_zone: ZoneInfo, low: datetime, high: datetime) -> datetime:
+    # the first minute in the new offset, offsets change on whole minutes
+    offset = low.astimezone(time_zone).utcoffset()
+    while high - low > timedelta(minutes=1):
+        middle = low + (high - low) / 2
+        middle -= timedelta(seconds=middle.second, microseconds=middle.microsecond)
+        if middle.astimezone(time_zone).utcoffset() == offset:
+            low = middle
+        else:
+            high = middle
+    return high.astimezone(time_zone)
+
+
+def _observance(onset: datetime, offset_from: Optional[timedelta]) -> list[str]:
+    # onset is in the time zone, DTSTART is its local time in the offset before it
+    wall = onset.astimezone(timezone.utc) + (offset_from or timedelta())
+    return [
+        f"BEGIN:{'DAYLIGHT' if onset.dst() else 'STANDARD'}",
+        f"DTSTART:{_local(wall)}",
+        f"TZOFFSETFROM:{_offset(offset_from)}",
+        f"TZOFFSETTO:{_offset(onset.utcoffset())}",
+        f"TZNAME:{escape(onset.tzname() or '')}",
+        f"END:{'DAYLIGHT' if onset.dst() else 'STANDARD'}",
+    ]
+
+
+def _offset(offset: Optional[timedelta]) -> str:
+    minutes = 0 if offset is None else int(offset.total_seconds() // 60)
+    sign = "-" if minutes < 0 else "+"
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{sign}{hours:02d}{minutes:02d}"
+
+
+def _local(time: datetime) -> str:
+    return (
+        f"{time.year:04d}{time.month:02d}{time.day:02d}"
+        f"T{time.hour:02d}{time.minute:02d}{time.second:02d}"
+    )
+
+
+def _utc(time: datetime) -> str:
+    return _local(time.astimezone(timezone.utc)) + "Z"
+
+
+def _start(prayer_times: PrayerTimes, time: datetime) -> str:
+    if prayer_times.time_zone is None:
+        return f":{_utc(time)}"
+    return f";TZID={prayer_times.time_zone}:{_local(time)}"
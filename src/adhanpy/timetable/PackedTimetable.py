@@ -0,0 +1,167 @@
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Union
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.data.Prayer import PRAYERS, Prayer
+
+MAGIC = b"ADHT"
+VERSION = 1
+
+# magic, version, prayers per day, reserved, base date ordinal, number of days
+_HEADER = struct.Struct("<4sBBHII")
+# UTC offset in minutes of each day
+_OFFSET = struct.Struct("<h")
+# minutes since the local midnight of each prayer of a day, signed as prayer times
+# kept in UTC can fall on the previous UTC day (e.g. fajr east of Greenwich)
+_RECORD = struct.Struct(f"<{len(PRAYERS)}h")
+
+
+def encode_timetable(calendar: Iterable[PrayerTimes]) -> bytes:
+    """
+    Pack PrayerTimes of consecutive days into a fixed width buffer:
+        header (16 bytes): magic, version, prayers per day, base date, number of days
+        offsets (2 bytes per day): UTC offset in minutes of the day, at dhuhr
+        records (12 bytes per day): minutes of fajr, sunrise, dhuhr, asr, maghrib and
+            isha since the local midnight of the day, 6 int16
+    All integers are little endian.
+    """
+    offsets = array("h")
+    records = array("h")
+    base_date = None
+
+    for prayer_times in calendar:
+        day = prayer_times.date
+        if base_date is None:
+            base_date = day
+        elif day != base_date + timedelta(days=len(offsets)):
+            raise ValueError(f"Calendar is not made of consecutive days at {day}.")
+
+        offset, minutes = encode_day(prayer_times)
+        records.extend(minutes)
+        offsets.append(offset)
+
+    if base_date is None:
+        raise ValueError("Calendar is empty.")
+
+    if sys.byteorder == "big":
+        offsets.byteswap()
+        records.byteswap()
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(PRAYERS), 0, base_date.toordinal(), len(offsets)
+    )
+    return header + offsets.tobytes() + records.tobytes()
+
+
+def encode_day(prayer_times: PrayerTimes) -> tuple[int, tuple[int, ...]]:
+    """
+    Returns:
+        UTC offset in minutes of the day at dhuhr, and the minutes of each prayer
+        of PRAYERS since the local midnight of the day
+    """
+    day = prayer_times.date
+    utc_offset = prayer_times.dhuhr.utcoffset()
+    offset = 0 if utc_offset is None else int(utc_offset.total_seconds() // 60)
+    local_midnight = datetime(
+        day.year, day.month, day.day, tzinfo=timezone.utc
+    ) - timedelta(minutes=offset)
+
+    minutes = []
+    for prayer in PRAYERS:
+        when = getattr(prayer_times, prayer.name.lower())
+        value = int((when - local_midnight).total_seconds() // 60)
+        if not -0x8000 <= value <= 0x7FFF:
+            raise ValueError(
+                f"{prayer.name.lower()} on {day} cannot be encoded as minutes of the day."
+            )
+        minutes.append(value)
+    return offset, tuple(minutes)
+
+
+class PackedTimetable:
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        Read access to a buffer created by encode_timetable, the buffer is not
+        copied (it can be a mmap) and any day can be read without decoding the others.
+        """
+        self._view = memoryview(buffer)
+        if len(self._view) < _HEADER.size:
+            raise ValueError("Buffer is too small for a packed timetable.")
+
+        magic, version, prayers, _, ordinal, days = _HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION or prayers != len(PRAYERS):
+            raise ValueError("Buffer is not a packed timetable.")
+
+        self.base_date = date.fromordinal(ordinal)
+        self.days = days
+        self._offsets_start = _HEADER.size
+        self._records_start = self._offsets_start + days * _OFFSET.size
+        if len(self._view) < self._records_start + days * _RECORD.size:
+            raise ValueError("Buffer is truncated.")
+
+    def __len__(self) -> int:
+        return self.days
+
+    def index(self, day: date) -> int:
+        index = (day - self.base_date).days
+        if not 0 <= index < self.days:
+            raise IndexError(f"{day} is not in the timetable.")
+        return index
+
+    def date(self, index: int) -> date:
+        return self.base_date + timedelta(days=self._check(index))
+
+    def utc_offset(self, index: int) -> int:
+        """UTC offset in minutes of the day at index"""
+        return _OFFSET.unpack_from(
+            self._view, self._offsets_start + self._check(index) * _OFFSET.size
+        )[0]
+
+    def minutes(self, index: int) -> tuple[int, ...]:
+        """Minutes since the local midnight of each prayer of the day at index"""
+        return _RECORD.unpack_from(
+            self._view, self._records_start + self._check(index) * _RECORD.size
+        )
+
+    def times(self, index: int) -> tuple[datetime, ...]:
+        """Datetimes of each prayer of the day at index, in the UTC offset of the day"""
+        day = self.date(index)
+        local_midnight = datetime(
+            day.year,
+            day.month,
+            day.day,
+            tzinfo=timezone(timedelta(minutes=self.utc_offset(index))),
+        )
+        return tuple(
+            local_midnight + timedelta(minutes=minutes)
+            for minutes in self.minutes(index)
+        )
+
+    def __getitem__(self, index: int) -> tuple[datetime, ...]:
+        return self.times(index)
+
+    def patched(self, updates: Iterable[tuple[int, int, int]]) -> bytes:
+        """
+        Copy of the buffer with the given (day index, prayer position in PRAYERS,
+        minutes since the local midnight) updates applied
+        """
+        buffer = bytearray(self._view)
+        for index, position, minutes in updates:
+            if not 0 <= position < len(PRAYERS):
+                raise IndexError("Prayer position out of range.")
+            struct.pack_into(
+                "<h",
+                buffer,
+                self._records_start + self._check(index) * _RECORD.size + position * 2,
+                minutes,
+            )
+        return bytes(buffer)
+
+    def _check(self, index: int) -> int:
+        if index < 0:
+            index += self.days
+        if not 0 <= index < self.days:
+            raise IndexError("Timetable index out of range.")
+        return index
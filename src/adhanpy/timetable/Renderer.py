@@ -0,0 +1,191 @@
+import calendar
+import csv
+import html
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
+from typing import Callable, Iterable, Iterator, Optional, Sequence, TextIO, Union
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.data.Prayer import MINUTES_PER_DAY, PRAYERS, Prayer
+from adhanpy.timetable.PackedTimetable import PackedTimetable
+
+
+@dataclass(frozen=True)
+class TimetableDay:
+    date: date
+    # UTC offset in minutes of the day
+    utc_offset: int
+    # minutes since the local midnight of each prayer of PRAYERS
+    minutes: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    A column of a timetable: its title and the text of a day, given the day and
+    the formatted times indexed by minute of the day. The times are escaped for
+    JSON and HTML output, a column only picking from them is marked escaped so
+    that its text is not escaped again.
+    """
+
+    title: str
+    render: Callable[[TimetableDay, Sequence[str]], str]
+    escaped: bool = False
+
+
+@lru_cache(maxsize=16)
+def time_table(time_format: str = "%H:%M") -> tuple[str, ...]:
+    """Each minute of the day formatted with strftime, formatted once per format"""
+    if time_format == "%H:%M":
+        return tuple(
+            f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(60)
+        )
+    midnight = datetime(2000, 1, 1)
+    return tuple(
+        (midnight + timedelta(minutes=minute)).strftime(time_format)
+        for minute in range(MINUTES_PER_DAY)
+    )
+
+
+def prayer_column(prayer: Prayer, title: Optional[str] = None) -> Column:
+    """Time of the prayer, as the clock shows it when it falls on another day"""
+    position = PRAYERS.index(prayer)
+    return Column(
+        prayer.name.capitalize() if title is None else title,
+        lambda day, times: times[day.minutes[position] % MINUTES_PER_DAY],
+        escaped=True,
+    )
+
+
+def date_column(title: str = "Date", date_format: Optional[str] = None) -> Column:
+    """Date of the day, ISO 8601 unless a strftime date_format is given"""
+    if date_format is None:
+        return Column(title, lambda day, times: day.date.isoformat())
+    return Column(title, lambda day, times: day.date.strftime(date_format))
+
+
+DEFAULT_COLUMNS = (date_column(), *(prayer_column(prayer) for prayer in PRAYERS))
+
+
+def timetable_days(
+    source: Union[PackedTimetable, Iterable[Union[PrayerTimes, TimetableDay]]]
+) -> Iterator[TimetableDay]:
+    """
+    Days of a PackedTimetable, of PrayerTimes or TimetableDay as they are. The
+    minutes of PrayerTimes follow the clock of each prayer, where those of a
+    PackedTimetable use the UTC offset of the day at dhuhr.
+    """
+    if isinstance(source, PackedTimetable):
+        for index in range(len(source)):
+            yield TimetableDay(
+                source.date(index), source.utc_offset(index), source.minutes(index)
+            )
+        return
+
+    for day in source:
+        if isinstance(day, TimetableDay):
+            yield day
+            continue
+
+        # the clock time of each prayer, as strftime shows it, without datetime
+        # arithmetic
+        ordinal = day.date.toordinal()
+        utc_offset = day.dhuhr.utcoffset()
+        yield TimetableDay(
+            day.date,
+            0 if utc_offset is None else int(utc_offset.total_seconds() // 60),
+            tuple(
+                (time.toordinal() - ordinal) * MINUTES_PER_DAY
+                + time.hour * 60
+                + time.minute
+                for time in (
+                    day.fajr,
+                    day.sunrise,
+                    day.dhuhr,
+                    day.asr,
+                    day.maghrib,
+                    day.isha,
+                )
+            ),
+        )
+
+
+def rows(
+    source: Union[PackedTimetable, Iterable[Union[PrayerTimes, TimetableDay]]],
+    columns: Sequence[Column] = DEFAULT_COLUMNS,
+    time_format: str = "%H:%M",
+    times: Optional[Sequence[str]] = None,
+) -> Iterator[list[str]]:
+    """Text of the columns of each day"""
+    times = time_table(time_format) if times is None else times
+    renders = [column.render for column in columns]
+    for day in timetable_days(source):
+        yield [render(day, times) for render in renders]
+
+
+def write_csv(
+    file: TextIO,
+    source: Union[PackedTimetable, Iterable[Union[PrayerTimes, TimetableDay]]],
+    columns: Sequence[Column] = DEFAULT_COLUMNS,
+    time_format: str = "%H:%M",
+) -> None:
+    """Write the timetable as CSV with a header row, one day at a time"""
+    writer = csv.writer(file)
+    writer.writerow([column.title for column in columns])
+    writer.writerows(rows(source, columns, time_format))
+
+
+def write_json(
+    file: TextIO,
+    source: Union[PackedTimetable, Iterable[Union[PrayerTimes, TimetableDay]]],
+    columns: Sequence[Column] = DEFAULT_COLUMNS,
+    time_format: str = "%H:%M",
+) -> None:
+    """Write the timetable as a JSON array of objects keyed by column title, one day at a time"""
+    keys = [json.dumps(column.title) + ": " for column in columns]
+    times = tuple(json.dumps(time) for time in time_table(time_format))
+    # the times are escaped once, other columns for each day
+    escaped = [_escaped(column, json.dumps) for column in columns]
+
+    file.write("[")
+    separator = "\n"
+    for row in rows(source, escaped, times=times):
+        file.write(separator)
+        file.write("{" + ", ".join(key + value for key, value in zip(keys, row)) + "}")
+        separator = ",\n"
+    file.write("\n]\n")
+
+
+def write_html(
+    file: TextIO,
+    source: Union[PackedTimetable, Iterable[Union[PrayerTimes, TimetableDay]]],
+    columns: Sequence[Column] = DEFAULT_COLUMNS,
+    time_format: str = "%H:%M",
+) -> None:
+    """Write the timetable as an HTML table per month, captioned with the month and year"""
+    header = "".join(f"<th>{html.escape(column.title)}</th>" for column in columns)
+    times = tuple(html.escape(time) for time in time_table(time_format))
+    escaped = [_escaped(column, html.escape) for column in columns]
+
+    for (year, month), days in groupby(
+        timetable_days(source), lambda day: (day.date.year, day.date.month)
+    ):
+        file.write(
+            f"<table>\n<caption>{calendar.month_name[month]} {year}</caption>\n"
+            f"<thead><tr>{header}</tr></thead>\n<tbody>\n"
+        )
+        for row in rows(days, escaped, times=times):
+            file.write("<tr><td>" + "</td><td>".join(row) + "</td></tr>\n")
+        file.write("</tbody>\n</table>\n")
+
+
+def _escaped(column: Column, escape: Callable[[str], str]) -> Column:
+    if column.escaped:
+        return column
+    return Column(
+        column.title,
+        lambda day, times: escape(column.render(day, times)),
+        escaped=True,
+    )
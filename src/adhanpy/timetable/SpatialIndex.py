@@ -0,0 +1,171 @@
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Optional, Sequence
+from adhanpy.timetable.TimetableDatabase import TimetableDatabase
+
+# mean radius of the earth in km
+EARTH_RADIUS = 6371.0088
+
+# largest declination of the sun, in degrees
+_MAX_DECLINATION = 23.44
+
+
+@dataclass(frozen=True)
+class NearestLocation:
+    # position of the location in the indexed sequence (city id of a database)
+    index: int
+    # great circle distance in km
+    distance: float
+    # estimated difference in seconds between the prayer times of the location
+    # and of the coordinates looked up, inf where it cannot be estimated
+    estimated_error: float
+
+
+def haversine(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Great circle distance in km between two (latitude, longitude) in degrees"""
+    φ1, φ2 = math.radians(a[0]), math.radians(b[0])
+    Δφ = φ2 - φ1
+    Δλ = math.radians(b[1] - a[1])
+    h = math.sin(Δφ / 2) ** 2 + math.cos(φ1) * math.cos(φ2) * math.sin(Δλ / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(h)))
+
+
+def estimated_time_error(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """
+    Estimate in seconds of the largest difference over a year between the
+    sunrise and sunset of two nearby locations: 4 minutes per degree of longitude
+    plus the change of the hour angle of sunrise with the latitude at the
+    solstices. Prayers defined by twilight angles can differ more at high latitudes.
+    """
+    Δλ = abs(b[1] - a[1]) % 360
+    Δλ = min(Δλ, 360 - Δλ)
+    φ = math.radians(max(abs(a[0]), abs(b[0])))
+    tan_δ = math.tan(math.radians(_MAX_DECLINATION))
+
+    # cos(H) = -tan(φ) tan(δ), so dH/dφ = tan(δ) / (cos²(φ) sin(H))
+    cos_H = math.tan(φ) * tan_δ
+    if cos_H >= 1:
+        return math.inf
+    dH_dφ = tan_δ / (math.cos(φ) ** 2 * math.sqrt(1 - cos_H**2))
+
+    return 240 * (Δλ + abs(b[0] - a[0]) * dH_dφ)
+
+
+class SpatialIndex:
+    def __init__(self, locations: Sequence[tuple[float, float]]) -> None:
+        """
+        KD-tree over (latitude, longitude) locations, e.g. precomputed cities or
+        mosques, built on their positions on the unit sphere so that distances
+        do not depend on the latitude nor wrap at the antimeridian.
+        """
+        self.locations = [(float(φ), float(λ)) for φ, λ in locations]
+        self._points = array("d")
+        for φ, λ in self.locations:
+            self._points.extend(_unit_vector(φ, λ))
+
+        # the tree is implicit: the median of each range of _order splits it on
+        # the axis of its depth, x, y and z in turn
+        self._order = array("l", range(len(self.locations)))
+        self._build(0, len(self._order), 0)
+
+    @classmethod
+    def from_database(cls, database: TimetableDatabase) -> "SpatialIndex":
+        """Index of the cities of a database, the indexes are the city ids"""
+        return cls(
+            [
+                (city.latitude, city.longitude)
+                for city in map(database.city, range(len(database)))
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def nearest(
+        self, coordinates: tuple[float, float], radius: float = math.inf
+    ) -> Optional[NearestLocation]:
+        """Nearest location within radius km of coordinates, None if there is none"""
+        found = self._search(coordinates, radius, 1)
+        return found[0] if found else None
+
+    def within(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> list[NearestLocation]:
+        """Locations within radius km of coordinates, nearest first"""
+        return self._search(coordinates, radius, len(self.locations))
+
+    def _search(
+        self, coordinates: tuple[float, float], radius: float, count: int
+    ) -> list[NearestLocation]:
+        target = _unit_vector(*coordinates)
+        # squared chord between points on the unit sphere radius km apart
+        bound = 4.0 if radius >= math.pi * EARTH_RADIUS else _chord2(radius)
+        points = self._points
+        order = self._order
+        # (squared chord, index) of the locations found, sorted
+        found: list[tuple[float, int]] = []
+
+        def visit(start: int, end: int, axis: int) -> None:
+            nonlocal bound
+            if start >= end:
+                return
+
+            middle = (start + end) // 2
+            index = order[middle]
+            offset = 3 * index
+            d2 = (
+                (points[offset] - target[0]) ** 2
+                + (points[offset + 1] - target[1]) ** 2
+                + (points[offset + 2] - target[2]) ** 2
+            )
+            if d2 <= bound:
+                found.append((d2, index))
+                if len(found) >= count:
+                    found.sort()
+                    del found[count:]
+                    bound = found[-1][0]
+
+            delta = target[axis] - points[offset + axis]
+            near, far = (
+                ((middle + 1, end), (start, middle))
+                if delta > 0
+                else ((start, middle), (middle + 1, end))
+            )
+            visit(*near, (axis + 1) % 3)
+            if delta * delta <= bound:
+                visit(*far, (axis + 1) % 3)
+
+        visit(0, len(order), 0)
+
+        found.sort()
+        return [
+            NearestLocation(
+                index,
+                2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(d2) / 2)),
+                estimated_time_error(coordinates, self.locations[index]),
+            )
+            for d2, index in found
+        ]
+
+    def _build(self, start: int, end: int, axis: int) -> None:
+        if end - start <= 1:
+            return
+
+        points = self._points
+        ranged = sorted(
+            self._order[start:end], key=lambda index: points[3 * index + axis]
+        )
+        self._order[start:end] = array("l", ranged)
+        middle = (start + end) // 2
+        self._build(start, middle, (axis + 1) % 3)
+        self._build(middle + 1, end, (axis + 1) % 3)
+
+
+def _unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    φ, λ = math.radians(latitude), math.radians(longitude)
+    return (math.cos(φ) * math.cos(λ), math.cos(φ) * math.sin(λ), math.sin(φ))
+
+
+def _chord2(distance: float) -> float:
+    return (2 * math.sin(distance / (2 * EARTH_RADIUS))) ** 2
@@ -0,0 +1,229 @@
+import mmap
+import struct
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Prayer import PRAYERS
+from adhanpy.timetable.PackedTimetable import encode_day
+
+MAGIC = b"ADHD"
+VERSION = 1
+
+# minutes stored for the days prayer times cannot be calculated at a location
+MISSING = -0x8000
+
+# magic, version, prayers per day, reserved, base date ordinal, number of days,
+# number of cities, offset of the records
+_HEADER = struct.Struct("<4sBBHIIII")
+# latitude, longitude, offset of the name and time zone in the strings, length of
+# the name, length of the time zone
+_CITY = struct.Struct("<ddIHH")
+# UTC offset in minutes then minutes since the local midnight of each prayer
+_RECORD = struct.Struct(f"<h{len(PRAYERS)}h")
+# records start on a page boundary so that a day of all cities is paged in together
+_ALIGNMENT = 4096
+
+
+@dataclass(frozen=True)
+class City:
+    name: str
+    latitude: float
+    longitude: float
+    # IANA time zone of the times stored, None for UTC
+    time_zone: Optional[str] = None
+
+
+def build_database(
+    path: str,
+    cities: Iterable[City],
+    start: date,
+    days: int,
+    calculation_parameters: CalculationParameters,
+) -> None:
+    """
+    Compute the prayer times of cities for days from start and write them to a
+    single file read by TimetableDatabase:
+        header (24 bytes): magic, version, prayers per day, base date, number of
+            days, number of cities, offset of the records
+        index (24 bytes per city): latitude, longitude, position and lengths of
+            the city name and time zone in the strings
+        strings: UTF-8 names and time zones of the cities
+        records (14 bytes per city per day), day by day from the first page
+            boundary after the strings: UTC offset in minutes and minutes of
+            fajr, sunrise, dhuhr, asr, maghrib and isha since the local midnight,
+            7 int16
+    All integers are little endian. The solar coordinates of a day are computed
+    once for all the cities.
+    """
+    cities = list(cities)
+    if not cities:
+        raise ValueError("No cities to build the database from.")
+    if days < 1:
+        raise ValueError("days must be at least 1.")
+
+    index = bytearray()
+    strings = bytearray()
+    for city in cities:
+        name = city.name.encode()
+        zone = (city.time_zone or "").encode()
+        index += _CITY.pack(
+            city.latitude, city.longitude, len(strings), len(name), len(zone)
+        )
+        strings += name + zone
+
+    records_start = _HEADER.size + len(index) + len(strings)
+    records_start += -records_start % _ALIGNMENT
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(PRAYERS),
+        0,
+        start.toordinal(),
+        days,
+        len(cities),
+        records_start,
+    )
+    time_zones = [
+        None if city.time_zone is None else ZoneInfo(city.time_zone) for city in cities
+    ]
+
+    with open(path, "wb") as file:
+        file.write(header + index + strings)
+        file.write(bytes(records_start - file.tell()))
+
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            when = datetime(day.year, day.month, day.day)
+            solar_coordinates = solar_coordinates_for(when)
+            records = bytearray()
+            for city, time_zone in zip(cities, time_zones):
+                try:
+                    prayer_times = PrayerTimes(
+                        (city.latitude, city.longitude),
+                        when,
+                        calculation_parameters=calculation_parameters,
+                        time_zone=time_zone,
+                        solar_coordinates=solar_coordinates,
+                    )
+                except (RuntimeError, ValueError):
+                    records += _RECORD.pack(0, *(MISSING for _ in PRAYERS))
+                    continue
+                utc_offset, minutes = encode_day(prayer_times)
+                records += _RECORD.pack(utc_offset, *minutes)
+            file.write(records)
+
+
+class TimetableDatabase:
+    def __init__(self, path: str) -> None:
+        """
+        Memory map a file written by build_database, opening it only reads the
+        header: the times of a city on a day are read from their fixed position
+        and the pages of the file are shared by all the processes mapping it.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._mmap) < _HEADER.size:
+                raise ValueError("File is too small for a timetable database.")
+
+            (
+                magic,
+                version,
+                prayers,
+                _,
+                ordinal,
+                self.days,
+                self.cities,
+                self._records_start,
+            ) = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC or version != VERSION or prayers != len(PRAYERS):
+                raise ValueError("File is not a timetable database.")
+            if len(self._mmap) < self._records_start + (
+                self.days * self.cities * _RECORD.size
+            ):
+                raise ValueError("File is truncated.")
+        except ValueError:
+            self._mmap.close()
+            raise
+
+        self.base_date = date.fromordinal(ordinal)
+        self._strings_start = _HEADER.size + self.cities * _CITY.size
+        self._ids: Optional[dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.cities
+
+    def city(self, city_id: int) -> City:
+        latitude, longitude, start, name_length, time_zone_length = _CITY.unpack_from(
+            self._mmap, _HEADER.size + self._check(city_id) * _CITY.size
+        )
+        start += self._strings_start
+        name = self._mmap[start : start + name_length].decode()
+        start += name_length
+        time_zone = self._mmap[start : start + time_zone_length].decode()
+        return City(name, latitude, longitude, time_zone or None)
+
+    def city_id(self, name: str) -> int:
+        """Id of the first city with this name, the name index is built on first use"""
+        if self._ids is None:
+            self._ids = {}
+            for city_id in reversed(range(self.cities)):
+                self._ids[self.city(city_id).name] = city_id
+        try:
+            return self._ids[name]
+        except KeyError:
+            raise KeyError(f"{name} is not in the database.") from None
+
+    def utc_offset(self, city_id: int, day: date) -> int:
+        """UTC offset in minutes of the city on the day"""
+        return self._record(city_id, day)[0]
+
+    def minutes(self, city_id: int, day: date) -> tuple[int, ...]:
+        """Minutes since the local midnight of each prayer of PRAYERS"""
+        return self._record(city_id, day)[1:]
+
+    def times(self, city_id: int, day: date) -> tuple[datetime, ...]:
+        """Datetimes of each prayer of PRAYERS, in the UTC offset of the city on the day"""
+        utc_offset, *minutes = self._record(city_id, day)
+        local_midnight = datetime(
+            day.year,
+            day.month,
+            day.day,
+            tzinfo=timezone(timedelta(minutes=utc_offset)),
+        )
+        return tuple(local_midnight + timedelta(minutes=value) for value in minutes)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "TimetableDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _record(self, city_id: int, day: date) -> tuple[int, ...]:
+        index = (day - self.base_date).days
+        if not 0 <= index < self.days:
+            raise IndexError(f"{day} is not in the database.")
+
+        record = _RECORD.unpack_from(
+            self._mmap,
+            self._records_start
+            + (index * self.cities + self._check(city_id)) * _RECORD.size,
+        )
+        if record[1] == MISSING:
+            raise ValueError(
+                f"Prayer times of {self.city(city_id).name} on {day} could not be calculated."
+            )
+        return record
+
+    def _check(self, city_id: int) -> int:
+        if not 0 <= city_id < self.cities:
+            raise IndexError("City id out of range.")
+        return city_id
@@ -0,0 +1,145 @@
+import struct
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, Union
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.data.Prayer import PRAYERS, Prayer
+from adhanpy.timetable.PackedTimetable import PackedTimetable, encode_timetable
+
+MAGIC = b"ADHC"
+VERSION = 1
+
+# magic, version, base date ordinal, number of changes
+_HEADER = struct.Struct("<4sBII")
+# days since the base date, prayer, minutes since the local midnight
+_CHANGE = struct.Struct("<HBh")
+# ranges of the "H" day and "h" minutes fields of a change
+_MAX_DAYS = 0xFFFF
+_MIN_MINUTES, _MAX_MINUTES = -0x8000, 0x7FFF
+
+
+@dataclass(frozen=True)
+class TimetableChange:
+    day: date
+    prayer: Prayer
+    # minutes since the local midnight of the day, as in PackedTimetable
+    minutes: int
+
+
+def diff_timetables(
+    old: Union[PackedTimetable, Iterable[PrayerTimes]],
+    new: Union[PackedTimetable, Iterable[PrayerTimes]],
+) -> list[TimetableChange]:
+    """
+    Changes turning the old timetable into the new one, both timetables (or
+    calendars of PrayerTimes) must cover the same days with the same UTC offsets.
+    """
+    old, new = _timetable(old), _timetable(new)
+    if old.base_date != new.base_date or len(old) != len(new):
+        raise ValueError("Timetables do not cover the same days.")
+
+    changes: list[TimetableChange] = []
+    for index in range(len(old)):
+        if old.utc_offset(index) != new.utc_offset(index):
+            raise ValueError(f"UTC offsets differ on {old.date(index)}.")
+
+        old_minutes, new_minutes = old.minutes(index), new.minutes(index)
+        if old_minutes == new_minutes:
+            continue
+
+        day = old.date(index)
+        changes.extend(
+            TimetableChange(day, prayer, minutes)
+            for prayer, previous, minutes in zip(PRAYERS, old_minutes, new_minutes)
+            if previous != minutes
+        )
+    return changes
+
+
+def shift_changes(
+    timetable: PackedTimetable, prayer: Prayer, minutes: int
+) -> list[TimetableChange]:
+    """
+    Changes for an adjustment of a prayer by a number of minutes, no need to
+    recompute the prayer times as the times are already rounded to the minute.
+    """
+    if minutes == 0:
+        return []
+
+    position = PRAYERS.index(prayer)
+    changes = []
+    for index in range(len(timetable)):
+        day = timetable.date(index)
+        shifted = timetable.minutes(index)[position] + minutes
+        _check_minutes(day, prayer, shifted)
+        changes.append(TimetableChange(day, prayer, shifted))
+    return changes
+
+
+def apply_changes(
+    timetable: PackedTimetable, changes: Iterable[TimetableChange]
+) -> bytes:
+    """Return the buffer of the timetable with the changes applied"""
+    return timetable.patched(
+        (timetable.index(change.day), PRAYERS.index(change.prayer), change.minutes)
+        for change in changes
+    )
+
+
+def encode_changes(changes: Iterable[TimetableChange]) -> bytes:
+    """
+    Pack changes into a stream of 5 bytes per change after a 13 bytes header,
+    days are stored relative to the earliest day changed.
+    """
+    changes = list(changes)
+    base_date = min((change.day for change in changes), default=date.min)
+
+    stream = bytearray(
+        _HEADER.pack(MAGIC, VERSION, base_date.toordinal(), len(changes))
+    )
+    for change in changes:
+        days = (change.day - base_date).days
+        if days > _MAX_DAYS:
+            raise ValueError(
+                f"Change on {change.day} is more than {_MAX_DAYS} days after "
+                f"the earliest change on {base_date}."
+            )
+        _check_minutes(change.day, change.prayer, change.minutes)
+        stream += _CHANGE.pack(days, change.prayer.value, change.minutes)
+    return bytes(stream)
+
+
+def decode_changes(
+    buffer: Union[bytes, bytearray, memoryview]
+) -> list[TimetableChange]:
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        raise ValueError("Buffer is too small for a change stream.")
+
+    magic, version, ordinal, count = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Buffer is not a change stream.")
+    if len(view) < _HEADER.size + count * _CHANGE.size:
+        raise ValueError("Buffer is truncated.")
+
+    base_date = date.fromordinal(ordinal)
+    return [
+        TimetableChange(base_date + timedelta(days=days), Prayer(prayer), minutes)
+        for days, prayer, minutes in _CHANGE.iter_unpack(
+            view[_HEADER.size : _HEADER.size + count * _CHANGE.size]
+        )
+    ]
+
+
+def _check_minutes(day: date, prayer: Prayer, minutes: int) -> None:
+    if not _MIN_MINUTES <= minutes <= _MAX_MINUTES:
+        raise ValueError(
+            f"{prayer.name.lower()} on {day} is {minutes} minutes from the local "
+            f"midnight, outside {_MIN_MINUTES} to {_MAX_MINUTES}."
+        )
+
+
+def _timetable(value: Union[PackedTimetable, Iterable[PrayerTimes]]) -> PackedTimetable:
+    if isinstance(value, PackedTimetable):
+        return value
+    return PackedTimetable(encode_timetable(value))
@@ -1,9 +1,11 @@
+import math
 import pytest
 import adhanpy.astronomy.Astronomical as Astronomical
 import adhanpy.util.FloatUtil as FloatUtil
 import adhanpy.astronomy.CalendricalHelper as CalendricalHelper
 from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
 from adhanpy.data.Coordinates import Coordinates
+from adhanpy.data.Observer import Observer
 
 
 def test_solar_coordinates():
@@ -123,3 +125,31 @@ def test_angle_interpolation():
 
     i2 = Astronomical.interpolate_angles(1, 359, 3, 0.6)
     assert i2 == pytest.approx(2.2, abs=1e-6)
+
+
+@pytest.mark.parametrize("latitude", [-65.5, 0.0, 42.3333, 71.2])
+def test_corrected_hour_angle_with_observer_is_identical(latitude):
+    arguments = (0.81965, 177.74208, 40.68021, 41.73129, 42.78204)
+    declinations = (18.44092, 18.04761, 18.82742)
+
+    for altitude in (-0.8333, -18.0, 30.0):
+        for after_transit in (False, True):
+            expected = Astronomical.corrected_hour_angle(
+                arguments[0],
+                altitude,
+                Coordinates(latitude, 71.0833),
+                after_transit,
+                *arguments[1:],
+                *declinations,
+            )
+            actual = Astronomical.corrected_hour_angle(
+                arguments[0],
+                altitude,
+                Observer(latitude, 71.0833),
+                after_transit,
+                *arguments[1:],
+                *declinations,
+                math.sin(math.radians(declinations[0])),
+                math.cos(math.radians(declinations[0])),
+            )
+            assert repr(actual) == repr(expected)
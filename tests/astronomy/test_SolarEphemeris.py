@@ -0,0 +1,97 @@
+import pytest
+from adhanpy.astronomy.Astronomical import altitude_of_celestial_body
+from adhanpy.astronomy.CalendricalHelper import julian_day
+from adhanpy.astronomy.SolarCoordinates import SolarCoordinates
+from adhanpy.astronomy.SolarEphemeris import SolarEphemeris, main
+from adhanpy.astronomy.SolarTime import SolarTime
+from adhanpy.data.Coordinates import Coordinates
+from adhanpy.util.DateComponents import DateComponents
+
+
+def test_max_deviation_from_solar_coordinates():
+    ephemeris = SolarEphemeris.for_years(2023, 2024)
+
+    deviations = ephemeris.max_deviation(step_days=0.5)
+
+    assert set(deviations) == {
+        "declination",
+        "right_ascension",
+        "apparent_sidereal_time",
+        "equation_of_time",
+    }
+    assert max(deviations.values()) < 1e-7
+
+
+def test_coordinates_at_fractional_julian_day():
+    ephemeris = SolarEphemeris(julian_day(2000, 1, 1), julian_day(2000, 3, 1))
+    jd = julian_day(2000, 2, 10, 14, 37)
+
+    coordinates = ephemeris.coordinates(jd)
+    solar = SolarCoordinates(jd)
+
+    assert coordinates.declination == pytest.approx(solar.declination, abs=1e-8)
+    assert coordinates.right_ascension == pytest.approx(solar.right_ascension, abs=1e-8)
+    assert coordinates.apparent_sidereal_time == pytest.approx(
+        solar.apparent_sidereal_time, abs=1e-7
+    )
+    assert coordinates.equation_of_time == pytest.approx(
+        solar.equation_of_time, abs=1e-7
+    )
+
+
+def test_solar_altitude():
+    ephemeris = SolarEphemeris.for_years(2015, 2015)
+    coordinates = Coordinates(35.7750, -78.6336)
+    jd = julian_day(2015, 7, 12, 14, 37)
+    solar = SolarCoordinates(jd)
+
+    expected = altitude_of_celestial_body(
+        coordinates.latitude,
+        solar.declination,
+        solar.apparent_sidereal_time + coordinates.longitude - solar.right_ascension,
+    )
+
+    assert ephemeris.solar_altitude(jd, coordinates) == pytest.approx(
+        expected, abs=1e-6
+    )
+
+
+def test_coordinates_can_be_used_by_solar_time():
+    ephemeris = SolarEphemeris.for_years(2015, 2015)
+    coordinates = Coordinates(35.7750, -78.6336)
+    date = DateComponents(2015, 7, 12)
+    jd = julian_day(date.year, date.month, date.day)
+
+    solar_time = SolarTime(
+        date,
+        coordinates,
+        tuple(ephemeris.coordinates(jd + offset) for offset in (-1, 0, 1)),
+    )
+
+    assert solar_time.sunrise == pytest.approx(
+        SolarTime(date, coordinates).sunrise, abs=1e-6
+    )
+
+
+def test_outside_of_range_raises_exception():
+    ephemeris = SolarEphemeris(100.5, 200.5)
+
+    with pytest.raises(ValueError, match="outside of the fitted range"):
+        ephemeris.declination(300.5)
+
+
+@pytest.mark.parametrize(
+    "start, end, segment_days, degree",
+    [(10, 5, 16, 10), (0, 10, 0, 10), (0, 10, 200, 10), (0, 10, 16, 0)],
+)
+def test_invalid_arguments(start, end, segment_days, degree):
+    with pytest.raises(ValueError):
+        SolarEphemeris(start, end, segment_days, degree)
+
+
+def test_fit_and_verify_tool(capsys):
+    main(["2020", "2020", "32", "8"])
+
+    output = capsys.readouterr().out
+    assert "12 segments of 32 days, degree 8" in output
+    assert "declination: max deviation" in output
@@ -0,0 +1,78 @@
+import pytest
+from datetime import datetime
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.astronomy.SolarTime import SolarTime
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.data.Observer import Observer
+from adhanpy.data.ShadowLength import ShadowLength
+
+
+def test_solar_events():
+    events = SolarEvents((35.7750, -78.6336), datetime(2015, 7, 12, 18))
+
+    assert events.date == datetime.fromisoformat("2015-07-12T00:00:00+00:00")
+    assert events.day_of_year == 193
+    assert events.observer == Observer(35.7750, -78.6336)
+    assert events.sunrise.isoformat() == "2015-07-12T10:07:51+00:00"
+    assert events.transit.isoformat() == "2015-07-12T17:20:10+00:00"
+    assert events.sunset.isoformat() == "2015-07-13T00:32:11+00:00"
+    assert events.sunrise < events.transit < events.sunset < events.tomorrow_sunrise
+    assert events.night_length == pytest.approx(
+        (events.tomorrow_sunrise - events.sunset).total_seconds() * 1000
+    )
+
+
+def test_hour_angles_are_computed_once(mocker):
+    events = SolarEvents((35.7750, -78.6336), datetime(2015, 7, 12))
+    hour_angle = mocker.spy(SolarTime, "hour_angle")
+    afternoon = mocker.spy(SolarTime, "afternoon")
+
+    fajr = events.hour_angle(-15, False)
+    asr = events.afternoon(ShadowLength(ShadowLength.SINGLE))
+
+    assert events.hour_angle(-15, False) is fajr
+    assert events.afternoon(ShadowLength(ShadowLength.SINGLE)) is asr
+    assert hour_angle.call_count == 2
+    assert afternoon.call_count == 1
+    assert fajr < events.sunrise
+    assert events.afternoon(ShadowLength(ShadowLength.DOUBLE)) > asr
+    assert events.hour_angle(-89, False) is None
+
+
+def test_shared_solar_coordinates():
+    date = datetime(2024, 3, 10)
+
+    shared = SolarEvents((51.5, -0.13), date, solar_coordinates_for(date))
+    alone = SolarEvents((51.5, -0.13), date)
+
+    assert (shared.sunrise, shared.transit, shared.sunset) == (
+        alone.sunrise,
+        alone.transit,
+        alone.sunset,
+    )
+    assert shared.night_length == alone.night_length
+
+
+def test_sun_not_setting():
+    with pytest.raises(RuntimeError):
+        SolarEvents((78.2, 15.6), datetime(2024, 6, 21))
+
+
+def test_precompute(mocker):
+    date = datetime(2024, 3, 10)
+    lazy = SolarEvents((51.5, -0.13), date)
+    events = SolarEvents((51.5, -0.13), date)
+
+    events.precompute([-18, -15, -18], [-17], [ShadowLength(ShadowLength.DOUBLE)])
+    hour_angle = mocker.spy(SolarTime, "hour_angle")
+    afternoon = mocker.spy(SolarTime, "afternoon")
+
+    assert events.hour_angle(-18, False) == lazy.hour_angle(-18, False)
+    assert events.hour_angle(-15, False) == lazy.hour_angle(-15, False)
+    assert events.hour_angle(-17, True) == lazy.hour_angle(-17, True)
+    assert events.afternoon(ShadowLength(ShadowLength.DOUBLE)) == lazy.afternoon(
+        ShadowLength(ShadowLength.DOUBLE)
+    )
+    # only the lazy events computed theirs, the afternoon is an hour angle too
+    assert hour_angle.call_count == 4
+    assert afternoon.call_count == 1
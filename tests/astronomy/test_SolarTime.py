@@ -2,7 +2,8 @@ from datetime import datetime, timezone, timedelta
 from adhanpy.data.Coordinates import Coordinates
 from adhanpy.util.DateComponents import DateComponents
 from adhanpy.util.TimeComponents import TimeComponents
-from adhanpy.astronomy.SolarTime import SolarTime
+import math
+from adhanpy.astronomy.SolarTime import SolarTime, hour_angles_for_dates, solar_times
 
 
 def test_solar_time():
@@ -59,6 +60,47 @@ def test_calendrical_date():
     assert _time_string(day2) == "16:14"
 
 
+def test_hour_angles_match_hour_angle():
+    coordinates = Coordinates(35 + 47.0 / 60.0, -78 - 39.0 / 60.0)
+    solar = SolarTime(DateComponents(2015, 7, 12), coordinates)
+    altitudes = [-6, -12, -15, -18, -19.5, -36, 10.5]
+
+    for after_transit in (False, True):
+        hours = solar.hour_angles(altitudes, after_transit)
+        expected = [solar.hour_angle(angle, after_transit) for angle in altitudes]
+
+        assert len(hours) == len(expected)
+        for hour, expected_hour in zip(hours, expected):
+            assert hour == expected_hour or (
+                math.isnan(hour) and math.isnan(expected_hour)
+            )
+
+
+def test_hour_angles_for_dates():
+    coordinates = Coordinates(51.5, -0.13)
+    altitudes = [-12, -15, -18]
+    days = 40
+
+    hours = hour_angles_for_dates(
+        DateComponents(2016, 12, 10), days, coordinates, altitudes, False
+    )
+
+    assert len(hours) == days
+    for offset, day_hours in enumerate(hours):
+        solar = SolarTime(_make_date_with_offset(2016, 12, 10, offset), coordinates)
+        assert day_hours == [solar.hour_angle(angle, False) for angle in altitudes]
+
+
+def test_solar_times_share_solar_coordinates():
+    coordinates = Coordinates(51.5, -0.13)
+
+    times = list(solar_times(DateComponents(2016, 2, 27), 4, coordinates))
+
+    assert times[0].next_solar is times[1].solar
+    assert times[1].prev_solar is times[0].solar
+    assert times[3].sunset == SolarTime(DateComponents(2016, 3, 1), coordinates).sunset
+
+
 def _make_date_with_offset(year: int, month: int, day: int, offset: int):
     date_time = datetime(year, month, day, tzinfo=timezone.utc)
 
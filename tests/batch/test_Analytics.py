@@ -0,0 +1,89 @@
+import pytest
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+from adhanpy.batch.Analytics import Extreme, Threshold, analyze
+from adhanpy.batch.ParallelCalendar import calendar
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Prayer import Prayer
+
+LONDON = (51.5, -0.13)
+MAKKAH = (21.42, 39.83)
+
+
+def _parameters():
+    return CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+
+def _minutes(when, day):
+    return (when.date() - day).days * 1440 + when.hour * 60 + when.minute
+
+
+def test_extremes_and_months_match_the_calendar():
+    zones = [ZoneInfo("Europe/London"), ZoneInfo("Asia/Riyadh")]
+    london, makkah = analyze(
+        [LONDON, MAKKAH], datetime(2024, 1, 1), 366, _parameters(), zones
+    )
+
+    for summary, zone in ((london, zones[0]), (makkah, zones[1])):
+        days = calendar(
+            summary.coordinates, datetime(2024, 1, 1), 366, _parameters(), zone
+        )
+        for prayer in (Prayer.FAJR, Prayer.ISHA):
+            values = [
+                (_minutes(getattr(day, prayer.name.lower()), day.date), day.date)
+                for day in days
+            ]
+            earliest = min(values, key=lambda value: value[0])
+            latest = max(values, key=lambda value: value[0])
+            result = summary.prayers[prayer]
+            assert result.earliest == Extreme(earliest[1], earliest[0])
+            assert result.latest == Extreme(latest[1], latest[0])
+            assert len(result.monthly) == 12
+            june = [value for value, day in values if day.month == 6]
+            assert result.monthly[5].month == 6
+            assert result.monthly[5].days == 30
+            assert result.monthly[5].mean == pytest.approx(sum(june) / 30)
+
+    assert london.failed_days == []
+    assert london.prayers[Prayer.DHUHR].earliest.clock.startswith("11:")
+
+
+def test_thresholds():
+    isha_after = Threshold(Prayer.ISHA, time(23, 0))
+    fajr_before = Threshold(Prayer.FAJR, time(3, 0), before=True)
+    (london,) = analyze(
+        [LONDON],
+        datetime(2024, 1, 1),
+        366,
+        _parameters(),
+        ZoneInfo("Europe/London"),
+        [isha_after, fajr_before],
+    )
+    days = calendar(
+        LONDON, datetime(2024, 1, 1), 366, _parameters(), ZoneInfo("Europe/London")
+    )
+
+    late_isha = london.thresholds[0]
+    assert late_isha.threshold == isha_after
+    assert late_isha.days == [
+        day.date for day in days if _minutes(day.isha, day.date) > 23 * 60
+    ]
+    assert late_isha.days
+    assert [past for _, past in late_isha.crossings] == [True, False]
+    assert late_isha.crossings[0][0] == late_isha.days[0]
+
+    early_fajr = london.thresholds[1]
+    assert early_fajr.days == [
+        day.date for day in days if _minutes(day.fajr, day.date) < 3 * 60
+    ]
+
+
+def test_failed_days_and_time_zones():
+    (pole,) = analyze([(89.0, 0.0)], datetime(2024, 6, 20), 3, _parameters())
+
+    assert len(pole.failed_days) == 3
+    assert pole.prayers == {}
+
+    with pytest.raises(ValueError):
+        analyze([LONDON, MAKKAH], datetime(2024, 1, 1), 1, _parameters(), [None])
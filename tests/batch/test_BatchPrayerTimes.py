@@ -0,0 +1,42 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from adhanpy.batch.BatchPrayerTimes import prayer_times_batch, solar_coordinates_for
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.PrayerTimes import PrayerTimes
+
+PRAYERS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha")
+
+
+def test_batch_matches_prayer_times():
+    date = datetime(2024, 12, 31)
+    parameters = CalculationParameters(method=CalculationMethod.EGYPTIAN)
+    locations = [(30.04, 31.24), (51.5, -0.13), (-33.87, 151.21), (64.1, -21.9)]
+
+    results = prayer_times_batch(locations, date, parameters, ZoneInfo("UTC"))
+
+    for location, result in zip(locations, results):
+        expected = PrayerTimes(
+            location, date, calculation_parameters=parameters, time_zone=ZoneInfo("UTC")
+        )
+        for prayer in PRAYERS:
+            assert getattr(result, prayer) == getattr(expected, prayer)
+
+
+def test_batch_returns_errors_per_location():
+    date = datetime(2024, 6, 21)
+    parameters = CalculationParameters(method=CalculationMethod.EGYPTIAN)
+
+    cairo, north_pole = prayer_times_batch(
+        [(30.04, 31.24), (89.0, 0.0)], date, parameters
+    )
+
+    assert isinstance(cairo, PrayerTimes)
+    assert isinstance(north_pole, RuntimeError)
+
+
+def test_solar_coordinates_for():
+    solar_coordinates = solar_coordinates_for(datetime(2024, 3, 1))
+
+    assert len(solar_coordinates) == 4
+    assert solar_coordinates[0].declination < solar_coordinates[3].declination
@@ -0,0 +1,128 @@
+import pytest
+from datetime import date, datetime, timezone
+from adhanpy.batch.GridStore import MISSING, GridStore, generate_grid
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.PrayerTimes import PrayerTimes
+
+BOUNDS = (50.0, -1.0, 52.0, 1.0)
+PRAYERS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha")
+
+
+def _parameters():
+    return CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+
+def _minutes(prayer_times, day):
+    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return tuple(
+        int((getattr(prayer_times, prayer) - midnight).total_seconds() // 60)
+        for prayer in PRAYERS
+    )
+
+
+def test_grid_matches_prayer_times(tmp_path):
+    path = str(tmp_path / "grid.bin")
+    chunks = generate_grid(path, BOUNDS, 0.5, date(2024, 3, 30), 3, _parameters(), 2, 2)
+
+    # 5 rows in 3 bands by 3 days in 2 blocks
+    assert chunks == 6
+    with GridStore(path) as grid:
+        assert grid.complete
+        assert (grid.rows, grid.columns, grid.days) == (5, 5, 3)
+        assert grid.row(51.1) == 2
+        assert grid.column(-0.9) == 0
+        for day in (date(2024, 3, 30), date(2024, 4, 1)):
+            for row in range(5):
+                for column in range(5):
+                    expected = PrayerTimes(
+                        (grid.latitude(row), grid.longitude(column)),
+                        datetime(day.year, day.month, day.day),
+                        calculation_parameters=_parameters(),
+                    )
+                    assert grid.minutes(day, row, column) == _minutes(expected, day)
+
+        (rows,) = grid.region((50.4, -0.6, 51.0, 0.1), date(2024, 3, 31))
+        # latitudes 51.0 and 50.5, longitudes -0.5 and 0.0
+        assert len(rows) == 2
+        assert [len(row) for row in rows] == [2 * 6, 2 * 6]
+        assert tuple(rows[0][:6]) == grid.minutes(date(2024, 3, 31), 2, 1)
+
+        two_days = grid.region(BOUNDS, date(2024, 3, 30), 2)
+        assert [len(rows) for rows in two_days] == [5, 5]
+        with pytest.raises(IndexError):
+            grid.region(BOUNDS, date(2024, 4, 1), 2)
+        with pytest.raises(IndexError):
+            grid.minutes(date(2024, 4, 2), 0, 0)
+        for row, column in ((0, 5), (0, -1), (5, 0), (-1, 0)):
+            with pytest.raises(IndexError):
+                grid.minutes(date(2024, 3, 30), row, column)
+
+        # bounds past the grid are clamped to it
+        (rows,) = grid.region((49.0, 0.6, 51.0, 3.0), date(2024, 3, 31))
+        assert len(rows) == 3
+        assert [len(row) for row in rows] == [6, 6, 6]
+        assert tuple(rows[2]) == grid.minutes(date(2024, 3, 31), 4, 4)
+        assert grid.region((-10.0, 0.0, 10.0, 1.0), date(2024, 3, 31)) == [[]]
+        assert grid.region((50.0, 5.0, 52.0, 6.0), date(2024, 3, 31)) == [[]]
+
+
+def test_generation_resumes(tmp_path):
+    path = str(tmp_path / "grid.bin")
+
+    class Interrupted(Exception):
+        pass
+
+    def interrupt(done, chunks):
+        if done == 3:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        generate_grid(
+            path, BOUNDS, 0.5, date(2024, 1, 1), 3, _parameters(), 2, 2, interrupt
+        )
+    with GridStore(path) as grid:
+        assert not grid.complete
+
+    progress = []
+    assert (
+        generate_grid(
+            path,
+            BOUNDS,
+            0.5,
+            date(2024, 1, 1),
+            3,
+            _parameters(),
+            2,
+            2,
+            lambda done, chunks: progress.append(done),
+        )
+        == 3
+    )
+    assert progress == [4, 5, 6]
+    assert (
+        generate_grid(path, BOUNDS, 0.5, date(2024, 1, 1), 3, _parameters(), 2, 2) == 0
+    )
+    with GridStore(path) as grid:
+        assert grid.complete
+
+    with pytest.raises(ValueError, match="another grid"):
+        generate_grid(path, BOUNDS, 0.25, date(2024, 1, 1), 3, _parameters(), 2, 2)
+
+
+def test_missing_values_and_invalid_files(tmp_path):
+    path = str(tmp_path / "polar.bin")
+    generate_grid(
+        path, (88.0, 0.0, 89.0, 1.0), 1.0, date(2024, 6, 21), 1, _parameters()
+    )
+
+    with GridStore(path) as grid:
+        (rows,) = grid.region((88.0, 0.0, 89.0, 1.0), date(2024, 6, 21))
+        assert all(value == MISSING for row in rows for value in row)
+        with pytest.raises(ValueError):
+            grid.minutes(date(2024, 6, 21), 0, 0)
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"ADHT" + bytes(100))
+    with pytest.raises(ValueError):
+        GridStore(str(other))
@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.batch.BatchPrayerTimes import solar_coordinates_for
+from adhanpy.batch.Interpolation import interpolated_calendar, raw_times
+from adhanpy.batch.ParallelCalendar import iter_calendar
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import apply_policy
+from adhanpy.data.Prayer import PRAYERS
+
+START = datetime(2024, 1, 1)
+
+
+def _differences(coordinates, days, parameters, time_zone=None, **kwargs):
+    calendar = interpolated_calendar(
+        coordinates, START, days, parameters, time_zone, **kwargs
+    )
+    exact = iter_calendar(coordinates, START, days, parameters, time_zone)
+    differences = []
+    for interpolated, prayer_times in zip(calendar.days, exact):
+        if isinstance(prayer_times, Exception):
+            assert interpolated is None
+            continue
+        assert interpolated is not None
+        for time, prayer in zip(interpolated, PRAYERS):
+            expected = getattr(prayer_times, prayer.name.lower()).replace(microsecond=0)
+            assert time.utcoffset() == expected.utcoffset()
+            differences.append(abs((time - expected).total_seconds()))
+    return calendar, differences
+
+
+def test_interpolated_calendar_matches_exact_to_the_minute():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    calendar, differences = _differences((21.4225, 39.8262), 366, parameters)
+
+    assert len(calendar.days) == 366
+    assert calendar.exact < 366 / 3
+    assert max(differences) <= 60
+    # the times only differ when the exact time is close to half a minute
+    assert sum(1 for difference in differences if difference) < len(differences) / 50
+
+
+def test_interpolated_calendar_in_time_zone():
+    parameters = CalculationParameters(method=CalculationMethod.NORTH_AMERICA)
+    time_zone = ZoneInfo("America/New_York")
+    calendar, differences = _differences((40.7128, -74.006), 120, parameters, time_zone)
+
+    assert calendar.days[0][0].tzinfo == time_zone
+    assert max(differences) <= 60
+
+
+def test_step_one_is_exact():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    calendar, differences = _differences((51.5074, -0.1278), 30, parameters, step=1)
+
+    assert calendar.exact == 30
+    assert calendar.fallbacks == 0
+    assert max(differences) == 0
+
+
+def test_falls_back_where_safe_bound_switches():
+    # fajr and isha switch to the high latitude safe bound around May and August
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    calendar, differences = _differences((55.7558, 37.6173), 366, parameters)
+
+    assert calendar.fallbacks > 0
+    assert max(differences) <= 60
+
+
+def test_days_that_cannot_be_calculated_are_none():
+    # the sun does not set (or rise) in Tromsø around the solstices
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    calendar, differences = _differences((69.6492, 18.9553), 366, parameters)
+
+    assert any(day is None for day in calendar.days)
+    assert calendar.days[80] is not None
+    assert max(differences) <= 60
+
+
+def test_raw_times_are_not_rounded():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    date = START + timedelta(days=10)
+    times = raw_times((51.5074, -0.1278), date, parameters)
+    rounded = apply_policy(
+        SolarEvents((51.5074, -0.1278), date, solar_coordinates_for(date)), parameters
+    )
+
+    assert abs((times.dhuhr - rounded.dhuhr).total_seconds()) <= 60
+    assert any(getattr(times, prayer.name.lower()).second for prayer in PRAYERS)
+
+
+@pytest.mark.parametrize("step, tolerance", [(0, 5.0), (7, -1.0)])
+def test_invalid_arguments(step, tolerance):
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    with pytest.raises(ValueError):
+        interpolated_calendar(
+            (51.5074, -0.1278), START, 10, parameters, step=step, tolerance=tolerance
+        )
@@ -0,0 +1,123 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.batch.BatchPrayerTimes import prayer_times_batch
+from adhanpy.batch.ParallelCalendar import (
+    calendar,
+    parallel_batch,
+    parallel_calendar,
+)
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+
+PRAYERS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha")
+START = datetime(2024, 1, 1)
+
+
+def _times(prayer_times):
+    return [getattr(prayer_times, prayer) for prayer in PRAYERS]
+
+
+@pytest.mark.parametrize("workers", [1, 3, 8])
+def test_parallel_calendar_matches_prayer_times(workers):
+    parameters = CalculationParameters(method=CalculationMethod.NORTH_AMERICA)
+    time_zone = ZoneInfo("America/New_York")
+
+    results = parallel_calendar(
+        (40.71, -74.0), START, 100, parameters, time_zone, workers=workers
+    )
+
+    assert len(results) == 100
+    for offset, prayer_times in enumerate(results):
+        expected = PrayerTimes(
+            (40.71, -74.0),
+            START + timedelta(days=offset),
+            calculation_parameters=parameters,
+            time_zone=time_zone,
+        )
+        assert _times(prayer_times) == _times(expected)
+
+
+def test_parallel_calendar_with_executor():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+    with ThreadPoolExecutor(2) as executor:
+        results = parallel_calendar(
+            (51.5, -0.13), START, 10, parameters, workers=4, executor=executor
+        )
+
+    assert [_times(r) for r in results] == [
+        _times(r) for r in calendar((51.5, -0.13), START, 10, parameters)
+    ]
+    assert parallel_calendar((51.5, -0.13), START, 0, parameters) == []
+
+
+def test_parallel_calendar_uses_a_snapshot_of_the_parameters():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    expected = calendar((51.5, -0.13), START, 20, parameters)
+
+    class ChangingExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            # the caller changes the parameters while the ranges are submitted
+            parameters.fajr_angle += 1
+            return super().submit(*args, **kwargs)
+
+    with ChangingExecutor(2) as executor:
+        results = parallel_calendar(
+            (51.5, -0.13), START, 20, parameters, workers=2, executor=executor
+        )
+
+    assert parameters.fajr_angle == 20
+    assert [_times(r) for r in results] == [_times(r) for r in expected]
+    # the results reference the caller's parameters as calendar's do
+    assert all(r.calculation_parameters is parameters for r in results)
+
+
+def test_parallel_batch_matches_prayer_times_batch():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    coordinates = [(-80 + 5 * index, 3.0 * index) for index in range(33)]
+
+    results = parallel_batch(coordinates, START, parameters, workers=4)
+    expected = prayer_times_batch(coordinates, START, parameters)
+
+    assert len(results) == 33
+    assert all(
+        result.calculation_parameters is parameters
+        for result in results
+        if not isinstance(result, Exception)
+    )
+    for result, other in zip(results, expected):
+        if isinstance(other, Exception):
+            assert type(result) is type(other)
+        else:
+            assert _times(result) == _times(other)
+
+
+def test_shared_parameters_from_many_threads():
+    parameters = CalculationParameters(method=CalculationMethod.DUBAI)
+    days = [START + timedelta(days=offset) for offset in range(200)]
+    expected = [
+        _times(PrayerTimes((25.2, 55.27), day, calculation_parameters=parameters))
+        for day in days
+    ]
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(
+                lambda day: _times(
+                    PrayerTimes((25.2, 55.27), day, calculation_parameters=parameters)
+                ),
+                days,
+            )
+        )
+
+    assert results == expected
+
+
+def test_invalid_workers():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+    with pytest.raises(ValueError):
+        parallel_calendar((51.5, -0.13), START, 10, parameters, workers=0)
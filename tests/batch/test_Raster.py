@@ -0,0 +1,174 @@
+import json
+import math
+import zlib
+import pytest
+from array import array
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.batch.Raster import Raster, contour, isochrones, levels, raster
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerAdjustments import PrayerAdjustments
+from adhanpy.calculation.PrayerPolicy import apply_policy
+from adhanpy.data.Prayer import Prayer
+from adhanpy.PrayerTimes import PrayerTimes
+
+DATE = datetime(2024, 6, 21)
+
+
+def _parameters():
+    return CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+
+def _grid(values, rows, columns):
+    return Raster(
+        Prayer.MAGHRIB,
+        DATE,
+        0.0,
+        0.0,
+        rows - 1.0,
+        columns - 1.0,
+        rows,
+        columns,
+        array("d", values),
+    )
+
+
+def test_raster_matches_prayer_times():
+    grid = raster(
+        Prayer.MAGHRIB,
+        DATE,
+        _parameters(),
+        (49.9, -8.2, 60.9, 1.8),
+        6,
+        5,
+        ZoneInfo("Europe/London"),
+    )
+
+    assert grid.utc_offset == 60
+    assert len(grid.values) == 30
+    for row in range(6):
+        for column in range(5):
+            maghrib = PrayerTimes(
+                (grid.latitude(row), grid.longitude(column)),
+                DATE,
+                calculation_parameters=_parameters(),
+                time_zone=ZoneInfo("Europe/London"),
+            ).maghrib
+            minutes = maghrib.hour * 60 + maghrib.minute
+            assert abs(grid.value(row, column) - minutes) <= 1
+    # later in the north west
+    assert grid.value(0, 0) > grid.value(5, 4)
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        CalculationMethod.MUSLIM_WORLD_LEAGUE,
+        CalculationMethod.UMM_AL_QURA,
+        CalculationMethod.MOON_SIGHTING_COMMITTEE,
+    ],
+)
+@pytest.mark.parametrize("date", [DATE, datetime(2024, 12, 21)])
+def test_raster_matches_apply_policy(method, date):
+    parameters = CalculationParameters(
+        method=method, adjustments=PrayerAdjustments(1, -2, 3, -4, 5, -6)
+    )
+    midnight = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+    # from polar night to polar day and across the antimeridian
+    bounds = (-70.0, -178.0, 75.0, 178.0)
+
+    for prayer in Prayer:
+        if prayer == Prayer.NONE:
+            continue
+        grid = raster(prayer, date, parameters, bounds, 30, 7)
+        for row in range(30):
+            for column in range(7):
+                coordinates = (grid.latitude(row), grid.longitude(column))
+                try:
+                    times = apply_policy(
+                        SolarEvents(coordinates, date), parameters, rounded=False
+                    )
+                except RuntimeError:
+                    assert math.isnan(grid.value(row, column))
+                    continue
+                time = getattr(times, prayer.name.lower())
+                minutes = (time - midnight).total_seconds() / 60
+                assert grid.value(row, column) == minutes
+
+
+def test_raster_without_values():
+    grid = raster(Prayer.ISHA, DATE, _parameters(), (80.0, -10.0, 89.0, 10.0), 2, 2)
+
+    assert all(math.isnan(value) for value in grid.values)
+    assert levels(grid, 10) == []
+    assert isochrones(grid)["features"] == []
+    with pytest.raises(ValueError):
+        raster(Prayer.ISHA, DATE, _parameters(), (0.0, 0.0, 1.0, 1.0), 1, 2)
+
+
+def test_contour_around_a_peak():
+    # distance from the centre of a 5 by 5 grid
+    values = [
+        math.hypot(row - 2, column - 2) for row in range(5) for column in range(5)
+    ]
+    grid = _grid(values, 5, 5)
+
+    (line,) = contour(grid, 1.5)
+
+    assert line[0] == line[-1]
+    assert len(line) == 13
+    for longitude, latitude in line:
+        assert 1.0 <= math.hypot(longitude - 2, latitude - 2) <= 1.5
+
+
+def test_contour_lines_end_at_missing_values_and_saddles():
+    # increases west to east, the last row is missing
+    values = [float(column) for row in range(3) for column in range(4)]
+    values[8:] = [math.nan] * 4
+    (line,) = contour(_grid(values, 3, 4), 1.5)
+    assert sorted(line) == [(1.5, 1.0), (1.5, 2.0)]
+
+    saddle = _grid([1.0, 0.0, 0.0, 1.0], 2, 2)
+    assert len(contour(saddle, 0.4)) == 2
+    assert len(contour(saddle, 0.6)) == 2
+
+
+def test_isochrones_geojson():
+    grid = raster(Prayer.FAJR, DATE, _parameters(), (20.0, 35.0, 30.0, 50.0), 8, 8)
+
+    collection = json.loads(json.dumps(isochrones(grid, 15)))
+
+    assert collection["type"] == "FeatureCollection"
+    low, high = grid.range()
+    assert len(collection["features"]) == len(levels(grid, 15))
+    for feature in collection["features"]:
+        assert feature["geometry"]["type"] == "MultiLineString"
+        assert low <= feature["properties"]["minutes"] <= high
+        assert feature["properties"]["minutes"] % 15 == 0
+        assert feature["properties"]["prayer"] == "fajr"
+        for line in feature["geometry"]["coordinates"]:
+            for longitude, latitude in line:
+                assert 35.0 <= longitude <= 50.0
+                assert 20.0 <= latitude <= 30.0
+
+    custom = isochrones(grid, contour_levels=[low + 1])
+    assert [feature["properties"]["minutes"] for feature in custom["features"]] == [
+        low + 1
+    ]
+
+
+def test_png():
+    grid = _grid([0.0, 1.0, 2.0, math.nan, 4.0, 8.0], 2, 3)
+
+    png = grid.to_png()
+
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert png[12:16] == b"IHDR"
+    start = png.index(b"IDAT") + 4
+    length = int.from_bytes(png[start - 8 : start - 4], "big")
+    scanlines = zlib.decompress(png[start : start + length])
+    assert scanlines == bytes(
+        [0, 0, 255, 32, 255, 64, 255, 0, 0, 0, 128, 255, 255, 255]
+    )
@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from adhanpy.batch.WorkPlanner import Subscriber, hilbert_index, plan
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.PrayerTimes import PrayerTimes
+
+LONDON = ZoneInfo("Europe/London")
+
+
+def _subscribers():
+    mwl = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    isna = CalculationParameters(method=CalculationMethod.NORTH_AMERICA)
+    subscribers = [
+        Subscriber(index, (51.5 + index / 1000, -0.13), mwl, LONDON)
+        for index in range(40)
+    ]
+    subscribers += [
+        Subscriber(f"isna {index}", (51.5, -0.13), isna, LONDON) for index in range(5)
+    ]
+    # equal parameters from another object share the computation
+    subscribers.append(
+        Subscriber(
+            "copy",
+            (51.5, -0.13),
+            CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE),
+            LONDON,
+        )
+    )
+    subscribers.append(Subscriber("utc", (51.5, -0.13), mwl))
+    subscribers.append(Subscriber("pole", (89.0, 0.0), mwl))
+    return subscribers
+
+
+def test_plan_collapses_subscribers():
+    work = plan(_subscribers(), [datetime(2024, 6, 22), datetime(2024, 6, 21)])
+
+    # 40 rows round to 5 locations, isna, utc and pole are one item each
+    assert work.rows == 48
+    assert len(work.items) == 8
+    assert work.keys == 16
+    assert work.dedup_ratio == 6.0
+    assert work.dates == [datetime(2024, 6, 21), datetime(2024, 6, 22)]
+    assert "dedup ratio 6.0x" in work.format()
+
+    # no time zone first, then the London locations along the curve
+    assert {work.items[0].subscribers, work.items[1].subscribers} == {
+        ("utc",),
+        ("pole",),
+    }
+    latitudes = [item.coordinates[0] for item in work.items[2:7]]
+    assert sorted(latitudes) == [51.5, 51.51, 51.52, 51.53, 51.54]
+    london = work.items[2 + latitudes.index(51.5)]
+    assert london.coordinates == (51.5, -0.13)
+    assert london.time_zone == LONDON
+    assert london.subscribers == (0, 1, 2, 3, 4, "copy")
+
+
+def test_dates_are_deduplicated_by_day():
+    work = plan(
+        _subscribers(),
+        [
+            datetime(2024, 6, 21, 8),
+            datetime(2024, 6, 21),
+            datetime(2024, 6, 21, 23, 30, tzinfo=LONDON),
+            datetime(2024, 6, 22, 1, tzinfo=timezone.utc),
+        ],
+    )
+
+    assert work.dates == [datetime(2024, 6, 21), datetime(2024, 6, 22)]
+    assert work.keys == 2 * len(work.items)
+
+
+def test_fan_out_gives_every_subscriber_its_result():
+    subscribers = _subscribers()
+    work = plan(subscribers, [datetime(2024, 6, 21)], precision=None)
+    assert len(work.items) == 43
+
+    results = {subscriber: result for subscriber, _, result in work.fan_out()}
+
+    assert set(results) == {subscriber.id for subscriber in subscribers}
+    assert isinstance(results["pole"], RuntimeError)
+    for subscriber in subscribers[:-1]:
+        expected = PrayerTimes(
+            subscriber.coordinates,
+            datetime(2024, 6, 21),
+            calculation_parameters=subscriber.calculation_parameters,
+            time_zone=subscriber.time_zone,
+        )
+        assert results[subscriber.id].fajr == expected.fajr
+        assert results[subscriber.id].isha == expected.isha
+
+
+def test_items_are_ordered_by_parameters_time_zone_and_location():
+    mwl = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    karachi = CalculationParameters(method=CalculationMethod.KARACHI)
+    locations = [(-33.87, 151.21), (51.5, -0.13), (24.86, 67.0), (51.6, -0.2)]
+    subscribers = [
+        Subscriber(index, location, parameters)
+        for index, (location, parameters) in enumerate(
+            (location, parameters)
+            for parameters in (karachi, mwl)
+            for location in locations
+        )
+    ]
+
+    items = plan(subscribers, [datetime(2024, 1, 1)]).items
+
+    assert [item.calculation_parameters for item in items[:4]] == [karachi] * 4
+    london = [item.coordinates for item in items[:4]].index((51.5, -0.13))
+    assert items[london + 1].coordinates == (51.6, -0.2) or items[
+        london - 1
+    ].coordinates == (51.6, -0.2)
+
+
+def test_hilbert_index():
+    assert hilbert_index(-90.0, -180.0, order=1) == 0
+    assert hilbert_index(50.0, -100.0, order=1) == 1
+    assert hilbert_index(50.0, 100.0, order=1) == 2
+    assert hilbert_index(-50.0, 100.0, order=1) == 3
+    assert (
+        len(
+            {
+                hilbert_index(lat, lon, 4)
+                for lat in range(-85, 90, 11)
+                for lon in range(-175, 180, 22)
+            }
+        )
+        == 256
+    )
@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, timedelta
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.bench.Accuracy import (
+    compare,
+    main,
+    sample_dates,
+    sample_locations,
+    scalar_engine,
+    shared_solar_coordinates_engine,
+)
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Prayer import PRAYERS
+
+LOCATIONS = [(21.42, 39.83), (51.5, -0.13), (65.0, 25.0), (-33.87, 151.21)]
+DATES = [datetime(2022, 3, 1), datetime(2022, 6, 21), datetime(2023, 12, 21)]
+
+
+def test_samples():
+    locations = sample_locations(30, 90, 60)
+
+    assert len(locations) == 5 * 4
+    assert (-60, -180) in locations and (60, 90) in locations
+    dates = sample_dates(2000, 3, 4)
+    assert len(dates) == 12
+    assert dates[0] == datetime(2000, 1, 1)
+    assert dates[4] == datetime(2001, 1, 2)
+
+
+def test_scalar_engine_rounds_to_prayer_times():
+    parameters = CalculationParameters(method=CalculationMethod.MOON_SIGHTING_COMMITTEE)
+    times = scalar_engine((51.5, -0.13), DATES[0], parameters)
+    prayer_times = PrayerTimes(
+        (51.5, -0.13), DATES[0], calculation_parameters=parameters
+    )
+
+    assert any(time.second for time in times)
+    for prayer, time in zip(PRAYERS, times):
+        expected = getattr(prayer_times, prayer.name.lower())
+        assert abs((time - expected).total_seconds()) <= 30
+
+
+def test_shared_solar_coordinates_are_exact():
+    report = compare(shared_solar_coordinates_engine, locations=LOCATIONS, dates=DATES)
+
+    assert report.samples == len(LOCATIONS) * len(DATES) * len(CalculationMethod)
+    assert report.speedup > 0
+    for error in report.prayers:
+        assert error.max == 0
+        assert error.mismatched_minutes == 0
+        assert error.mismatched_failures == 0
+
+
+def test_errors_of_a_shifted_engine():
+    def shifted(coordinates, date, calculation_parameters):
+        times = scalar_engine(coordinates, date, calculation_parameters)
+        if coordinates[0] > 60:
+            raise RuntimeError
+        return [
+            time + timedelta(seconds=20 * index) for index, time in enumerate(times)
+        ]
+
+    report = compare(
+        shifted,
+        locations=LOCATIONS,
+        dates=DATES,
+        methods=[CalculationMethod.MUSLIM_WORLD_LEAGUE],
+    )
+
+    assert report.engine == "shifted"
+    assert [error.max for error in report.prayers] == [0, 20, 40, 60, 80, 100]
+    assert [error.samples for error in report.prayers] == [9] * 6
+    assert [error.mismatched_failures for error in report.prayers] == [3] * 6
+    assert report.prayers[0].mismatched_minutes == 0
+    assert report.prayers[5].mismatched_minutes == 1
+    assert 0 < report.prayers[1].mismatched_minutes < 1
+    assert "shifted" in report.format()
+
+
+def test_no_samples():
+    with pytest.raises(ValueError):
+        compare(scalar_engine, locations=[], dates=DATES)
+
+
+def test_main(capsys):
+    main(["--latitude-step", "60", "--longitude-step", "120", "--years", "1"])
+
+    output = capsys.readouterr().out
+    assert output.startswith("shared-solar-coordinates: ")
+    assert len(output.splitlines()) == 8
@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from dataclasses import replace
+from datetime import datetime
+from adhanpy.bench.LoadGenerator import (
+    CITIES,
+    LoadReport,
+    RequestMix,
+    compute_request,
+    generate_requests,
+    main,
+    request_path,
+    run_http,
+    run_in_process,
+)
+from adhanpy.server.HttpServer import PrayerTimesServer
+
+
+def test_generate_requests_is_reproducible_and_skewed():
+    mix = RequestMix(repeat_rate=0.8)
+
+    requests = list(generate_requests(2000, mix, seed=3))
+
+    assert requests == list(generate_requests(2000, mix, seed=3))
+    assert len(set(requests)) < 600
+    kinds = {request.kind for request in requests}
+    assert kinds == {"day", "month", "year", "next"}
+    for request in requests:
+        assert (
+            min(city[1] for city in CITIES) - mix.jitter
+            <= request.coordinates[0]
+            <= max(city[1] for city in CITIES) + mix.jitter
+        )
+        assert 0 <= (request.date - mix.start_date).days < mix.date_spread
+
+
+@pytest.mark.parametrize(
+    "kind, results",
+    [("day", 1), ("month", 31), ("year", 366)],
+)
+def test_compute_request(kind, results):
+    request = next(
+        r
+        for r in generate_requests(500, RequestMix(repeat_rate=0), seed=1)
+        if r.kind == kind
+    )
+    request = request.__class__(
+        kind,
+        request.coordinates,
+        datetime(2024, 3, 5),
+        request.method,
+        request.time_zone,
+    )
+
+    assert len(compute_request(request)) == results
+    assert request_path(request).startswith("/day" if kind == "day" else "/range")
+
+
+def test_run_in_process_at_target_rate():
+    requests = list(generate_requests(40, RequestMix(month=0, year=0), seed=2))
+
+    report = run_in_process(requests, concurrency=2, rate=400)
+
+    assert report.requests == 40
+    assert report.errors == 0
+    assert report.elapsed >= 39 / 400
+    assert report.p50 <= report.p95 <= report.p99 <= report.max
+    assert sum(count for _, count in report.histogram) == 40
+    assert "requests/s" in report.format()
+
+
+def test_run_in_process_counts_errors():
+    def handler(request):
+        raise RuntimeError
+
+    report = run_in_process(list(generate_requests(5, seed=2)), handler=handler)
+
+    assert report.errors == 5
+
+
+def test_run_http_against_localhost():
+    requests = list(generate_requests(30, RequestMix(month=0, year=0), seed=4))
+
+    async def scenario():
+        async with PrayerTimesServer(port=0) as server:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, run_http, requests, server.host, server.port, 3
+            )
+
+    report = asyncio.run(scenario())
+
+    assert report.requests == 30
+    assert report.errors == 0
+
+
+def test_run_http_at_target_rate_counts_errors():
+    requests = list(generate_requests(20, RequestMix(month=0, year=0), seed=4))
+    # out of range latitudes are answered with 400
+    for index in range(0, 20, 4):
+        requests[index] = replace(requests[index], coordinates=(95.0, 0.0))
+
+    async def scenario():
+        async with PrayerTimesServer(port=0) as server:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, run_http, requests, server.host, server.port, 2, 200
+            )
+
+    report = asyncio.run(scenario())
+
+    assert report.requests == 20
+    assert report.errors == 5
+    assert report.elapsed >= 19 / 200
+
+
+def test_empty_report():
+    with pytest.raises(ValueError):
+        LoadReport.from_latencies([], 1.0)
+
+
+def test_main(capsys):
+    main(["--requests", "20", "--repeat-rate", "0.9"])
+
+    assert "20 requests, 0 errors" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import pytest
+from adhanpy.bench.Memory import (
+    bulk_peak,
+    main,
+    peak,
+    per_calendar_day,
+    per_prayer_times,
+    per_solar_events,
+    per_solar_time,
+    retained,
+    retained_sizes,
+)
+
+# figures python -m adhanpy.bench.Memory --locations 200 printed on CPython 3.11.7,
+# bytes and allocations per object, or bytes for the bulk workloads
+BASELINE = {
+    "PrayerTimes": (885, 17.2),
+    "SolarTime": (1034, 30.3),
+    "SolarEvents": (2410, 53.4),
+    "SolarEvents of every method": (4528, 93.2),
+    "calendar day": (809, 16.5),
+    "peak of 200 locations": 165420,
+    "SolarEphemeris of a year": 11024,
+    "SpatialIndex of 200 locations": 23080,
+    "PackedTimetable of a year": 6233,
+}
+# usage varies between CPython versions and builds, a hot path going over its
+# baseline by more than this allocates more than it used to
+MARGIN = 1.5
+
+
+def _within_budget(name, usage):
+    bytes_, allocations = BASELINE[name]
+    assert usage.bytes < bytes_ * MARGIN
+    assert usage.allocations < allocations * MARGIN
+
+
+def test_retained():
+    usage = retained(lambda: bytearray(10_000), 10)
+
+    assert 10_000 <= usage.bytes < 10_500
+    assert 1 <= usage.allocations < 4
+    with pytest.raises(ValueError):
+        retained(list, 0)
+
+
+def test_peak():
+    assert 1_000_000 <= peak(lambda: bytearray(1_000_000)) < 1_100_000
+
+
+@pytest.mark.benchmark
+def test_prayer_times_budget():
+    _within_budget("PrayerTimes", per_prayer_times())
+
+
+@pytest.mark.benchmark
+def test_solar_time_budget():
+    _within_budget("SolarTime", per_solar_time())
+
+
+@pytest.mark.benchmark
+def test_solar_events_budget():
+    _within_budget("SolarEvents", per_solar_events())
+    # the cached times of every method and madhab
+    _within_budget("SolarEvents of every method", per_solar_events(every_method=True))
+
+
+@pytest.mark.benchmark
+def test_calendar_day_budget():
+    _within_budget("calendar day", per_calendar_day(100))
+
+
+@pytest.mark.benchmark
+def test_bulk_peak_budget():
+    assert bulk_peak(200) < BASELINE["peak of 200 locations"] * MARGIN
+
+
+@pytest.mark.benchmark
+def test_retained_sizes_budget():
+    for name, size in retained_sizes(200).items():
+        assert size < BASELINE[name] * MARGIN
+
+
+def test_main(capsys):
+    main(["--locations", "10"])
+
+    assert len(capsys.readouterr().out.splitlines()) == 9
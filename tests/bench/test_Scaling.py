@@ -0,0 +1,20 @@
+from adhanpy.bench.Scaling import gil_enabled, main, scaling
+
+
+def test_scaling():
+    results = scaling(threads=(1, 2), days=10, locations=2, repeat=1)
+
+    assert [result.threads for result in results] == [1, 2]
+    assert results[0].speedup == 1.0
+    for result in results:
+        assert result.seconds > 0
+        assert result.throughput == 20 / result.seconds
+        assert result.efficiency == result.speedup / result.threads
+
+
+def test_main(capsys):
+    main(["--threads", "1", "2", "--days", "5", "--locations", "1", "--repeat", "1"])
+
+    output = capsys.readouterr().out
+    assert ("GIL enabled" if gil_enabled() else "GIL disabled") in output
+    assert len(output.splitlines()) == 4
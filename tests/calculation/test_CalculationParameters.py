@@ -100,3 +100,35 @@ def test_method_has_precedence_over_other_parameters():
     # Act, Assert
     # MOON_SIGHTING_COMMITTEE has a fajr_angle of 18 and should overwrite fajr_angle provided
     assert params.fajr_angle == 18
+
+
+def test_cache_key():
+    # Arrange
+    params = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    same_params = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    adjusted_params = CalculationParameters(
+        method=CalculationMethod.MUSLIM_WORLD_LEAGUE
+    )
+    adjusted_params.adjustments.fajr = 2
+
+    # Act, Assert
+    assert params.cache_key() == same_params.cache_key()
+    assert hash(params.cache_key()) == hash(same_params.cache_key())
+    assert params.cache_key() != adjusted_params.cache_key()
+
+
+def test_method_adjustments_are_not_shared():
+    # Arrange
+    params = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+    # Act
+    params.method_adjustments.dhuhr = 10
+
+    # Assert
+    assert params.method_adjustments.dhuhr == 10
+    assert (
+        CalculationParameters(
+            method=CalculationMethod.MUSLIM_WORLD_LEAGUE
+        ).method_adjustments.dhuhr
+        == 1
+    )
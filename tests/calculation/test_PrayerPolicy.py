@@ -0,0 +1,105 @@
+import math
+import pytest
+from datetime import datetime, timedelta
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.astronomy.SolarTime import SolarTime
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.HighLatitudeRule import HighLatitudeRule
+from adhanpy.calculation.Madhab import Madhab
+from adhanpy.calculation.PrayerAdjustments import PrayerAdjustments
+from adhanpy.calculation.PrayerPolicy import apply_policy, precompute
+
+PRAYERS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha")
+
+
+@pytest.mark.parametrize("method", list(CalculationMethod))
+@pytest.mark.parametrize("coordinates", [(21.42, 39.83), (59.91, 10.75)])
+def test_policy_matches_prayer_times(method, coordinates):
+    date = datetime(2022, 12, 1)
+    parameters = CalculationParameters(method=method)
+
+    times = apply_policy(SolarEvents(coordinates, date), parameters)
+    prayer_times = PrayerTimes(coordinates, date, calculation_parameters=parameters)
+
+    for prayer in PRAYERS:
+        assert getattr(times, prayer) == getattr(prayer_times, prayer)
+
+
+def test_unrounded_times():
+    events = SolarEvents((51.5, -0.13), datetime(2022, 3, 1))
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+    rounded = apply_policy(events, parameters)
+    unrounded = apply_policy(events, parameters, rounded=False)
+
+    assert any(getattr(unrounded, prayer).second for prayer in PRAYERS)
+    for prayer in PRAYERS:
+        difference = getattr(unrounded, prayer) - getattr(rounded, prayer)
+        assert abs(difference) <= timedelta(seconds=30)
+
+
+def test_reapplying_a_policy_needs_no_astronomy(mocker):
+    events = [
+        SolarEvents((57.7, 11.97), datetime(2022, 1, 1) + timedelta(days=offset))
+        for offset in range(0, 365, 7)
+    ]
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    hanafi = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    hanafi.madhab = Madhab.HANAFI
+    for day in events:
+        apply_policy(day, parameters)
+        apply_policy(day, hanafi)
+    hour_angle = mocker.spy(SolarTime, "hour_angle")
+    afternoon = mocker.spy(SolarTime, "afternoon")
+    sin = mocker.spy(math, "sin")
+
+    parameters.adjustments = PrayerAdjustments(fajr=2, isha=-3)
+    parameters.madhab = Madhab.HANAFI
+    parameters.high_latitude_rule = HighLatitudeRule.SEVENTH_OF_THE_NIGHT
+    times = [apply_policy(day, parameters) for day in events]
+    parameters.isha_interval = 90
+    intervals = [apply_policy(day, parameters) for day in events]
+
+    assert hour_angle.call_count == afternoon.call_count == sin.call_count == 0
+    for day, policy, interval in zip(events, times, intervals):
+        expected = PrayerTimes.from_events(day, calculation_parameters=parameters)
+        assert interval.isha == expected.isha
+        # isha is adjusted by -3 minutes, maghrib and isha are rounded separately
+        assert abs(
+            interval.isha - interval.maghrib - timedelta(minutes=87)
+        ) <= timedelta(minutes=1)
+        assert policy.asr == expected.asr
+
+
+def test_precomputed_policies_need_no_astronomy(mocker):
+    events = SolarEvents((51.5, -0.13), datetime(2022, 3, 1))
+    methods = [CalculationParameters(method=method) for method in CalculationMethod]
+    hanafi = CalculationParameters(method=CalculationMethod.KARACHI)
+    hanafi.madhab = Madhab.HANAFI
+    methods.append(hanafi)
+    expected = [
+        apply_policy(SolarEvents((51.5, -0.13), datetime(2022, 3, 1)), parameters)
+        for parameters in methods
+    ]
+
+    precompute(events, methods)
+    hour_angle = mocker.spy(SolarTime, "hour_angle")
+    hour_angles = mocker.spy(SolarTime, "hour_angles")
+    afternoon = mocker.spy(SolarTime, "afternoon")
+    times = [apply_policy(events, parameters) for parameters in methods]
+
+    assert hour_angle.call_count == hour_angles.call_count == 0
+    assert afternoon.call_count == 0
+    assert times == expected
+
+
+def test_asr_not_calculated(mocker):
+    mocker.patch.object(SolarTime, "afternoon", lambda self, shadow: math.inf)
+    parameters = CalculationParameters(method=CalculationMethod.NORTH_AMERICA)
+
+    with pytest.raises(RuntimeError):
+        apply_policy(
+            SolarEvents((35.7750, -78.6336), datetime(2015, 7, 12)), parameters
+        )
@@ -0,0 +1,86 @@
+import pytest
+from datetime import date, datetime, timedelta
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import apply_policy
+from adhanpy.calculation.Regime import DeclinationTable, Regime, RegimeClassifier
+
+START = date(2024, 1, 1)
+LATITUDES = [latitude * 2.5 for latitude in range(-36, 37)]
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        CalculationMethod.MUSLIM_WORLD_LEAGUE,
+        CalculationMethod.UMM_AL_QURA,
+        CalculationMethod.MOON_SIGHTING_COMMITTEE,
+    ],
+)
+def test_regimes_match_prayer_times(method):
+    parameters = CalculationParameters(method=method)
+    table = DeclinationTable(START, 366)
+    regimes = RegimeClassifier(parameters, table).regimes(LATITUDES)
+
+    assert len(regimes) == len(LATITUDES)
+    for index in range(0, 366, 15):
+        day = datetime(2024, 1, 1) + timedelta(days=index)
+        for latitude, row in zip(LATITUDES, regimes):
+            regime = row[index]
+            try:
+                times = apply_policy(SolarEvents((latitude, 20.0), day), parameters)
+            except RuntimeError:
+                assert not regime.calculable
+                continue
+            assert regime.calculable
+            assert times.fajr_bound or not regime.fajr_bound
+            assert times.isha_bound or not regime.isha_bound
+
+
+def test_regimes_of_a_year():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    classifier = RegimeClassifier(parameters, DeclinationTable(START, 366))
+
+    assert classifier.regime(21.42, date(2024, 6, 21)) == Regime.TWILIGHT
+    # London does not reach 18° below the horizon around the summer solstice
+    assert classifier.regime(51.5, date(2024, 6, 21)) == Regime.SAFE_BOUND
+    assert classifier.regime(51.5, date(2024, 12, 21)) == Regime.TWILIGHT
+    assert classifier.regime(69.65, date(2024, 6, 21)) == Regime.POLAR_DAY
+    assert classifier.regime(69.65, date(2024, 12, 21)) == Regime.POLAR_NIGHT
+    assert classifier.regime(-69.65, date(2024, 12, 21)) == Regime.POLAR_DAY
+
+
+def test_polar_night_matches_prayer_times():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    classifier = RegimeClassifier(parameters, DeclinationTable(START, 366))
+
+    regimes = classifier.regimes([69.65])[0]
+    for index, regime in enumerate(regimes):
+        day = datetime(2024, 1, 1) + timedelta(days=index)
+        try:
+            PrayerTimes((69.65, 18.96), day, calculation_parameters=parameters)
+        except RuntimeError:
+            assert not regime.calculable
+        else:
+            assert regime.calculable
+
+
+def test_isha_interval_is_never_bound():
+    parameters = CalculationParameters(method=CalculationMethod.UMM_AL_QURA)
+    classifier = RegimeClassifier(parameters, DeclinationTable(START, 366))
+
+    regimes = classifier.regimes([55.0, 60.0])
+    assert not any(regime.isha_bound for row in regimes for regime in row)
+    assert any(regime.fajr_bound for row in regimes for regime in row)
+
+
+def test_day_outside_table():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    classifier = RegimeClassifier(parameters, DeclinationTable(START, 10))
+
+    with pytest.raises(IndexError):
+        classifier.regime(51.5, date(2024, 1, 11))
+    with pytest.raises(ValueError):
+        DeclinationTable(START, 0)
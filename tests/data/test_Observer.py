@@ -0,0 +1,22 @@
+import math
+from adhanpy.data.Coordinates import Coordinates
+from adhanpy.data.Observer import Observer
+
+
+def test_observer_caches_latitude_trigonometry():
+    # Arrange, Act
+    observer = Observer(51.5, -0.13)
+
+    # Assert
+    assert observer.sin_latitude == math.sin(math.radians(51.5))
+    assert observer.cos_latitude == math.cos(math.radians(51.5))
+    assert observer == Observer(51.5, -0.13)
+
+
+def test_observer_of():
+    # Arrange
+    observer = Observer(51.5, -0.13)
+
+    # Act, Assert
+    assert Observer.of(observer) is observer
+    assert Observer.of(Coordinates(51.5, -0.13)) == observer
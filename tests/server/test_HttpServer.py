@@ -0,0 +1,211 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.server.HttpServer import PrayerTimesServer, benchmark
+
+LONDON = "latitude=51.5&longitude=-0.13"
+NOW = datetime(2024, 3, 10, 12, 30, tzinfo=timezone.utc)
+
+
+async def _get(reader, writer, path, headers=""):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response_headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        response_headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(response_headers.get("content-length", 0)))
+    return status, response_headers, json.loads(body) if body else None
+
+
+def _run(scenario, **kwargs):
+    async def main():
+        async with PrayerTimesServer(port=0, clock=lambda: NOW, **kwargs) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            try:
+                return await scenario(server, reader, writer)
+            finally:
+                writer.close()
+
+    return asyncio.run(main())
+
+
+def test_day_with_keep_alive_and_etag():
+    async def scenario(server, reader, writer):
+        path = f"/day?{LONDON}&date=2024-03-10&method=muslim_world_league&time_zone=Europe/London"
+        first = await _get(reader, writer, path)
+        # same connection, conditional request
+        second = await _get(
+            reader, writer, path, f"If-None-Match: {first[1]['etag']}\r\n"
+        )
+        return first, second
+
+    (status, headers, payload), (status_304, headers_304, body_304) = _run(scenario)
+    expected = PrayerTimes(
+        (51.5, -0.13),
+        datetime(2024, 3, 10),
+        CalculationMethod.MUSLIM_WORLD_LEAGUE,
+        time_zone=ZoneInfo("Europe/London"),
+    )
+
+    assert status == 200
+    assert headers["connection"] == "keep-alive"
+    assert headers["cache-control"] == "public, max-age=86400"
+    assert payload["date"] == "2024-03-10"
+    assert payload["fajr"] == expected.fajr.isoformat()
+    assert payload["isha"] == expected.isha.isoformat()
+    assert status_304 == 304
+    assert headers_304["etag"] == headers["etag"]
+    assert body_304 is None
+
+
+def test_range_and_next():
+    async def scenario(server, reader, writer):
+        range_response = await _get(
+            reader,
+            writer,
+            f"/range?{LONDON}&start=2024-03-10&days=3&fajr_angle=18&isha_angle=17&madhab=hanafi",
+        )
+        next_response = await _get(
+            reader, writer, f"/next?{LONDON}&method=MUSLIM_WORLD_LEAGUE"
+        )
+        return range_response, next_response
+
+    (status, _, payload), (next_status, next_headers, next_payload) = _run(scenario)
+
+    assert status == 200
+    assert [day["date"] for day in payload["days"]] == [
+        "2024-03-10",
+        "2024-03-11",
+        "2024-03-12",
+    ]
+    assert next_status == 200
+    assert next_payload["prayer"] == "asr"
+    max_age = int(next_headers["cache-control"].split("=")[1])
+    assert (
+        datetime.fromisoformat(next_payload["time"]) - NOW
+    ).total_seconds() == pytest.approx(max_age, abs=1)
+
+
+def test_next_prayer_after_isha_is_tomorrow_fajr():
+    async def scenario(server, reader, writer):
+        server.clock = lambda: datetime(2024, 3, 10, 23, 30, tzinfo=timezone.utc)
+        return await _get(reader, writer, f"/next?{LONDON}&method=KARACHI")
+
+    status, _, payload = _run(scenario)
+
+    assert status == 200
+    assert payload["prayer"] == "fajr"
+    assert payload["time"].startswith("2024-03-11")
+
+
+@pytest.mark.parametrize(
+    "path, status",
+    [
+        ("/unknown", 404),
+        ("/day?latitude=51.5&date=2024-03-10&method=KARACHI", 400),
+        (f"/day?{LONDON}&date=2024-03-10", 400),
+        (f"/day?{LONDON}&date=2024-03-10&method=UNKNOWN", 400),
+        (f"/day?{LONDON}&date=2024-03-10&method=KARACHI&time_zone=Nowhere/City", 400),
+        ("/day?latitude=100&longitude=0&date=2024-03-10&method=KARACHI", 400),
+        (f"/range?{LONDON}&start=2024-03-10&days=1000&method=KARACHI", 400),
+        ("/day?latitude=89&longitude=0&date=2024-06-21&method=KARACHI", 422),
+    ],
+)
+def test_errors(path, status):
+    async def scenario(server, reader, writer):
+        return await _get(reader, writer, path)
+
+    response_status, _, payload = _run(scenario)
+
+    assert response_status == status
+    assert "error" in payload
+
+
+def test_method_not_allowed_and_connection_close():
+    async def scenario(server, reader, writer):
+        writer.write(b"POST /day HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}")
+        writer.write(b"GET /unknown HTTP/1.1\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        return await reader.read()
+
+    response = _run(scenario)
+
+    assert response.startswith(b"HTTP/1.1 405 Method Not Allowed")
+    assert b"HTTP/1.1 404 Not Found" in response
+    assert b"Connection: close" in response
+
+
+@pytest.mark.parametrize(
+    "request_bytes",
+    [
+        b"GET /day HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+        b"GET /day HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+        b"GET /day HTTP/1.1\r\nX-Long: " + b"a" * 70000 + b"\r\n\r\n",
+        b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n",
+    ],
+)
+def test_malformed_requests_return_400(request_bytes):
+    async def scenario(server, reader, writer):
+        writer.write(request_bytes)
+        await writer.drain()
+        return await reader.read()
+
+    response = _run(scenario)
+
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    assert b"Connection: close" in response
+
+
+def test_if_none_match_compares_etags_exactly():
+    async def scenario(server, reader, writer):
+        path = f"/day?{LONDON}&date=2024-03-10&method=muslim_world_league"
+        etag = (await _get(reader, writer, path))[1]["etag"]
+        statuses = []
+        for if_none_match in (
+            f'"other", W/{etag}',
+            "*",
+            etag[:-3] + '"',
+            f'"x{etag[1:]}',
+        ):
+            status, _, _ = await _get(
+                reader, writer, path, f"If-None-Match: {if_none_match}\r\n"
+            )
+            statuses.append(status)
+        return statuses
+
+    assert _run(scenario) == [304, 304, 200, 200]
+
+
+def test_overloaded_server_returns_503():
+    async def scenario(server, reader, writer):
+        server.pending = server.max_pending
+        return await _get(reader, writer, f"/next?{LONDON}&method=KARACHI")
+
+    status, headers, _ = _run(scenario)
+
+    assert status == 503
+    assert headers["retry-after"] == "1"
+
+
+def test_benchmark():
+    async def scenario(server, reader, writer):
+        return await benchmark(
+            "127.0.0.1",
+            server.port,
+            [f"/day?{LONDON}&date=2024-03-{day:02d}&method=KARACHI" for day in (1, 2)],
+            requests=20,
+            concurrency=3,
+        )
+
+    results = _run(scenario)
+
+    assert results["requests"] == 20
+    assert results["errors"] == 0
+    assert results["throughput"] > 0
+    assert results["p50"] <= results["p95"] <= results["p99"]
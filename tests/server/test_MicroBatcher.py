@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+import threading
+import time
+from datetime import datetime
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.batch.BatchPrayerTimes import prayer_times_batch
+from adhanpy.server.MicroBatcher import MicroBatcher
+
+
+def test_requests_are_grouped_by_date_and_parameters():
+    kernel_calls = []
+
+    def kernel(coordinates, date, parameters, time_zone):
+        kernel_calls.append((len(coordinates), date.day))
+        return [
+            PrayerTimes(location, date, calculation_parameters=parameters)
+            for location in coordinates
+        ]
+
+    karachi = CalculationParameters(method=CalculationMethod.KARACHI)
+    with MicroBatcher(max_batch_size=100, max_delay=0.2, kernel=kernel) as batcher:
+        futures = [
+            batcher.submit((24.86 + index / 100, 67.0), datetime(2024, 3, day), karachi)
+            for index in range(10)
+            for day in (1, 2)
+        ]
+        results = [future.result(timeout=5) for future in futures]
+
+    assert sorted(kernel_calls) == [(10, 1), (10, 2)]
+    assert batcher.metrics.requests == 20
+    assert batcher.metrics.batches == 1
+    assert batcher.metrics.groups == 2
+    assert batcher.metrics.max_batch_size == 20
+    assert batcher.queue_depth == 0
+    assert (
+        results[0].fajr
+        == PrayerTimes(
+            (24.86, 67.0), datetime(2024, 3, 1), calculation_parameters=karachi
+        ).fajr
+    )
+
+
+def test_max_batch_size_and_errors():
+    parameters = CalculationParameters(method=CalculationMethod.KARACHI)
+    with MicroBatcher(max_batch_size=2, max_delay=0.05) as batcher:
+        futures = [
+            batcher.submit(location, datetime(2024, 6, 21), parameters)
+            for location in ((24.86, 67.0), (89.0, 0.0), (24.86, 67.0))
+        ]
+
+        assert isinstance(futures[0].result(timeout=5), PrayerTimes)
+        with pytest.raises(RuntimeError):
+            futures[1].result(timeout=5)
+        futures[2].result(timeout=5)
+
+    assert batcher.metrics.batches == 2
+    assert batcher.metrics.max_batch_size == 2
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit((24.86, 67.0), datetime(2024, 6, 21), parameters)
+
+
+def test_failing_kernel_and_asyncio_callers():
+    def kernel(coordinates, date, parameters, time_zone):
+        raise MemoryError
+
+    async def scenario(batcher):
+        return await asyncio.wrap_future(
+            batcher.submit(
+                (0, 0), datetime(2024, 1, 1), CalculationParameters(fajr_angle=18)
+            )
+        )
+
+    batcher = MicroBatcher(max_delay=0, kernel=kernel)
+    with pytest.raises(MemoryError):
+        asyncio.run(scenario(batcher))
+    batcher.close()
+    batcher.close()
+
+
+def test_submit_racing_with_close():
+    parameters = CalculationParameters(method=CalculationMethod.KARACHI)
+    batcher = MicroBatcher(max_delay=0)
+    futures = []
+    rejected = threading.Event()
+
+    def submit():
+        while True:
+            try:
+                futures.append(
+                    batcher.submit((24.86, 67.0), datetime(2024, 3, 1), parameters)
+                )
+            except RuntimeError:
+                rejected.set()
+                return
+
+    threads = [threading.Thread(target=submit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while not futures:
+        time.sleep(0.001)
+    batcher.close()
+    for thread in threads:
+        thread.join()
+
+    assert rejected.is_set()
+    # every accepted request is computed before the background thread stops
+    assert len(futures) == batcher.metrics.requests
+    assert all(future.done() for future in futures)
+
+
+def test_cancelled_requests_are_dropped():
+    entered, release = threading.Event(), threading.Event()
+
+    def kernel(coordinates, date, parameters, time_zone):
+        # hold the background thread on the first batch while requests queue up
+        entered.set()
+        release.wait(5)
+        return prayer_times_batch(coordinates, date, parameters, time_zone)
+
+    parameters = CalculationParameters(method=CalculationMethod.KARACHI)
+    with MicroBatcher(max_batch_size=10, max_delay=0, kernel=kernel) as batcher:
+        first = batcher.submit((24.86, 67.0), datetime(2024, 3, 1), parameters)
+        assert entered.wait(5)
+        futures = [
+            batcher.submit(
+                (24.86 + index / 100, 67.0), datetime(2024, 3, 2), parameters
+            )
+            for index in range(3)
+        ]
+        assert futures[1].cancel()
+        release.set()
+
+        assert isinstance(first.result(timeout=5), PrayerTimes)
+        assert isinstance(futures[0].result(timeout=5), PrayerTimes)
+        assert isinstance(futures[2].result(timeout=5), PrayerTimes)
+        assert futures[1].cancelled()
+        later = batcher.submit((24.86, 67.0), datetime(2024, 3, 3), parameters)
+        assert isinstance(later.result(timeout=5), PrayerTimes)
+
+    assert batcher.metrics.batches == 3
+    assert batcher.metrics.max_batch_size == 2
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatcher(max_batch_size=0)
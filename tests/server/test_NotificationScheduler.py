@@ -0,0 +1,198 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerAdjustments import PrayerAdjustments
+from adhanpy.data.Prayer import Prayer
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.server.NotificationScheduler import NotificationScheduler
+
+LONDON = (51.5, -0.13)
+NEW_YORK = (40.71, -74.0)
+NOW = datetime(2024, 3, 10, 13, 0, tzinfo=timezone.utc)
+
+
+def _parameters():
+    return CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+
+def _scheduler(notifications, **kwargs):
+    return NotificationScheduler(notifications.extend, clock=lambda: NOW, **kwargs)
+
+
+def test_subscribers_share_events():
+    notifications = []
+    scheduler = _scheduler(notifications)
+    for subscriber in range(1000):
+        scheduler.subscribe(subscriber, LONDON, _parameters())
+    scheduler.subscribe("new york", NEW_YORK, _parameters())
+
+    assert scheduler.subscribers == 1001
+    assert scheduler.groups == 2
+    # events of a day per group, not per subscriber
+    assert scheduler.scheduled <= 10
+
+    london = PrayerTimes(LONDON, NOW, calculation_parameters=_parameters())
+    assert scheduler.next_time() == london.asr
+    assert scheduler.run_due(london.asr) == 1000
+    assert len(notifications) == 1
+    assert notifications[0].prayer == Prayer.ASR
+    assert notifications[0].time == london.asr
+    assert sorted(notifications[0].subscribers) == list(range(1000))
+
+
+def test_days_are_loaded_lazily():
+    notifications = []
+    scheduler = _scheduler(notifications)
+    scheduler.subscribe("london", LONDON, _parameters())
+    loaded = scheduler.metrics.days_loaded
+
+    scheduler.run_due(datetime(2024, 3, 14, tzinfo=timezone.utc))
+
+    # asr, maghrib and isha of the 10th then the 5 prayers of the 11th to 13th
+    times = [notification.time for notification in notifications]
+    prayers = [notification.prayer for notification in notifications]
+    assert times == sorted(times)
+    assert prayers[:5] == [
+        Prayer.ASR,
+        Prayer.MAGHRIB,
+        Prayer.ISHA,
+        Prayer.FAJR,
+        Prayer.DHUHR,
+    ]
+    assert Prayer.SUNRISE not in prayers
+    assert len(notifications) == 3 + 3 * 5
+    assert scheduler.metrics.days_loaded == loaded + 4
+    assert (
+        times[-1]
+        == PrayerTimes(
+            LONDON, datetime(2024, 3, 13), calculation_parameters=_parameters()
+        ).isha
+    )
+    assert scheduler.scheduled == 5
+
+
+def test_evening_prayers_west_of_greenwich():
+    notifications = []
+    scheduler = NotificationScheduler(
+        notifications.extend,
+        clock=lambda: datetime(2024, 3, 10, 0, 0, tzinfo=timezone.utc),
+    )
+    scheduler.subscribe("new york", NEW_YORK, _parameters(), [Prayer.ISHA])
+
+    isha = PrayerTimes(
+        NEW_YORK, datetime(2024, 3, 9), calculation_parameters=_parameters()
+    ).isha
+    assert isha.date() == datetime(2024, 3, 10).date()
+    assert scheduler.next_time() == isha
+
+
+def test_batches_and_unsubscribe():
+    notifications = []
+    scheduler = _scheduler(notifications, batch_size=3)
+    for subscriber in range(7):
+        scheduler.subscribe(subscriber, LONDON, _parameters())
+    scheduler.unsubscribe(6)
+
+    assert scheduler.run_due(scheduler.next_time()) == 6
+    assert [len(notification.subscribers) for notification in notifications] == [
+        3,
+        3,
+    ]
+    assert scheduler.metrics.batches == 2
+
+    for subscriber in range(6):
+        scheduler.unsubscribe(subscriber)
+    assert scheduler.groups == 0
+    notifications.clear()
+    assert scheduler.run_due(NOW + timedelta(days=2)) == 0
+    assert notifications == []
+    assert scheduler.next_time() is None
+
+
+def test_prayers_at_the_same_instant_share_a_dispatch():
+    calls = []
+    scheduler = NotificationScheduler(calls.append, batch_size=3, clock=lambda: NOW)
+    # maghrib at 17:57 is moved to isha at 19:42
+    parameters = CalculationParameters(
+        method=CalculationMethod.MUSLIM_WORLD_LEAGUE,
+        adjustments=PrayerAdjustments(maghrib=105),
+    )
+    for subscriber in range(2):
+        scheduler.subscribe(subscriber, LONDON, parameters)
+    isha = PrayerTimes(LONDON, NOW, calculation_parameters=parameters).isha
+
+    assert scheduler.run_due(isha) == 6
+    # asr, then maghrib and isha of 2 subscribers in batches of 3
+    assert [
+        [(notification.prayer, notification.subscribers) for notification in call]
+        for call in calls
+    ] == [
+        [(Prayer.ASR, (0, 1))],
+        [(Prayer.MAGHRIB, (0, 1)), (Prayer.ISHA, (0,))],
+        [(Prayer.ISHA, (1,))],
+    ]
+    assert scheduler.metrics.batches == 3
+    assert scheduler.metrics.notifications == 6
+
+
+def test_resubscribing_does_not_duplicate_events():
+    notifications = []
+    scheduler = _scheduler(notifications)
+    scheduler.subscribe("a", LONDON, _parameters())
+    scheduler.unsubscribe("a")
+    scheduler.subscribe("a", LONDON, _parameters())
+    scheduler.subscribe("a", LONDON, _parameters(), [Prayer.ASR])
+
+    scheduler.run_due(NOW + timedelta(days=2))
+
+    assert [notification.prayer for notification in notifications] == [
+        Prayer.ASR,
+        Prayer.ASR,
+    ]
+
+
+def test_late_events_are_dropped():
+    notifications = []
+    scheduler = _scheduler(notifications, max_lateness=timedelta(minutes=5))
+    scheduler.subscribe("london", LONDON, _parameters())
+
+    scheduler.run_due(NOW + timedelta(days=1))
+
+    assert notifications == []
+    assert scheduler.metrics.late == 5
+    assert scheduler.next_time() > NOW + timedelta(days=1)
+
+
+def test_location_without_prayer_times():
+    scheduler = _scheduler([])
+    scheduler.subscribe("pole", (89.9, 0.0), _parameters())
+
+    assert scheduler.next_time() is None
+    with pytest.raises(ValueError):
+        NotificationScheduler(print, batch_size=0)
+
+
+def test_run_sleeps_until_next_event():
+    notifications = []
+
+    async def main():
+        now = datetime.now(timezone.utc)
+        scheduler = NotificationScheduler(notifications.extend)
+        scheduler.subscribe("london", LONDON, _parameters())
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.05)
+        # an earlier event than the one waited for wakes the scheduler up
+        scheduler._schedule(
+            now + timedelta(seconds=0.1),
+            (scheduler._subscriptions["london"], Prayer.FAJR, False),
+        )
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert [notification.subscribers for notification in notifications] == [("london",)]
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.server.SingleFlight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    prayer_times_key,
+)
+
+
+def test_concurrent_threads_share_one_computation():
+    flight = SingleFlight()
+    release = threading.Event()
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    key = prayer_times_key((21.42, 39.83), datetime(2024, 3, 20), parameters)
+
+    def compute():
+        release.wait(5)
+        return PrayerTimes(
+            (21.42, 39.83), datetime(2024, 3, 20), calculation_parameters=parameters
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(flight.do, key, compute) for _ in range(8)]
+        while flight.metrics.calls < 8:
+            time.sleep(0.001)
+        assert flight.in_flight() == 1
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert all(result is results[0] for result in results)
+    assert flight.metrics.computations == 1
+    assert flight.metrics.coalesced == 7
+    assert flight.in_flight() == 0
+
+    # once finished a new call computes again
+    flight.do(key, lambda: None)
+    assert flight.metrics.computations == 2
+
+
+def test_threaded_errors_and_timeouts():
+    flight = SingleFlight(timeout=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing)
+        started.wait(5)
+        with pytest.raises(TimeoutError):
+            flight.do("key", failing)
+        follower = executor.submit(flight.do, "key", failing, 5)
+        while flight.metrics.calls < 3:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result()
+
+    assert flight.metrics.timeouts == 1
+    assert flight.metrics.computations == 1
+    assert flight.metrics.coalesced == 2
+
+
+def test_async_callers_share_one_computation():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        computations = 0
+
+        async def compute():
+            nonlocal computations
+            computations += 1
+            await asyncio.sleep(0.01)
+            return {"fajr": "05:00"}
+
+        results = await asyncio.gather(*(flight.do("key", compute) for _ in range(10)))
+        return flight, computations, results
+
+    flight, computations, results = asyncio.run(scenario())
+
+    assert computations == 1
+    assert all(result is results[0] for result in results)
+    assert flight.metrics.coalesced == 9
+    assert flight.in_flight() == 0
+
+
+def test_async_timeout_does_not_cancel_shared_computation():
+    async def scenario():
+        flight = AsyncSingleFlight(timeout=5)
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return 42
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("invalid")
+
+        waiting = asyncio.ensure_future(flight.do("key", compute))
+        await asyncio.sleep(0)
+        with pytest.raises(TimeoutError):
+            await flight.do("key", compute, timeout=0.001)
+        with pytest.raises(ValueError, match="invalid"):
+            await flight.do("other", failing)
+        # nobody waits for the error anymore
+        with pytest.raises(TimeoutError):
+            await flight.do("forgotten", failing, timeout=0.001)
+        await asyncio.sleep(0.02)
+        return flight, await waiting
+
+    flight, result = asyncio.run(scenario())
+
+    assert result == 42
+    assert flight.metrics.timeouts == 2
+    assert flight.in_flight() == 0
+
+
+def test_prayer_times_key():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    london = ZoneInfo("Europe/London")
+
+    assert prayer_times_key(
+        (51.5, -0.13), datetime(2024, 3, 20, 8), parameters, london
+    ) == prayer_times_key(
+        (51.5, -0.13),
+        datetime(2024, 3, 20, 21),
+        CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE),
+        ZoneInfo("Europe/London"),
+    )
+    assert prayer_times_key(
+        (51.5, -0.13), datetime(2024, 3, 20), parameters
+    ) != prayer_times_key((51.5, -0.13), datetime(2024, 3, 20), parameters, london)
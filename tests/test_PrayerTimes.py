@@ -1,5 +1,6 @@
 import math
 import pytest
+from datetime import timedelta
 from adhanpy.util.DateComponents import DateComponents
 from adhanpy.calculation.CalculationMethod import CalculationMethod
 from adhanpy.calculation.CalculationParameters import CalculationParameters
@@ -7,7 +8,9 @@ from adhanpy.astronomy.SolarTime import SolarTime
 from adhanpy.util.TimeComponents import TimeComponents
 from adhanpy.calculation.Madhab import Madhab
 from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.astronomy.SolarEvents import SolarEvents
 from adhanpy.calculation.PrayerAdjustments import PrayerAdjustments
+from adhanpy.data.Prayer import Prayer
 from zoneinfo import ZoneInfo
 
 
@@ -275,3 +278,65 @@ def test_prayer_times_timezone_conversion():
         coordinates, date_summer, calculation_method=calculation_method, time_zone=tz
     )
     assert prayer_times.fajr.strftime(format) == "03:37 AM"
+
+
+def test_current_and_next_prayer():
+    date = DateComponents(2015, 7, 12)
+    prayer_times = PrayerTimes(
+        (35.7750, -78.6336), date, CalculationMethod.NORTH_AMERICA
+    )
+    one_second = timedelta(seconds=1)
+
+    assert prayer_times.current_prayer(prayer_times.fajr - one_second) == Prayer.NONE
+    assert prayer_times.next_prayer(prayer_times.fajr - one_second) == Prayer.FAJR
+    assert prayer_times.current_prayer(prayer_times.fajr) == Prayer.FAJR
+    assert prayer_times.next_prayer(prayer_times.fajr) == Prayer.SUNRISE
+    assert prayer_times.current_prayer(prayer_times.asr + one_second) == Prayer.ASR
+    assert prayer_times.next_prayer(prayer_times.asr + one_second) == Prayer.MAGHRIB
+    assert prayer_times.current_prayer(prayer_times.isha) == Prayer.ISHA
+    assert prayer_times.next_prayer(prayer_times.isha) == Prayer.NONE
+    assert prayer_times.next_prayer() == Prayer.NONE
+    assert prayer_times.current_prayer() == Prayer.ISHA
+
+
+def test_time_for_prayer():
+    date = DateComponents(2015, 7, 12)
+    prayer_times = PrayerTimes(
+        (35.7750, -78.6336), date, CalculationMethod.NORTH_AMERICA
+    )
+
+    assert prayer_times.time_for_prayer(Prayer.NONE) is None
+    assert prayer_times.time_for_prayer(Prayer.FAJR) == prayer_times.fajr
+    assert prayer_times.time_for_prayer(Prayer.ISHA) == prayer_times.isha
+
+
+def test_prayer_times_from_events():
+    # Arrange
+    coordinates = (35.7750, -78.6336)
+    date = DateComponents(2015, 7, 12)
+    params = CalculationParameters(method=CalculationMethod.NORTH_AMERICA)
+    tz = ZoneInfo("America/New_York")
+    prayer_times = PrayerTimes(coordinates, date, calculation_parameters=params)
+    events = SolarEvents(coordinates, date)
+
+    # Act
+    shafi = PrayerTimes.from_events(events, calculation_parameters=params)
+    params.madhab = Madhab.HANAFI
+    hanafi = PrayerTimes.from_events(
+        events, calculation_parameters=params, time_zone=tz
+    )
+
+    # Assert
+    assert shafi.formatted() == prayer_times.formatted()
+    assert hanafi.asr.strftime("%I:%M %p") == "06:22 PM"
+    assert hanafi.formatted("%I:%M %p") == {
+        "fajr": "04:42 AM",
+        "sunrise": "06:08 AM",
+        "dhuhr": "01:21 PM",
+        "asr": "06:22 PM",
+        "maghrib": "08:32 PM",
+        "isha": "09:57 PM",
+    }
+    assert hanafi.date == prayer_times.date
+    with pytest.raises(ValueError):
+        PrayerTimes.from_events(events)
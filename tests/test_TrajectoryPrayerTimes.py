@@ -0,0 +1,179 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from adhanpy.astronomy.SolarEvents import SolarEvents
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.PrayerPolicy import apply_policy
+from adhanpy.calculation.Madhab import Madhab
+from adhanpy.data.Prayer import Prayer
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.TrajectoryPrayerTimes import trajectory_prayer_times
+from adhanpy.util.CalendarUtil import rounded_minute
+
+
+def _stationary_trajectory(coordinates, start, hours, step_minutes=10):
+    return [
+        (start + timedelta(minutes=step_minutes * i), *coordinates)
+        for i in range(hours * 60 // step_minutes + 1)
+    ]
+
+
+@pytest.mark.parametrize("madhab", [Madhab.SHAFI, Madhab.HANAFI])
+@pytest.mark.parametrize(
+    "coordinates, date, method",
+    [
+        ((35.7750, -78.6336), datetime(2015, 7, 12), CalculationMethod.NORTH_AMERICA),
+        ((21.422510, 39.826168), datetime(2022, 8, 8), CalculationMethod.UMM_AL_QURA),
+        ((-33.9, 151.2), datetime(2021, 1, 5), CalculationMethod.EGYPTIAN),
+        (
+            (51.5074, -0.1278),
+            datetime(2023, 10, 1),
+            CalculationMethod.MUSLIM_WORLD_LEAGUE,
+        ),
+    ],
+)
+def test_stationary_observer_matches_prayer_times(coordinates, date, method, madhab):
+    parameters = CalculationParameters(method=method)
+    parameters.madhab = madhab
+    prayer_times = PrayerTimes(coordinates, date, calculation_parameters=parameters)
+    raw_times = apply_policy(SolarEvents(coordinates, date), parameters, rounded=False)
+    # 24 hours around the prayer times of the day
+    start = prayer_times.dhuhr - timedelta(hours=12)
+
+    events = trajectory_prayer_times(
+        _stationary_trajectory(coordinates, start, 24),
+        calculation_parameters=parameters,
+    )
+
+    assert [event.prayer for event in events] == [
+        Prayer.FAJR,
+        Prayer.SUNRISE,
+        Prayer.DHUHR,
+        Prayer.ASR,
+        Prayer.MAGHRIB,
+        Prayer.ISHA,
+    ]
+    for event in events:
+        raw = getattr(raw_times, event.prayer.name.lower())
+        # the ephemeris and the interpolation of SolarTime differ by a few seconds
+        # before rounding to the minute
+        margin = timedelta(seconds=12)
+        assert event.time in (
+            rounded_minute(raw - margin),
+            rounded_minute(raw + margin),
+        )
+        assert event.latitude == pytest.approx(coordinates[0])
+        assert event.longitude == pytest.approx(coordinates[1])
+
+
+def test_isha_interval_none():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    parameters.isha_interval = None
+    start = datetime(2022, 8, 8, tzinfo=timezone.utc)
+
+    events = trajectory_prayer_times(
+        _stationary_trajectory((21.42, 39.83), start, 24),
+        calculation_parameters=parameters,
+    )
+
+    assert events[-1].prayer == Prayer.ISHA
+
+
+def test_flight_crossing_the_antimeridian():
+    # westbound flight from Tokyo to San Francisco
+    start = datetime(2023, 3, 1, 10, tzinfo=timezone.utc)
+    samples = 60
+    trajectory = [
+        (
+            start + timedelta(minutes=10 * i),
+            35.5 + (37.6 - 35.5) * i / samples,
+            139.8 + 97.8 * i / samples,
+        )
+        for i in range(samples + 1)
+    ]
+    trajectory = [
+        (when, latitude, longitude - 360 if longitude > 180 else longitude)
+        for when, latitude, longitude in trajectory
+    ]
+
+    events = trajectory_prayer_times(
+        trajectory, CalculationMethod.MUSLIM_WORLD_LEAGUE, time_zone=ZoneInfo("UTC")
+    )
+
+    # night flight, the sun rises over the Pacific east of the antimeridian
+    assert [event.prayer for event in events] == [Prayer.FAJR, Prayer.SUNRISE]
+    for event in events:
+        assert event.time.tzinfo == ZoneInfo("UTC")
+        # on the track at the time of the event
+        fraction = (event.time - start) / (trajectory[-1][0] - start)
+        assert event.latitude == pytest.approx(35.5 + 2.1 * fraction, abs=0.01)
+        assert event.longitude == pytest.approx(139.8 + 97.8 * fraction - 360, abs=0.2)
+        # a stationary observer at the solved point has the prayer at the same time
+        prayer_times = PrayerTimes(
+            (event.latitude, event.longitude),
+            datetime(event.time.year, event.time.month, event.time.day),
+            CalculationMethod.MUSLIM_WORLD_LEAGUE,
+        )
+        expected = getattr(prayer_times, event.prayer.name.lower())
+        assert abs((event.time - expected).total_seconds()) <= 60
+
+
+def test_isha_interval_at_the_position_after_the_interval():
+    # westbound from Mecca, 0.1° of longitude a minute
+    start = datetime(2022, 8, 8, 12, tzinfo=timezone.utc)
+    trajectory = [
+        (start + timedelta(minutes=10 * i), 21.4, 39.8 - i) for i in range(61)
+    ]
+
+    events = trajectory_prayer_times(trajectory, CalculationMethod.UMM_AL_QURA)
+    maghrib, isha = events[-2:]
+
+    assert (maghrib.prayer, isha.prayer) == (Prayer.MAGHRIB, Prayer.ISHA)
+    assert isha.time - maghrib.time == timedelta(minutes=90)
+    minutes = (isha.time - start).total_seconds() / 60
+    assert isha.longitude == pytest.approx(39.8 - minutes / 10, abs=0.1)
+    assert maghrib.longitude - isha.longitude == pytest.approx(9.0, abs=0.1)
+
+    # the trajectory ends before the interval
+    ended = [sample for sample in trajectory if sample[0] <= maghrib.time]
+    ended.append((maghrib.time + timedelta(minutes=10), 21.4, ended[-1][2] - 1))
+    prayers = [
+        event.prayer
+        for event in trajectory_prayer_times(ended, CalculationMethod.UMM_AL_QURA)
+    ]
+    assert prayers[-1] == Prayer.MAGHRIB
+
+
+def test_polar_day_has_no_sunset():
+    start = datetime(2022, 6, 21, tzinfo=timezone.utc)
+
+    events = trajectory_prayer_times(
+        _stationary_trajectory((78.2, 15.6), start, 24),
+        CalculationMethod.MUSLIM_WORLD_LEAGUE,
+    )
+
+    assert [event.prayer for event in events] == [Prayer.DHUHR, Prayer.ASR]
+
+
+def test_either_calculation_method_or_calculation_parameters_is_passed():
+    trajectory = _stationary_trajectory(
+        (0, 0), datetime(2022, 1, 1, tzinfo=timezone.utc), 1
+    )
+
+    with pytest.raises(ValueError, match="Only one of"):
+        trajectory_prayer_times(trajectory)
+
+
+def test_invalid_trajectories():
+    method = CalculationMethod.MUSLIM_WORLD_LEAGUE
+
+    with pytest.raises(ValueError, match="at least two samples"):
+        trajectory_prayer_times(
+            [(datetime(2022, 1, 1, tzinfo=timezone.utc), 0, 0)], method
+        )
+
+    with pytest.raises(ValueError, match="timezone aware"):
+        trajectory_prayer_times(
+            [(datetime(2022, 1, 1), 0, 0), (datetime(2022, 1, 2), 0, 0)], method
+        )
@@ -0,0 +1,172 @@
+import io
+import tracemalloc
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Prayer import Prayer
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.timetable.ICalendar import escape, fold, vtimezone, write_ics
+
+LONDON = ZoneInfo("Europe/London")
+STAMP = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _parameters():
+    return CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+
+def _lines(**kwargs):
+    output = io.StringIO(newline="")
+    events = write_ics(output, stamp=STAMP, **kwargs)
+    text = output.getvalue()
+    assert text.endswith("END:VCALENDAR\r\n")
+    return events, text.split("\r\n")
+
+
+def test_events_of_a_year_in_a_time_zone():
+    events, lines = _lines(
+        coordinates=(51.5, -0.13),
+        start=datetime(2024, 1, 1),
+        days=366,
+        calculation_parameters=_parameters(),
+        time_zone=LONDON,
+        name="London, UK",
+    )
+
+    assert events == 366 * 5
+    assert lines.count("BEGIN:VEVENT") == events
+    assert "X-WR-CALNAME:London\\, UK" in lines
+    assert "BEGIN:VALARM" not in lines
+    assert lines.count("SUMMARY:Fajr") == 366
+    assert "SUMMARY:Sunrise" not in lines
+
+    fajr = PrayerTimes(
+        (51.5, -0.13),
+        datetime(2024, 7, 1),
+        calculation_parameters=_parameters(),
+        time_zone=LONDON,
+    ).fajr
+    assert f"DTSTART;TZID=Europe/London:{fajr:%Y%m%dT%H%M00}" in lines
+    assert "UID:20240701-fajr-51.5--0.13@adhanpy" in lines
+    assert "DTSTAMP:20240101T000000Z" in lines
+
+
+def test_prayers_alarm_and_utc():
+    events, lines = _lines(
+        coordinates=(21.42, 39.83),
+        start=datetime(2024, 3, 1),
+        days=2,
+        calculation_parameters=_parameters(),
+        prayers=[Prayer.SUNRISE],
+        alarm=20,
+        duration=5,
+    )
+
+    assert events == 2
+    assert "BEGIN:VTIMEZONE" not in lines
+    assert lines.count("TRIGGER:-PT20M") == 2
+    assert "DURATION:PT5M" in lines
+    sunrise = PrayerTimes(
+        (21.42, 39.83), datetime(2024, 3, 1), calculation_parameters=_parameters()
+    ).sunrise
+    assert f"DTSTART:{sunrise:%Y%m%dT%H%M00}Z" in lines
+
+
+def test_uids_are_unique_when_prayers_cross_midnight():
+    # fajr in Tokyo and isha in Oslo in summer are on another day in UTC
+    for coordinates in ((35.68, 139.69), (59.91, 10.75)):
+        events, lines = _lines(
+            coordinates=coordinates,
+            start=datetime(2024, 1, 1),
+            days=366,
+            calculation_parameters=_parameters(),
+        )
+        uids = [line for line in lines if line.startswith("UID:")]
+
+        assert len(uids) == events == 366 * 5
+        assert len(set(uids)) == len(uids)
+        assert f"UID:20240308-fajr-{coordinates[0]}-{coordinates[1]}@adhanpy" in uids
+
+
+def test_days_without_prayer_times_have_no_events():
+    events, lines = _lines(
+        coordinates=(89.0, 0.0),
+        start=datetime(2024, 6, 20),
+        days=3,
+        calculation_parameters=_parameters(),
+    )
+
+    assert events == 0
+    assert lines[:3] == [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//adhanpy//Prayer times//EN",
+    ]
+
+
+def test_vtimezone():
+    lines = vtimezone(LONDON, datetime(2024, 1, 1), datetime(2025, 1, 1))
+
+    assert lines[:2] == ["BEGIN:VTIMEZONE", "TZID:Europe/London"]
+    assert lines[2:8] == [
+        "BEGIN:STANDARD",
+        "DTSTART:20240101T000000",
+        "TZOFFSETFROM:+0000",
+        "TZOFFSETTO:+0000",
+        "TZNAME:GMT",
+        "END:STANDARD",
+    ]
+    assert lines[8:14] == [
+        "BEGIN:DAYLIGHT",
+        "DTSTART:20240331T010000",
+        "TZOFFSETFROM:+0000",
+        "TZOFFSETTO:+0100",
+        "TZNAME:BST",
+        "END:DAYLIGHT",
+    ]
+    assert lines[14:16] == ["BEGIN:STANDARD", "DTSTART:20241027T020000"]
+    assert lines[-1] == "END:VTIMEZONE"
+
+    kolkata = vtimezone(
+        ZoneInfo("Asia/Kolkata"), datetime(2024, 1, 1), datetime(2034, 1, 1)
+    )
+    assert kolkata.count("BEGIN:STANDARD") == 1
+    assert "TZOFFSETTO:+0530" in kolkata
+
+
+def test_years_in_constant_memory():
+    class Sink:
+        size = 0
+
+        def write(self, text):
+            self.size += len(text)
+
+    sink = Sink()
+    tracemalloc.start()
+    try:
+        events = write_ics(
+            sink,
+            (51.5, -0.13),
+            datetime(2024, 1, 1),
+            1096,
+            _parameters(),
+            LONDON,
+            alarm=10,
+            stamp=STAMP,
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert events == 1096 * 5
+    assert sink.size > 1_000_000
+    assert peak < 200_000
+
+
+def test_escape_and_fold():
+    assert escape("a,b;c\\d\ne") == r"a\,b\;c\\d\ne"
+    assert fold("short") == "short"
+    folded = fold("X-WR-CALNAME:" + "é" * 100)
+    assert all(len(line.encode()) <= 75 for line in folded.split("\r\n"))
+    assert folded.replace("\r\n ", "") == "X-WR-CALNAME:" + "é" * 100
@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.data.Prayer import PRAYERS
+from adhanpy.timetable.PackedTimetable import PackedTimetable, encode_timetable
+
+
+def _calendar(start, days, coordinates=(51.5, -0.13), time_zone=None):
+    return [
+        PrayerTimes(
+            coordinates,
+            start + timedelta(days=offset),
+            CalculationMethod.MUSLIM_WORLD_LEAGUE,
+            time_zone=time_zone,
+        )
+        for offset in range(days)
+    ]
+
+
+def test_round_trip_across_daylight_saving_time():
+    calendar = _calendar(datetime(2022, 3, 20), 14, time_zone=ZoneInfo("Europe/London"))
+
+    buffer = encode_timetable(calendar)
+    timetable = PackedTimetable(buffer)
+
+    assert len(buffer) == 16 + 14 * 2 + 14 * 12
+    assert len(timetable) == 14
+    assert timetable.base_date == calendar[0].date
+    assert timetable.utc_offset(0) == 0
+    assert timetable.utc_offset(13) == 60
+    for index, prayer_times in enumerate(calendar):
+        assert timetable.date(index) == prayer_times.date
+        assert timetable[index] == tuple(
+            getattr(prayer_times, prayer.name.lower()) for prayer in PRAYERS
+        )
+
+
+def test_random_access_on_memoryview():
+    calendar = _calendar(datetime(2023, 1, 1), 31, coordinates=(35.68, 139.69))
+    view = memoryview(bytearray(encode_timetable(calendar)))
+
+    timetable = PackedTimetable(view)
+    index = timetable.index(calendar[20].date)
+    fajr, sunrise, dhuhr, asr, maghrib, isha = timetable.minutes(index)
+
+    # tokyo times kept in UTC: fajr and sunrise are on the previous UTC day
+    assert index == 20
+    assert timetable.utc_offset(index) == 0
+    assert fajr < sunrise < 0 < dhuhr < asr < maghrib < isha
+    assert timetable.times(-1)[0] == calendar[-1].fajr
+
+
+def test_errors():
+    calendar = _calendar(datetime(2023, 1, 1), 3)
+    timetable = PackedTimetable(encode_timetable(calendar))
+
+    with pytest.raises(ValueError, match="consecutive days"):
+        encode_timetable([calendar[0], calendar[2]])
+    with pytest.raises(ValueError, match="empty"):
+        encode_timetable([])
+    with pytest.raises(ValueError, match="not a packed timetable"):
+        PackedTimetable(b"X" * 16)
+    with pytest.raises(ValueError, match="too small"):
+        PackedTimetable(b"ADHT")
+    with pytest.raises(ValueError, match="truncated"):
+        PackedTimetable(encode_timetable(calendar)[:-1])
+    with pytest.raises(IndexError):
+        timetable.minutes(3)
+    with pytest.raises(IndexError):
+        timetable.index(datetime(2022, 12, 31).date())
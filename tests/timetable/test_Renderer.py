@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from adhanpy.batch.ParallelCalendar import calendar
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.data.Prayer import Prayer
+from adhanpy.timetable.PackedTimetable import PackedTimetable, encode_timetable
+from adhanpy.timetable.Renderer import (
+    Column,
+    date_column,
+    prayer_column,
+    time_table,
+    timetable_days,
+    write_csv,
+    write_html,
+    write_json,
+)
+
+PRAYERS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha")
+
+
+def _calendar(days=61):
+    return calendar(
+        (51.5, -0.13),
+        datetime(2024, 3, 1),
+        days,
+        CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE),
+        ZoneInfo("Europe/London"),
+    )
+
+
+def test_time_table():
+    assert len(time_table()) == 1440
+    assert time_table()[0] == "00:00"
+    assert time_table()[13 * 60 + 5] == "13:05"
+    assert time_table("%I:%M %p")[13 * 60 + 5] == "01:05 PM"
+
+
+def test_csv_matches_strftime():
+    days = _calendar()
+    output = io.StringIO()
+
+    write_csv(output, days)
+
+    lines = list(csv.reader(io.StringIO(output.getvalue())))
+    assert lines[0] == ["Date", "Fajr", "Sunrise", "Dhuhr", "Asr", "Maghrib", "Isha"]
+    assert len(lines) == 62
+    for line, prayer_times in zip(lines[1:], days):
+        assert line[0] == prayer_times.date.isoformat()
+        assert line[1:] == [
+            getattr(prayer_times, prayer).strftime("%H:%M") for prayer in PRAYERS
+        ]
+
+
+def test_packed_timetable_and_prayer_times_render_the_same():
+    days = _calendar()
+    packed = PackedTimetable(encode_timetable(days))
+
+    assert list(timetable_days(packed)) == list(timetable_days(days))
+
+    from_packed = io.StringIO()
+    from_prayer_times = io.StringIO()
+    write_json(from_packed, packed)
+    write_json(from_prayer_times, days)
+    assert from_packed.getvalue() == from_prayer_times.getvalue()
+
+
+def test_json_with_custom_columns():
+    columns = [
+        date_column("Day", "%d %B"),
+        prayer_column(Prayer.FAJR, 'Fajr "dawn"'),
+        prayer_column(Prayer.ISHA),
+        Column("Offset", lambda day, times: f"UTC{day.utc_offset / 60:+.0f}"),
+    ]
+    output = io.StringIO()
+
+    write_json(output, _calendar(31), columns, "%I:%M %p")
+
+    rows = json.loads(output.getvalue())
+    assert len(rows) == 31
+    assert rows[0]["Day"] == "01 March"
+    assert rows[0]['Fajr "dawn"'].endswith(" AM")
+    assert rows[0]["Offset"] == "UTC+0"
+    assert rows[-1]["Offset"] == "UTC+1"
+
+
+def test_html_has_a_table_per_month():
+    output = io.StringIO()
+
+    write_html(
+        output,
+        _calendar(),
+        [date_column("<Date>"), Column("Note", lambda day, times: "a & b")],
+    )
+
+    text = output.getvalue()
+    assert text.count("<table>") == 2
+    assert "<caption>March 2024</caption>" in text
+    assert "<caption>April 2024</caption>" in text
+    assert "<th>&lt;Date&gt;</th>" in text
+    assert text.count("<tr><td>") == 61
+    assert "<td>a &amp; b</td>" in text
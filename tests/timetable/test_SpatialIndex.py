@@ -0,0 +1,104 @@
+import math
+import random
+import pytest
+from datetime import date, datetime, timedelta
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.timetable.SpatialIndex import (
+    SpatialIndex,
+    estimated_time_error,
+    haversine,
+)
+from adhanpy.timetable.TimetableDatabase import (
+    City,
+    TimetableDatabase,
+    build_database,
+)
+
+
+def test_haversine():
+    assert haversine((51.5, -0.13), (51.5, -0.13)) == 0
+    # London to Paris
+    assert haversine((51.5074, -0.1278), (48.8566, 2.3522)) == pytest.approx(
+        343.5, abs=0.5
+    )
+    # across the antimeridian
+    assert haversine((0, 179.5), (0, -179.5)) == pytest.approx(111.2, abs=0.1)
+
+
+def test_nearest_matches_brute_force():
+    generator = random.Random(7)
+    locations = [
+        (generator.uniform(-90, 90), generator.uniform(-180, 180)) for _ in range(2000)
+    ]
+    index = SpatialIndex(locations)
+
+    assert len(index) == 2000
+    for _ in range(50):
+        coordinates = (generator.uniform(-90, 90), generator.uniform(-180, 180))
+        expected = min(
+            range(len(locations)), key=lambda i: haversine(coordinates, locations[i])
+        )
+        nearest = index.nearest(coordinates)
+        assert nearest.index == expected
+        assert nearest.distance == pytest.approx(
+            haversine(coordinates, locations[expected]), abs=1e-6
+        )
+
+        within = index.within(coordinates, 500)
+        assert [found.index for found in within] == sorted(
+            (
+                i
+                for i, location in enumerate(locations)
+                if haversine(coordinates, location) <= 500
+            ),
+            key=lambda i: haversine(coordinates, locations[i]),
+        )
+
+
+def test_nearest_within_radius():
+    index = SpatialIndex([(0, 179.9), (10, 10)])
+
+    assert index.nearest((0, -179.9), 25).index == 0
+    assert index.nearest((0, -179.9), 20) is None
+    assert index.nearest((0, 0)).index == 1
+    assert SpatialIndex([]).nearest((0, 0)) is None
+
+
+def test_estimated_time_error_bounds_prayer_times():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    a, b = (51.5, -0.13), (51.53, -0.07)
+    error = estimated_time_error(a, b)
+
+    assert 0 < error < 60
+    for offset in range(0, 365, 30):
+        day = datetime(2022, 1, 1) + timedelta(days=offset)
+        times_a = PrayerTimes(a, day, calculation_parameters=parameters)
+        times_b = PrayerTimes(b, day, calculation_parameters=parameters)
+        for prayer in ("sunrise", "dhuhr", "maghrib"):
+            difference = getattr(times_a, prayer) - getattr(times_b, prayer)
+            # times are rounded to the minute
+            assert abs(difference.total_seconds()) <= error + 60
+
+    assert estimated_time_error((70, 0), (70.1, 0)) == math.inf
+    assert estimated_time_error((0, 179.9), (0, -179.9)) == pytest.approx(48)
+
+
+def test_from_database(tmp_path):
+    path = str(tmp_path / "cities.adhd")
+    cities = [City("London", 51.5, -0.13), City("Paris", 48.86, 2.35)]
+    build_database(
+        path,
+        cities,
+        date(2022, 1, 1),
+        1,
+        CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE),
+    )
+
+    with TimetableDatabase(path) as database:
+        index = SpatialIndex.from_database(database)
+        nearest = index.nearest((48.85, 2.3), 10)
+
+        assert database.city(nearest.index).name == "Paris"
+        assert nearest.distance < 5
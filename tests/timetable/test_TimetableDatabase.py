@@ -0,0 +1,101 @@
+import struct
+import pytest
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.data.Prayer import PRAYERS
+from adhanpy.timetable.TimetableDatabase import (
+    City,
+    TimetableDatabase,
+    build_database,
+)
+
+CITIES = [
+    City("London", 51.5, -0.13, "Europe/London"),
+    City("Tokyo", 35.68, 139.69, "Asia/Tokyo"),
+    City("Tromsø", 69.65, 18.96, "Europe/Oslo"),
+    City("Null Island", 0.0, 0.0),
+]
+PARAMETERS = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "cities.adhd")
+    build_database(path, CITIES, date(2022, 3, 20), 100, PARAMETERS)
+    with TimetableDatabase(path) as database:
+        yield database
+
+
+def test_lookup_matches_prayer_times(database):
+    assert len(database) == 4
+    assert database.base_date == date(2022, 3, 20)
+    assert database.days == 100
+
+    for city_id, city in enumerate(CITIES):
+        assert database.city(city_id) == city
+        assert database.city_id(city.name) == city_id
+        time_zone = None if city.time_zone is None else ZoneInfo(city.time_zone)
+        for day in (date(2022, 3, 20), date(2022, 3, 30), date(2022, 4, 20)):
+            prayer_times = PrayerTimes(
+                (city.latitude, city.longitude),
+                datetime(day.year, day.month, day.day),
+                calculation_parameters=PARAMETERS,
+                time_zone=time_zone,
+            )
+            assert database.times(city_id, day) == tuple(
+                getattr(prayer_times, prayer.name.lower()) for prayer in PRAYERS
+            )
+
+    assert database.utc_offset(0, date(2022, 3, 20)) == 0
+    assert database.utc_offset(0, date(2022, 3, 30)) == 60
+    assert database.minutes(1, date(2022, 3, 20))[2] == 11 * 60 + 50
+
+
+def test_days_which_cannot_be_calculated(database):
+    tromso = database.city_id("Tromsø")
+
+    with pytest.raises(ValueError):
+        database.times(tromso, date(2022, 6, 21))
+    assert database.times(tromso, date(2022, 3, 21))
+
+
+def test_out_of_range(database):
+    with pytest.raises(IndexError):
+        database.times(4, date(2022, 3, 20))
+    with pytest.raises(IndexError):
+        database.times(0, date(2022, 3, 20) + timedelta(days=100))
+    with pytest.raises(KeyError):
+        database.city_id("Paris")
+
+
+def test_file_layout(database, tmp_path):
+    size = (tmp_path / "cities.adhd").stat().st_size
+
+    assert database._records_start % 4096 == 0
+    assert size == database._records_start + 100 * 4 * 14
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"ADHD",
+        b"ADHT" + bytes(4096),
+        struct.pack("<4sBBHIIII", b"ADHD", 1, 6, 0, 1, 10, 2, 4096) + bytes(4072),
+    ],
+)
+def test_invalid_file(tmp_path, content):
+    path = tmp_path / "invalid.adhd"
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError):
+        TimetableDatabase(str(path))
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        build_database(str(tmp_path / "a"), [], date(2022, 1, 1), 1, PARAMETERS)
+    with pytest.raises(ValueError):
+        build_database(str(tmp_path / "a"), CITIES, date(2022, 1, 1), 0, PARAMETERS)
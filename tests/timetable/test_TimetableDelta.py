@@ -0,0 +1,127 @@
+import pytest
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+from adhanpy.calculation.CalculationMethod import CalculationMethod
+from adhanpy.calculation.CalculationParameters import CalculationParameters
+from adhanpy.calculation.Madhab import Madhab
+from adhanpy.data.Prayer import Prayer
+from adhanpy.PrayerTimes import PrayerTimes
+from adhanpy.timetable.PackedTimetable import PackedTimetable, encode_timetable
+from adhanpy.timetable.TimetableDelta import (
+    TimetableChange,
+    apply_changes,
+    decode_changes,
+    diff_timetables,
+    encode_changes,
+    shift_changes,
+)
+
+
+def _calendar(parameters, days=30):
+    return [
+        PrayerTimes(
+            (51.5, -0.13),
+            datetime(2023, 5, 1) + timedelta(days=offset),
+            calculation_parameters=parameters,
+            time_zone=ZoneInfo("Europe/London"),
+        )
+        for offset in range(days)
+    ]
+
+
+def test_diff_and_apply_after_madhab_change():
+    shafi = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    hanafi = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    hanafi.madhab = Madhab.HANAFI
+    old = PackedTimetable(encode_timetable(_calendar(shafi)))
+    new_calendar = _calendar(hanafi)
+
+    changes = diff_timetables(old, new_calendar)
+
+    assert len(changes) == 30
+    assert {change.prayer for change in changes} == {Prayer.ASR}
+    assert apply_changes(old, changes) == encode_timetable(new_calendar)
+
+
+def test_identical_timetables_have_no_changes():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+
+    assert diff_timetables(_calendar(parameters), _calendar(parameters)) == []
+
+
+def test_shift_changes_match_adjustment_change():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    adjusted = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    adjusted.adjustments.isha = 5
+    old = PackedTimetable(encode_timetable(_calendar(parameters)))
+
+    changes = shift_changes(old, Prayer.ISHA, 5)
+
+    assert shift_changes(old, Prayer.ISHA, 0) == []
+    assert changes == diff_timetables(old, _calendar(adjusted))
+    assert apply_changes(old, changes) == encode_timetable(_calendar(adjusted))
+
+
+def test_encode_and_decode_changes():
+    changes = [
+        TimetableChange(date(2023, 5, 3), Prayer.FAJR, 231),
+        TimetableChange(date(2023, 5, 1), Prayer.ISHA, 1320),
+        TimetableChange(date(2023, 7, 1), Prayer.SUNRISE, -12),
+    ]
+
+    stream = encode_changes(changes)
+
+    assert len(stream) == 13 + 3 * 5
+    assert decode_changes(stream) == changes
+    assert decode_changes(encode_changes([])) == []
+
+
+def test_errors():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    calendar = _calendar(parameters)
+    utc_calendar = [
+        PrayerTimes((51.5, -0.13), prayer_times.date, calculation_parameters=parameters)
+        for prayer_times in calendar
+    ]
+
+    with pytest.raises(ValueError, match="same days"):
+        diff_timetables(calendar, calendar[1:])
+    with pytest.raises(ValueError, match="UTC offsets differ"):
+        diff_timetables(calendar, utc_calendar)
+    with pytest.raises(ValueError, match="not a change stream"):
+        decode_changes(b"X" * 13)
+    with pytest.raises(ValueError, match="too small"):
+        decode_changes(b"ADHC")
+    with pytest.raises(ValueError, match="truncated"):
+        decode_changes(
+            encode_changes([TimetableChange(date(2023, 5, 3), Prayer.FAJR, 1)])[:-1]
+        )
+    with pytest.raises(IndexError):
+        PackedTimetable(encode_timetable(calendar)).patched([(0, 6, 0)])
+
+
+def test_changes_out_of_range():
+    parameters = CalculationParameters(method=CalculationMethod.MUSLIM_WORLD_LEAGUE)
+    timetable = PackedTimetable(encode_timetable(_calendar(parameters)))
+
+    with pytest.raises(ValueError, match="minutes from the local midnight"):
+        shift_changes(timetable, Prayer.ISHA, 32767)
+    with pytest.raises(ValueError, match="minutes from the local midnight"):
+        shift_changes(timetable, Prayer.FAJR, -33000)
+    with pytest.raises(ValueError, match="minutes from the local midnight"):
+        encode_changes([TimetableChange(date(2023, 5, 3), Prayer.FAJR, 40000)])
+    with pytest.raises(ValueError, match="more than 65535 days"):
+        encode_changes(
+            [
+                TimetableChange(date(2023, 5, 3), Prayer.FAJR, 231),
+                TimetableChange(
+                    date(2023, 5, 3) + timedelta(days=65536), Prayer.FAJR, 231
+                ),
+            ]
+        )
+    # the bounds of the fields are valid
+    changes = [
+        TimetableChange(date(2023, 5, 3), Prayer.FAJR, -32768),
+        TimetableChange(date(2023, 5, 3) + timedelta(days=65535), Prayer.ISHA, 32767),
+    ]
+    assert decode_changes(encode_changes(changes)) == changes